@@ -143,7 +143,7 @@ class ZFSObject:
     def __init__(self, *args, **kwargs): ...
     def delete(self, *args, **kwargs) -> None: ...
     def get_send_space(self, *args, **kwargs): ...
-    def rename(self, *args, **kwargs): ...
+    def rename(self, new_name: str, *args, **kwargs) -> None: ...
     def __getstate__(self): ...
     def __reduce_cython__(self, *args, **kwargs): ...
     def __setstate_cython__(self, *args, **kwargs): ...
@@ -191,7 +191,7 @@ class ZFSProperty:
     source = ... # type: Any
     value: str = ...
     def __init__(self, *args, **kwargs): ...
-    def inherit(self, *args, **kwargs): ...
+    def inherit(self, recursive: bool=..., received: bool=...) -> None: ...
     def refresh(self, *args, **kwargs): ...
     def __getstate__(self): ...
     def __reduce_cython__(self, *args, **kwargs): ...
@@ -224,7 +224,7 @@ class ZFSSnapshot(ZFSObject):
     snapshot_name: str = ...
     def __init__(self, *args, **kwargs) -> None: ...
     def bookmark(self, *args, **kwargs): ...
-    def clone(self, name: str, opts: Optional[Dict[str, str]]) -> None: ...
+    def clone(self, name: str, opts: Optional[Dict[str, str]]=...) -> None: ...
     def delete(self, *args, **kwargs) -> None: ...
     def hold(self, *args, **kwargs): ...
     def release(self, *args, **kwargs): ...
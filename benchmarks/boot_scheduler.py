@@ -0,0 +1,137 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Simulate booting jails with stubbed jail(8) and ifconfig(8) commands
+
+Each stub jail creates an epair interface (10ms) and the jail (40ms)
+through iocage.lib.helpers.exec, which is replaced by a sleep. The jails
+are spread over four priorities, or form dependency chains of a database,
+an application and a proxy jail next to a standalone jail. The sequential
+loop is how the boot jails were started before the JailScheduler.
+"""
+import time
+import typing
+
+import helpers
+
+import iocage.lib.events
+import iocage.lib.helpers
+import iocage.lib.JailScheduler
+import iocage.lib.Logger
+
+COMMAND_DURATIONS = {
+    "ifconfig": 0.01,
+    "jail": 0.04
+}
+
+
+def stub_exec(command: typing.List[str], **kwargs) -> typing.Tuple[
+    int,
+    str,
+    str
+]:
+    time.sleep(COMMAND_DURATIONS[command[0]])
+    return 0, "", ""
+
+
+class StubJail:
+
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        depends: typing.List[str]=[]
+    ) -> None:
+
+        self.name = name
+        self.humanreadable_name = name
+        self.config = {"priority": priority, "depends": depends}
+        self.devfs_ruleset = 4
+        self.jid = 1
+
+    def require_jail_not_template(self) -> None:
+        pass
+
+    def start(self) -> typing.Generator[
+        iocage.lib.events.IocageEvent,
+        None,
+        None
+    ]:
+        event = iocage.lib.events.JailLaunch(jail=self)
+        yield event.begin()
+        iocage.lib.helpers.exec(["ifconfig", "epair", "create"])
+        iocage.lib.helpers.exec(["jail", "-c", f"name={self.name}"])
+        yield event.end()
+
+
+def start_sequentially(jails: typing.List[StubJail]) -> None:
+    for jail in sorted(jails, key=lambda jail: jail.config["priority"]):
+        list(jail.start())
+
+
+def start_scheduled(jails: typing.List[StubJail], jobs: int) -> None:
+    scheduler = iocage.lib.JailScheduler.JailScheduler(
+        jails,
+        jobs=jobs,
+        logger=iocage.lib.Logger.Logger()
+    )
+    list(scheduler.start())
+    assert len(scheduler.started_jails) == len(jails)
+
+
+def create_prioritized_jails(jail_count: int) -> typing.List[StubJail]:
+    return [StubJail(f"jail{i}", i % 4) for i in range(jail_count)]
+
+
+def create_dependent_jails(jail_count: int) -> typing.List[StubJail]:
+    jails = []
+    for i in range(jail_count // 4):
+        jails.append(StubJail(f"db{i}", 1))
+        jails.append(StubJail(f"app{i}", 2, depends=[f"db{i}"]))
+        jails.append(StubJail(f"proxy{i}", 3, depends=[f"app{i}"]))
+        jails.append(StubJail(f"misc{i}", 3))
+    return jails
+
+
+def main() -> None:
+    iocage.lib.helpers.exec = stub_exec
+
+    for layout, create_jails in [
+        ("prioritized", create_prioritized_jails),
+        ("dependent", create_dependent_jails)
+    ]:
+        for jail_count in [8, 32, 128]:
+            jails = create_jails(jail_count)
+            label = f"{jail_count} {layout} jails"
+            helpers.report(f"{label} sequential", helpers.measure(
+                lambda: start_sequentially(jails)
+            ))
+            for jobs in [4, 16]:
+                helpers.report(f"{label} {jobs} jobs", helpers.measure(
+                    lambda: start_scheduled(jails, jobs)
+                ))
+
+
+if __name__ == "__main__":
+    main()
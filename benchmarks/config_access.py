@@ -0,0 +1,75 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Read and write properties of a jail config
+
+A plain property with a getter (vnet) and a special property (ip4_addr)
+are read one million times each.
+"""
+import itertools
+
+import helpers
+
+import iocage.lib.Jail
+import iocage.lib.Logger
+import iocage.lib.ZFS
+
+READ_COUNT = 1000000
+WRITE_COUNT = 100000
+
+
+def main() -> None:
+    logger = iocage.lib.Logger.Logger()
+    jail = iocage.lib.Jail.JailGenerator(
+        data={
+            "id": "bench",
+            "vnet": "on",
+            "ip4_addr": "em0|10.0.0.1/24"
+        },
+        new=True,
+        host=helpers.create_host(logger),
+        zfs=iocage.lib.ZFS.ZFS(),
+        logger=logger
+    )
+    config = jail.config
+
+    for key in ["vnet", "ip4_addr"]:
+        helpers.report(f"1M config[\"{key}\"] reads", helpers.measure(
+            lambda: config[key],
+            repeat=READ_COUNT
+        ))
+
+    values = itertools.cycle([True, False])
+
+    def write_vnet() -> None:
+        config["vnet"] = next(values)
+
+    helpers.report("100k config[\"vnet\"] writes", helpers.measure(
+        write_vnet,
+        repeat=WRITE_COUNT
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Match 10k synthetic jail names against 50 filter terms
+
+The matcher that escaped and compiled a regular expression for every
+comparison is kept below as the reference for the compiled filter terms.
+"""
+import random
+import re
+
+import helpers
+
+import iocage.lib.Filter
+import iocage.lib.helpers
+
+NAME_COUNT = 10000
+TERM_COUNT = 50
+
+
+def reference_match_filter(value: str, filter_string: str) -> bool:
+    for character in [".", "$", "^", "(", ")", "?"]:
+        filter_string = filter_string.replace(character, f"\\{character}")
+    filter_string = filter_string.replace("*", ".*")
+    filter_string = filter_string.replace("+", ".+")
+    return re.match(f"^{filter_string}$", value) is not None
+
+
+def reference_matches(
+    term: iocage.lib.Filter.Term,
+    value: str,
+    short: bool=False
+) -> bool:
+
+    input_value = iocage.lib.helpers.to_string(value)
+    for filter_value in term:
+        if reference_match_filter(input_value, filter_value):
+            return True
+        if short is False:
+            continue
+        is_short_name = (len(filter_value) == 8) and not any(
+            glob in filter_value for glob in "*+"
+        )
+        if is_short_name is True:
+            humanreadable_name = iocage.lib.helpers.to_humanreadable_name(
+                input_value
+            )
+            if humanreadable_name == filter_value:
+                return True
+    return False
+
+
+def create_names() -> list:
+    names = []
+    for i in range(NAME_COUNT):
+        if i % 3 == 0:
+            names.append(iocage.lib.helpers.get_random_uuid())
+        else:
+            prefix = random.choice(["web", "db", "cache", "proxy", "mail"])
+            names.append(f"{prefix}-{i}")
+    return names
+
+
+def create_filters(names: list) -> list:
+    filters = []
+    for i in range(TERM_COUNT):
+        kind = i % 5
+        if kind == 0:
+            filters.append(random.choice(names))
+        elif kind == 1:
+            prefix = random.choice(["web", "db", "mail"])
+            filters.append(f"{prefix}-{random.randrange(100)}*")
+        elif kind == 2:
+            filters.append(f"*-{random.randrange(1000)}")
+        elif kind == 3:
+            filters.append(names[random.randrange(0, NAME_COUNT, 3)][:8])
+        else:
+            filters.append(f"{random.choice(['web', 'db'])}-1+")
+    return filters
+
+
+def main() -> None:
+    random.seed(1)
+    names = create_names()
+    filters = create_filters(names)
+
+    single_terms = [iocage.lib.Filter.Term("name", f) for f in filters]
+    multi_term = iocage.lib.Filter.Term("name", ",".join(filters))
+
+    for name in names:
+        assert reference_matches(multi_term, name, True) == \
+            multi_term.matches(name, True)
+
+    helpers.report("one Term with 50 values (reference)", helpers.measure(
+        lambda: [reference_matches(multi_term, n, True) for n in names]
+    ))
+    helpers.report("one Term with 50 values", helpers.measure(
+        lambda: [multi_term.matches(n, True) for n in names]
+    ))
+    helpers.report("50 single-value Terms (reference)", helpers.measure(
+        lambda: [
+            reference_matches(term, n, True)
+            for n in names for term in single_terms
+        ]
+    ))
+    helpers.report("50 single-value Terms", helpers.measure(
+        lambda: [
+            term.matches(n, True)
+            for n in names for term in single_terms
+        ]
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Shared setup of the iocage benchmarks
+
+The benchmarks are run from the repository root:
+
+    python3 benchmarks/<name>.py
+
+The repository is appended to the module search path, so that another
+revision of iocage can be measured by putting it first on PYTHONPATH.
+"""
+import os.path
+import sys
+import time
+import types
+import typing
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "iocage", "tests"))
+
+
+def measure(
+    method: typing.Callable[[], typing.Any],
+    repeat: int=1
+) -> float:
+    """
+    Return the wall clock seconds of calling a method `repeat` times
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        method()
+    return time.perf_counter() - start
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"{label:<40} {seconds:8.3f}s")
+
+
+def create_host(logger: typing.Any) -> types.SimpleNamespace:
+    """
+    Return a stand-in for a HostGenerator without ZFS pool
+
+    The host provides the defaults and datasets that jails read when they
+    are created from data.
+    """
+    import iocage.lib.Config.Jail.Defaults
+
+    host = types.SimpleNamespace()
+    host.datasets = types.SimpleNamespace(
+        jails=types.SimpleNamespace(name="pool/iocage/jails")
+    )
+    host.default_config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults(
+        logger=logger
+    )
+    host.config_index = None
+
+    # older revisions that are measured for comparison have no cache
+    try:
+        import iocage.lib.ConfigTypeCache
+        host.config_type_cache = iocage.lib.ConfigTypeCache.ConfigTypeCache()
+    except ImportError:
+        pass
+
+    return host
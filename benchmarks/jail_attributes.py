@@ -0,0 +1,104 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Read list columns and attributes of 1000 jails
+
+Every second jail is running. Each round reads eight list columns and
+the config, logger, host, zfs, identifier and jid attributes of all jails.
+"""
+import helpers
+
+import iocage.lib.Jail
+import iocage.lib.JailState
+import iocage.lib.Logger
+import iocage.lib.ZFS
+
+JAIL_COUNT = 1000
+ROUNDS = 5
+COLUMNS = [
+    "jid",
+    "name",
+    "running",
+    "ip4.addr",
+    "boot",
+    "ip4_addr",
+    "release",
+    "priority"
+]
+
+
+def create_jails() -> list:
+    logger = iocage.lib.Logger.Logger()
+    host = helpers.create_host(logger)
+    zfs = iocage.lib.ZFS.ZFS()
+
+    jails = []
+    for i in range(JAIL_COUNT):
+        jail = iocage.lib.Jail.JailGenerator(
+            data={
+                "id": f"jail{i}",
+                "boot": "on",
+                "ip4_addr": "em0|10.0.0.1",
+                "release": "11.1-RELEASE"
+            },
+            new=True,
+            host=host,
+            zfs=zfs,
+            logger=logger
+        )
+        state_data = {"jid": str(i), "ip4.addr": "10.0.0.1"} \
+            if (i % 2 == 1) else {}
+        jail.state = iocage.lib.JailState.JailState(
+            jail.identifier,
+            state_data
+        )
+        jails.append(jail)
+    return jails
+
+
+def read_jails(jails: list) -> list:
+    rows = []
+    for jail in jails:
+        rows.append([jail.getstring(column) for column in COLUMNS])
+        jail.config
+        jail.logger
+        jail.host
+        jail.zfs
+        jail.identifier
+        jail.jid
+    return rows
+
+
+def main() -> None:
+    jails = create_jails()
+    read_jails(jails)
+
+    helpers.report(
+        f"{JAIL_COUNT} jails x {len(COLUMNS)} columns x {ROUNDS}",
+        helpers.measure(lambda: read_jails(jails), repeat=ROUNDS)
+    )
+
+
+if __name__ == "__main__":
+    main()
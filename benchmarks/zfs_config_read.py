@@ -0,0 +1,161 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""
+Read the ZFS property configs of 500 jails
+
+Each jail dataset has 70 native and 50 iocage user properties. The
+reference reads the libzfs property list once per property lookup, like
+the ZFS config type did before datasets were fetched in one pass.
+
+Listing the boot property of 500 jails with ZFS and with JSON configs
+reports the ZFS property list reads per jail. Jails with JSON configs
+must not read their ZFS properties.
+"""
+import json
+import os.path
+import tempfile
+import time
+
+import helpers
+
+import helper_functions
+import iocage.lib.Config.Type.ZFS
+import iocage.lib.Jails
+import iocage.lib.JailState
+import iocage.lib.Logger
+import iocage.lib.ZFS
+
+JAIL_COUNT = 500
+
+_prefix = iocage.lib.Config.Type.ZFS.ZFS_PROPERTY_PREFIX
+_is_iocage_property = iocage.lib.Config.Type.ZFS.is_iocage_property
+_get_iocage_property_name = iocage.lib.Config.Type.ZFS.get_iocage_property_name
+
+
+def reference_read(dataset: helper_functions.FakeDataset) -> dict:
+    for name in dataset.properties:
+        if _is_iocage_property(name):
+            break
+    data = {}
+    for name in dataset.properties:
+        if _is_iocage_property(name):
+            value = dataset.properties[name].value
+            data[_get_iocage_property_name(name)] = value
+    return data
+
+
+def prefetched_read(zfs: iocage.lib.ZFS.ZFS, tree) -> list:
+    configs = []
+    for prefetched_dataset in zfs.fetch_children(tree, _prefix):
+        config = iocage.lib.Config.Type.ZFS.ConfigZFS(
+            dataset=prefetched_dataset.dataset,
+            prefetched_dataset=prefetched_dataset
+        )
+        config.exists
+        configs.append(config._read_properties())
+    return configs
+
+
+def create_jails(
+    tree: helper_functions.FakeDataset
+) -> iocage.lib.Jails.JailsGenerator:
+    logger = iocage.lib.Logger.Logger()
+    host = helpers.create_host(logger)
+    host.datasets.jails = tree
+    host.jail_states = iocage.lib.JailState.JailStates(ttl=3600)
+    host.jail_states.updated_at = time.monotonic()
+    return iocage.lib.Jails.JailsGenerator(
+        host=host,
+        logger=logger,
+        zfs=iocage.lib.ZFS.ZFS()
+    )
+
+
+def create_json_tree(directory: str) -> helper_functions.FakeDataset:
+    children = []
+    for i in range(JAIL_COUNT):
+        mountpoint = os.path.join(directory, str(i))
+        os.mkdir(mountpoint)
+        with open(os.path.join(mountpoint, "config.json"), "w") as f:
+            json.dump({"id": str(i), "boot": "yes"}, f)
+        children.append(helper_functions.FakeDataset(
+            name=f"iocage/jails/{i}",
+            mountpoint=mountpoint
+        ))
+    return helper_functions.FakeDataset(
+        name="iocage/jails",
+        mountpoint=directory,
+        children=children
+    )
+
+
+def list_jails(tree: helper_functions.FakeDataset) -> float:
+    """
+    List the boot property and return the property reads per jail
+    """
+    jails = create_jails(tree)
+    for child in tree.children:
+        child.property_reads = 0
+    assert len(list(jails.get_values(["boot"]))) == JAIL_COUNT
+    property_reads = sum([child.property_reads for child in tree.children])
+    return property_reads / JAIL_COUNT
+
+
+def report_listing(label: str, tree: helper_functions.FakeDataset) -> None:
+    property_reads = list_jails(tree)
+    helpers.report(label, helpers.measure(lambda: list_jails(tree)))
+    print(f"{'  ZFS property reads per jail':<40} {property_reads:8.1f}")
+
+
+def main() -> None:
+    properties = dict([(f"native{i}", "x") for i in range(70)])
+    properties.update(dict([(f"{_prefix}key{i}", "v") for i in range(50)]))
+    tree = helper_functions.create_fake_dataset_tree(
+        "iocage/jails",
+        JAIL_COUNT,
+        properties
+    )
+    zfs = iocage.lib.ZFS.ZFS()
+
+    assert [reference_read(c) for c in tree.children] == \
+        prefetched_read(zfs, tree)
+
+    helpers.report("500 ZFS configs (reference)", helpers.measure(
+        lambda: [reference_read(c) for c in tree.children]
+    ))
+    helpers.report("500 ZFS configs", helpers.measure(
+        lambda: prefetched_read(zfs, tree)
+    ))
+
+    report_listing("List 500 jails with ZFS configs", tree)
+    assert list_jails(tree) <= 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_tree = create_json_tree(directory)
+        report_listing("List 500 jails with JSON configs", json_tree)
+        assert list_jails(json_tree) == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -83,7 +83,7 @@ def cli(ctx,
         logger=logger
     )
 
-    if len(list(resources)) == 0:
+    if resources.any_match() is False:
         print(filters)
         logger.error("No target matched your input")
         exit(1)
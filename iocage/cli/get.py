@@ -25,11 +25,16 @@
 import typing
 import click
 
+import iocage.cli.shared.output
 import iocage.lib.errors
+import iocage.lib.helpers
 import iocage.lib.Host
 import iocage.lib.Jail
+import iocage.lib.Jails
 import iocage.lib.Logger
 
+supported_output_formats = ['table', 'csv', 'list', 'json']
+
 
 @click.command(
     context_settings=dict(max_content_width=400,),
@@ -53,7 +58,25 @@ import iocage.lib.Logger
     "--log-level", "-d",
     default="info"
 )
-def cli(ctx, prop, _all, _pool, jail, log_level):
+@click.option(
+    "--output-format", "-f", "output_format",
+    help="Print a property matrix of all matching jails.",
+    default=None,
+    type=click.Choice(supported_output_formats)
+)
+@click.option(
+    "--header/--no-header", "-H/-NH",
+    help="Show or hide column name heading.",
+    is_flag=True,
+    default=True
+)
+@click.option(
+    "--jobs", "-j", "jobs",
+    help="Number of jails loaded in parallel.",
+    type=int,
+    default=1
+)
+def cli(ctx, prop, _all, _pool, jail, log_level, output_format, header, jobs):
     """Get a list of jails and print the property."""
 
     logger = ctx.parent.logger
@@ -70,6 +93,26 @@ def cli(ctx, prop, _all, _pool, jail, log_level):
     if jail == "":
         prop = ""
 
+    is_matrix = (output_format is not None) or ("," in prop) or \
+        any(map(lambda character: character in jail, ["*", "+", "="]))
+    if (is_matrix is True) and (jail not in ["", "defaults"]):
+        if (_all is True) or (prop == "all"):
+            keys = list(host.default_config.all_properties)
+        else:
+            keys = prop.split(",")
+        _print_property_matrix(
+            iocage.lib.Jails.JailsGenerator(
+                filters=(jail,),
+                host=host,
+                logger=logger,
+                parallel=jobs
+            ),
+            keys=keys,
+            output_format=output_format or "table",
+            show_header=header
+        )
+        return
+
     if jail == "defaults":
         source_resource = host.defaults
         lookup_method = _lookup_config_value
@@ -113,6 +156,38 @@ def cli(ctx, prop, _all, _pool, jail, log_level):
             print_property(key, value)
 
 
+def _print_property_matrix(
+    jails: 'iocage.lib.Jails.JailsGenerator',
+    keys: typing.List[str],
+    output_format: str,
+    show_header: bool
+) -> None:
+    """
+    Print the properties of all matching jails as jail x property matrix
+
+    The values are read from the raw jail configs where possible, so that
+    most jails do not need to be loaded.
+    """
+    columns = ["name"] + keys
+    rows = map(
+        lambda item: [item[0]] + list(map(
+            lambda value: str(iocage.lib.helpers.to_string(value, none="-")),
+            item[1]
+        )),
+        jails.get_values(keys)
+    )
+
+    output = iocage.cli.shared.output
+    if output_format == "list":
+        output.print_list(rows, columns, show_header, "\t")
+    elif output_format == "csv":
+        output.print_list(rows, columns, show_header, ";")
+    elif output_format == "json":
+        output.print_json(rows, columns)
+    else:
+        output.print_table(rows, columns, show_header)
+
+
 def print_property(key: str, value: str) -> None:
     print(f"{key}:{value}")
 
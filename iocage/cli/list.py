@@ -23,20 +23,28 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """list module for the cli."""
 import click
+import heapq
 import json
-import texttable
+import tempfile
 import typing
 
+import iocage.cli.shared.output
 import iocage.lib.errors
 import iocage.lib.Logger
 import iocage.lib.Host
-import iocage.lib.Resource
 import iocage.lib.Jails
 import iocage.lib.Releases
+import iocage.lib.Resource
+import iocage.lib.helpers
 
 
 supported_output_formats = ['table', 'csv', 'list', 'json']
 
+Row = iocage.cli.shared.output.Row
+
+# Number of sorted rows kept in memory before they are spilled to disk
+SORT_BUFFER_SIZE = 10000
+
 
 @click.command(name="list", help="List a specified dataset type, by default"
                                  " lists all jails.")
@@ -52,6 +60,9 @@ supported_output_formats = ['table', 'csv', 'list', 'json']
 @click.option("--plugins", "-P", is_flag=True, help="Show available plugins.")
 @click.option("--sort", "-s", "_sort", default=None, nargs=1,
               help="Sorts the list by the given type")
+@click.option("--sort-buffer", "sort_buffer_size", type=int,
+              default=SORT_BUFFER_SIZE,
+              help="Number of rows sorted in memory before using temp files.")
 @click.option("--quick", "-q", is_flag=True, default=False,
               help="Lists all jails with less processing and fields.")
 @click.option("--output", "-o", default=None)
@@ -59,13 +70,18 @@ supported_output_formats = ['table', 'csv', 'list', 'json']
               type=click.Choice(supported_output_formats))
 @click.option("--header/--no-header", "-H/-NH", is_flag=True, default=True,
               help="Show or hide column name heading.")
+@click.option("--index", "use_index", is_flag=True, default=False,
+              help="Read jail configs from the persistent config index.")
+@click.option("--jobs", "-j", "jobs", type=int, default=1,
+              help="Number of resources loaded in parallel.")
 @click.argument("filters", nargs=-1)
-def cli(ctx, dataset_type, header, _long, remote, plugins,
-        _sort, quick, output, output_format, filters):
+def cli(ctx, dataset_type, header, _long, remote, plugins, _sort,
+        sort_buffer_size, quick, output, output_format, use_index, jobs,
+        filters):
     logger = ctx.parent.logger
 
     try:
-        host = iocage.lib.Host.Host(logger=logger)
+        host = iocage.lib.Host.Host(logger=logger, config_index=use_index)
     except iocage.lib.errors.IocageNotActivated:
         exit(1)
 
@@ -86,11 +102,6 @@ def cli(ctx, dataset_type, header, _long, remote, plugins,
         logger.error("--output and --long can't be used together")
         exit(1)
 
-    if output_format != "table" and _sort is not None:
-        # Sorting destroys the ability to stream generators
-        # ToDo: Figure out if we need to sort other output formats as well
-        raise Exception("Sorting only allowed for tables")
-
     # empty filters will match all jails
     if len(filters) == 0:
         filters += ("*",)
@@ -112,106 +123,111 @@ def cli(ctx, dataset_type, header, _long, remote, plugins,
         resources = resources_class(
             logger=logger,
             host=host,
-            filters=filters  # ToDo: allow quoted whitespaces from user input
+            filters=filters,  # ToDo: allow quoted whitespaces from user input
+            parallel=jobs
         )
     except iocage.lib.errors.IocageException:
         exit(1)
 
+    # resolve the property lookups once for all resources
+    getters = list(map(resources.get_column_getter, columns))
+
+    rows: typing.Iterator[Row]
+    if _sort is None:
+        rows = map(
+            lambda resource: _lookup_resource_values(resource, getters),
+            resources
+        )
+    else:
+        sort_getter = resources.get_column_getter(_sort)
+        rows = _sort_rows(
+            map(
+                lambda resource: (
+                    _lookup_resource_values(resource, [sort_getter])[0],
+                    _lookup_resource_values(resource, getters)
+                ),
+                resources
+            ),
+            buffer_size=sort_buffer_size
+        )
+
     if output_format == "list":
-        _print_list(resources, columns, header, "\t")
+        iocage.cli.shared.output.print_list(rows, columns, header, "\t")
     elif output_format == "csv":
-        _print_list(resources, columns, header, ";")
+        iocage.cli.shared.output.print_list(rows, columns, header, ";")
     elif output_format == "json":
-        _print_json(resources, columns)
+        iocage.cli.shared.output.print_json(rows, columns)
     else:
-        _print_table(resources, columns, header, _sort)
+        iocage.cli.shared.output.print_table(
+            rows,
+            columns,
+            header,
+            stream=(_sort is None)
+        )
 
 
-def _print_table(
-    resources: typing.Generator[
-        iocage.lib.Resource.ListableResource,
-        None,
-        None
-    ],
-    columns: list,
-    show_header: bool,
-    sort_key: typing.Optional[str]=None
-) -> None:
+def _sort_rows(
+    keyed_rows: typing.Iterable[typing.Tuple[str, Row]],
+    buffer_size: int=SORT_BUFFER_SIZE
+) -> typing.Generator[Row, None, None]:
+    """
+    Sort rows by their key with bounded memory usage
 
-    table = texttable.Texttable(max_width=0)
-    table.set_cols_dtype(["t"] * len(columns))
+    Sorted runs of buffer_size rows are spilled to temporary files and
+    merged afterwards. Rows with equal keys keep their original order.
+    """
 
-    table_head = (list(x.upper() for x in columns))
-    table_data = []
+    buffer_size = max(1, buffer_size)
+    run_files: typing.List[typing.IO[str]] = []
+    buffer: typing.List[typing.Tuple[str, int, Row]] = []
 
     try:
-        sort_index = columns.index(sort_key)
-    except ValueError:
-        sort_index = -1
-
-    for resource in resources:
-        table_data.append(_lookup_resource_values(resource, columns))
-
-    if sort_index > -1:
-        table_data.sort(key=lambda x: x[sort_index])
-
-    if show_header:
-        table.add_rows([table_head] + table_data)
-    else:
-        table.add_rows(table_data)
-
-    print(table.draw())
-
-
-def _print_list(
-    resources: typing.Generator[
-        iocage.lib.Jails.JailsGenerator,
-        None,
-        None
-    ],
-    columns: list,
-    show_header: bool,
-    separator: str=";"
-) -> None:
-
-    if show_header is True:
-        print(separator.join(columns).upper())
-
-    for resource in resources:
-        print(separator.join(_lookup_resource_values(resource, columns)))
-
-
-def _print_json(
-    resources: typing.Generator[
-        iocage.lib.Jails.JailsGenerator,
-        None,
-        None
-    ],
-    columns: list,
-    **json_dumps_args
-):
-
-    if "indent" not in json_dumps_args.keys():
-        json_dumps_args["indent"] = 2
-
-    if "sort_keys" not in json_dumps_args.keys():
-        json_dumps_args["sort_keys"] = True
-
-    output = []
-
-    for resource in resources:
-        output.append(dict(zip(
-            columns,
-            _lookup_resource_values(resource, columns)
-        )))
-
-    print(json.dumps(output, **json_dumps_args))
-
-
-def _lookup_resource_values(resource, columns) -> typing.List[str]:
+        for index, (key, row) in enumerate(keyed_rows):
+            buffer.append((key, index, row))
+            if len(buffer) >= buffer_size:
+                run_files.append(_spill_sorted_rows(buffer))
+                buffer = []
+
+        buffer.sort()
+        runs = list(map(_read_spilled_rows, run_files)) + [iter(buffer)]
+        for key, index, row in heapq.merge(*runs):
+            yield row
+    finally:
+        for run_file in run_files:
+            run_file.close()
+
+
+def _spill_sorted_rows(
+    rows: typing.List[typing.Tuple[str, int, Row]]
+) -> typing.IO[str]:
+
+    rows.sort()
+    run_file = tempfile.TemporaryFile(mode="w+")
+    for item in rows:
+        run_file.write(json.dumps(item) + "\n")
+    run_file.seek(0)
+    return run_file
+
+
+def _read_spilled_rows(
+    run_file: typing.IO[str]
+) -> typing.Generator[typing.Tuple[str, int, Row], None, None]:
+
+    for line in run_file:
+        key, index, row = json.loads(line)
+        yield (key, index, row)
+
+
+def _lookup_resource_values(
+    resource: 'iocage.lib.Resource.Resource',
+    getters: typing.List[iocage.lib.Resource.ColumnGetter]
+) -> typing.List[str]:
     return list(map(
-        lambda column: str(resource.getstring(column)),
-        columns
+        lambda getter: str(iocage.lib.helpers.to_string(
+            getter(resource),
+            none="-"
+        )),
+        getters
     ))
 
 
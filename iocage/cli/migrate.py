@@ -0,0 +1,94 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""migrate module for the cli."""
+import typing
+import click
+
+import iocage.lib.events
+import iocage.lib.Jails
+import iocage.lib.Logger
+
+__rootcmd__ = True
+
+
+@click.command(
+    name="migrate",
+    help="Converts legacy ZFS and UCL jail configs to JSON."
+)
+@click.pass_context
+@click.option("--dry-run", "-n", "dry_run", default=False, is_flag=True,
+              help="Only list the jails that would be converted.")
+@click.option("--jobs", "-j", "jobs", type=int, default=1,
+              help="Number of jails converted in parallel.")
+@click.argument("jails", nargs=-1)
+def cli(
+    ctx: click.core.Context,
+    dry_run: bool,
+    jobs: int,
+    jails: typing.Tuple[str, ...]
+) -> None:
+    """
+    Converts legacy jail configs to JSON
+    """
+
+    parent: typing.Any = ctx.parent
+    logger: iocage.lib.Logger.Logger = parent.logger
+    print_function = parent.print_events
+
+    ioc_jails = iocage.lib.Jails.JailsGenerator(
+        filters=jails,
+        logger=logger,
+        parallel=jobs
+    )
+
+    # finished events may be yielded repeatedly by parallel jobs
+    migrated_jails: typing.Set[str] = set()
+    failed_jails: typing.Set[str] = set()
+
+    def track_events(
+        events: typing.Generator[iocage.lib.events.IocageEvent, None, None]
+    ) -> typing.Generator[iocage.lib.events.IocageEvent, None, None]:
+        for event in events:
+            identifier = event.identifier
+            if (event.pending is False) and (identifier is not None):
+                if event.error is not None:
+                    failed_jails.add(identifier)
+                elif event.skipped is False:
+                    migrated_jails.add(identifier)
+            yield event
+
+    print_function(track_events(ioc_jails.migrate_config(dry_run=dry_run)))
+
+    if (len(migrated_jails) == 0) and (len(failed_jails) == 0):
+        logger.screen("No jails with legacy configs found")
+    elif dry_run is True:
+        logger.screen(f"{len(migrated_jails)} jails would be converted")
+    else:
+        logger.screen(
+            f"{len(migrated_jails)} jails converted, "
+            f"{len(failed_jails)} failed"
+        )
+
+    if len(failed_jails) > 0:
+        exit(1)
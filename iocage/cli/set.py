@@ -40,12 +40,15 @@ __rootcmd__ = True
     help="Sets the specified property."
 )
 @click.pass_context
+@click.option("--jobs", "-j", "jobs", type=int, default=1,
+              help="Number of jails loaded in parallel.")
 @click.argument("props", nargs=-1)
 @click.argument("jail", nargs=1, required=True)
 def cli(
     ctx: click.core.Context,
     props: typing.Tuple[str, ...],
-    jail: str
+    jail: str,
+    jobs: int
 ) -> None:
     """Get a list of jails and print the property."""
 
@@ -67,10 +70,12 @@ def cli(
     ioc_jails = iocage.lib.Jails.JailsGenerator(
         filters,
         host=host,
-        logger=logger
+        logger=logger,
+        parallel=jobs
     )
 
     updated_jail_count = 0
+    unchanged_jail_count = 0
 
     for ioc_jail in ioc_jails:  # type: iocage.lib.Jail.JailGenerator
 
@@ -78,18 +83,24 @@ def cli(
 
         if len(updated_properties) == 0:
             logger.screen(f"Jail '{ioc_jail.humanreadable_name}' unchanged")
+            unchanged_jail_count += 1
         else:
             logger.screen(
                 f"Jail '{ioc_jail.humanreadable_name}' updated: " +
-                ", ".join(updated_properties)
+                ", ".join(sorted(updated_properties))
             )
+            updated_jail_count += 1
 
-        updated_jail_count += 1
-
-    if updated_jail_count == 0:
+    if (updated_jail_count + unchanged_jail_count) == 0:
         logger.error("No jails to update")
         exit(1)
 
+    if (updated_jail_count + unchanged_jail_count) > 1:
+        logger.screen(
+            f"{updated_jail_count} jails updated, "
+            f"{unchanged_jail_count} unchanged"
+        )
+
     exit(0)
 
 
@@ -0,0 +1,176 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Output formats shared by cli commands."""
+import itertools
+import json
+import texttable
+import typing
+
+Row = typing.List[str]
+
+# Number of rows that determine the column widths of a streamed table
+TABLE_SAMPLE_SIZE = 16
+
+# Maximum length of values in columns with a known set of values
+COLUMN_MAX_WIDTHS = {
+    "running": 3,
+    "template": 3,
+    "boot": 3,
+    "basejail": 3
+}
+
+
+def print_table(
+    rows: typing.Iterable[Row],
+    columns: list,
+    show_header: bool,
+    stream: bool=True
+) -> None:
+
+    if stream is True:
+        _print_table_stream(rows, columns, show_header)
+        return
+
+    table = texttable.Texttable(max_width=0)
+    table.set_cols_dtype(["t"] * len(columns))
+
+    table_head = (list(x.upper() for x in columns))
+    table_data = list(rows)
+
+    if show_header:
+        table.add_rows([table_head] + table_data)
+    else:
+        table.add_rows(table_data, header=False)
+
+    print(table.draw())
+
+
+def _print_table_stream(
+    table_rows: typing.Iterable[Row],
+    columns: list,
+    show_header: bool,
+    sample_size: int=TABLE_SAMPLE_SIZE
+) -> None:
+    """
+    Print table rows as soon as the resources are loaded
+
+    The column widths are taken from known column maxima or from the first
+    rows. Longer values of later rows are wrapped within the column.
+    """
+
+    table_head = (list(x.upper() for x in columns))
+    table_rows = iter(table_rows)
+
+    sampled_rows: typing.List[typing.List[str]] = []
+    if all(map(lambda column: column in COLUMN_MAX_WIDTHS, columns)):
+        widths = list(map(
+            lambda column: COLUMN_MAX_WIDTHS[column],
+            columns
+        ))
+    else:
+        sampled_rows = list(itertools.islice(table_rows, sample_size))
+        widths = [1] * len(columns)
+
+    if show_header is True:
+        sampled_rows.insert(0, table_head)
+
+    for row in sampled_rows:
+        widths = list(map(
+            lambda x: max(x[0], _get_cell_width(x[1])),
+            zip(widths, row)
+        ))
+
+    if show_header is True:
+        header_lines = _draw_table_lines(widths, table_head, header=True)
+        # the bottom border is printed by the first row
+        print("\n".join(header_lines[:-1]))
+        sampled_rows.pop(0)
+
+    has_rows = False
+    for row in itertools.chain(sampled_rows, table_rows):
+        row_lines = _draw_table_lines(widths, row)
+        if (has_rows or show_header) is True:
+            # omit the top border that was already printed
+            row_lines = row_lines[1:]
+        print("\n".join(row_lines))
+        has_rows = True
+
+    if (show_header is True) and (has_rows is False):
+        print(header_lines[-1])
+
+
+def _draw_table_lines(
+    widths: typing.List[int],
+    row: typing.List[str],
+    header: bool=False
+) -> typing.List[str]:
+
+    table = texttable.Texttable(max_width=0)
+    table.set_cols_dtype(["t"] * len(widths))
+    table.set_cols_width(widths)
+
+    if header is True:
+        table.header(row)
+    else:
+        table.add_rows([row], header=False)
+
+    return str(table.draw()).split("\n")
+
+
+def _get_cell_width(value: str) -> int:
+    return max(map(len, value.split("\n")))
+
+
+def print_list(
+    rows: typing.Iterable[Row],
+    columns: list,
+    show_header: bool,
+    separator: str=";"
+) -> None:
+
+    if show_header is True:
+        print(separator.join(columns).upper())
+
+    for row in rows:
+        print(separator.join(row))
+
+
+def print_json(
+    rows: typing.Iterable[Row],
+    columns: list,
+    **json_dumps_args
+):
+
+    if "indent" not in json_dumps_args.keys():
+        json_dumps_args["indent"] = 2
+
+    if "sort_keys" not in json_dumps_args.keys():
+        json_dumps_args["sort_keys"] = True
+
+    output = []
+
+    for row in rows:
+        output.append(dict(zip(columns, row)))
+
+    print(json.dumps(output, **json_dumps_args))
@@ -22,10 +22,14 @@
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """start module for the cli."""
+import typing
 import click
 
+import iocage.cli.shared.jail
 import iocage.lib.errors
+import iocage.lib.Jail
 import iocage.lib.Jails
+import iocage.lib.JailScheduler
 import iocage.lib.Logger
 
 __rootcmd__ = True
@@ -34,10 +38,13 @@ __rootcmd__ = True
 @click.command(name="start", help="Starts the specified jails or ALL.")
 @click.pass_context
 @click.option("--rc", default=False, is_flag=True,
-              help="Will start all jails with boot=on, in the specified"
-                   " order with smaller value for priority starting first.")
+              help="Will start all jails with boot=on, after the jails they"
+                   " depend on and with smaller value for priority first.")
+@click.option("--jobs", "-j", "jobs", type=int, default=1,
+              help="Number of jails started in parallel once the jails they"
+                   " depend on are running.")
 @click.argument("jails", nargs=-1)
-def cli(ctx, rc, jails):
+def cli(ctx, rc, jobs, jails):
     """
     Starts Jails
     """
@@ -45,7 +52,8 @@ def cli(ctx, rc, jails):
     logger = ctx.parent.logger
     start_args = {
         "logger": logger,
-        "print_function": ctx.parent.print_events
+        "print_function": ctx.parent.print_events,
+        "jobs": jobs
     }
 
     if (rc is False) and (len(jails) == 0):
@@ -61,7 +69,7 @@ def cli(ctx, rc, jails):
         normal(jails, **start_args)
 
 
-def autostart(logger, print_function):
+def autostart(logger, print_function, jobs=1):
 
     filters = ("boot=yes",)
 
@@ -69,45 +77,50 @@ def autostart(logger, print_function):
         logger=logger,
         filters=filters
     )
-
-    # sort jails by their priority
-    jails = sorted(
-        list(ioc_jails),
-        key=lambda x: x.config["priority"]
+    jails: typing.List[iocage.lib.Jail.JailGenerator] = typing.cast(
+        typing.List[iocage.lib.Jail.JailGenerator],
+        list(iter(ioc_jails))
     )
 
-    start_jails(jails, logger=logger, print_function=print_function)
+    if len(jails) == 0:
+        iocage.cli.shared.jail.exit_no_jails_matched(filters, logger)
+
+    start_jails(jails, logger=logger, print_function=print_function, jobs=jobs)
 
 
-def normal(filters, logger, print_function):
+def normal(filters, logger, print_function, jobs=1):
 
-    jails = iocage.lib.Jails.JailsGenerator(
+    ioc_jails = iocage.lib.Jails.JailsGenerator(
         logger=logger,
         filters=filters
     )
+    jails: typing.List[iocage.lib.Jail.JailGenerator] = typing.cast(
+        typing.List[iocage.lib.Jail.JailGenerator],
+        list(iter(ioc_jails))
+    )
 
-    start_jails(jails, logger=logger, print_function=print_function)
+    if len(jails) == 0:
+        iocage.cli.shared.jail.exit_no_jails_matched(filters, logger)
 
+    start_jails(jails, logger=logger, print_function=print_function, jobs=jobs)
 
-def start_jails(jails, logger, print_function):
 
-    changed_jails = []
-    failed_jails = []
-    for jail in jails:
-        try:
-            jail.require_jail_not_template()
-            print_function(jail.start())
-        except iocage.lib.errors.IocageException:
-            failed_jails.append(jail)
-            continue
+def start_jails(jails, logger, print_function, jobs=1):
 
-        logger.log(f"{jail.humanreadable_name} running as JID {jail.jid}")
-        changed_jails.append(jail)
-
-    if len(failed_jails) > 0:
+    # jails are started as soon as the jails they depend on are running
+    try:
+        scheduler = iocage.lib.JailScheduler.JailScheduler(
+            jails,
+            jobs=jobs,
+            logger=logger
+        )
+    except iocage.lib.errors.JailDependencyCycle:
         exit(1)
 
-    if len(changed_jails) == 0:
-        jails_input = " ".join(list(jails))
-        logger.error(f"No jails matched your input: {jails_input}")
+    print_function(scheduler.start())
+
+    for jail in scheduler.started_jails:
+        logger.log(f"{jail.humanreadable_name} running as JID {jail.jid}")
+
+    if len(scheduler.failed_jails) > 0:
         exit(1)
@@ -25,27 +25,32 @@
 import typing
 import click
 
+import iocage.cli.shared.jail
 import iocage.lib.errors
+import iocage.lib.Jail
 import iocage.lib.Jails
+import iocage.lib.JailScheduler
 import iocage.lib.Logger
 
-from .shared import IocageClickContext
-
 __rootcmd__ = True
 
 
 @click.command(name="stop", help="Stops the specified jails or ALL.")
 @click.pass_context
 @click.option("--rc", default=False, is_flag=True,
-              help="Will stop all jails with boot=on, in the specified"
-                   " order with higher value for priority stopping first.")
+              help="Will stop all jails with boot=on, before the jails they"
+                   " depend on and with higher value for priority first.")
+@click.option("--jobs", "-j", "jobs", type=int, default=1,
+              help="Number of jails stopped in parallel once the jails"
+                   " depending on them were stopped.")
 @click.option("--log-level", "-d", default=None)
 @click.option("--force", "-f", is_flag=True, default=False,
               help="Skip checks and enforce jail shutdown")
 @click.argument("jails", nargs=-1)
 def cli(
-    ctx: IocageClickContext,
+    ctx,
     rc: bool,
+    jobs: int,
     log_level: str,
     force: bool,
     jails: typing.Set[str]
@@ -61,44 +66,48 @@ def cli(
             logger.error("Cannot use --rc and jail selectors simultaniously")
             exit(1)
 
-        autostop(logger=logger, print_function=ctx.parent.print_events)
+        autostop(
+            logger=logger,
+            print_function=ctx.parent.print_events,
+            jobs=jobs
+        )
     else:
         normal(
             jails,
             logger=logger,
             print_function=ctx.parent.print_events,
-            force=force
+            force=force,
+            jobs=jobs
         )
 
 
 def stop_jails(
-    jails: typing.Iterator[iocage.lib.Jails.JailsGenerator],
+    jails: typing.Iterable[iocage.lib.Jail.JailGenerator],
     logger: iocage.lib.Logger.Logger,
     print_function: typing.Callable[
         [typing.Generator[iocage.lib.events.IocageEvent, None, None]],
         None
     ],
-    force: bool
+    force: bool,
+    jobs: int=1
 ) -> None:
 
-    changed_jails = []
-    failed_jails = []
-    for jail in jails:
-        try:
-            print_function(jail.stop(force=force))
-        except iocage.lib.errors.IocageException:
-            failed_jails.append(jail)
-            continue
+    # jails are stopped as soon as the jails depending on them were stopped
+    try:
+        scheduler = iocage.lib.JailScheduler.JailScheduler(
+            jails,
+            jobs=jobs,
+            logger=logger
+        )
+    except iocage.lib.errors.JailDependencyCycle:
+        exit(1)
+
+    print_function(scheduler.stop(force=force))
 
+    for jail in scheduler.stopped_jails:
         logger.log(f"{jail.name} stopped")
-        changed_jails.append(jail)
 
-    if len(failed_jails) > 0:
-        exit(1)
-
-    if len(changed_jails) == 0:
-        jails_input = " ".join(list(jails))
-        logger.error(f"No jails matched your input: {jails_input}")
+    if len(scheduler.failed_jails) > 0:
         exit(1)
 
 
@@ -109,23 +118,32 @@ def normal(
         [typing.Generator[iocage.lib.events.IocageEvent, None, None]],
         None
     ],
-    force: bool
+    force: bool,
+    jobs: int=1
 ) -> None:
 
-    jails = iocage.lib.Jails.JailsGenerator(
+    if len(filters) == 0:
+        logger.error("No jail selector provided")
+        exit(1)
+
+    ioc_jails = iocage.lib.Jails.JailsGenerator(
         logger=logger,
         filters=filters
     )
+    jails: typing.List[iocage.lib.Jail.JailGenerator] = typing.cast(
+        typing.List[iocage.lib.Jail.JailGenerator],
+        list(iter(ioc_jails))
+    )
 
     if len(jails) == 0:
-        logger.error("No jail selector provided")
-        exit(1)
+        iocage.cli.shared.jail.exit_no_jails_matched(filters, logger)
 
     stop_jails(
         jails,
         logger=logger,
         print_function=print_function,
-        force=force
+        force=force,
+        jobs=jobs
     )
 
 
@@ -134,8 +152,9 @@ def autostop(
     print_function: typing.Callable[
         [typing.Generator[iocage.lib.events.IocageEvent, None, None]],
         None
-    ]
-):
+    ],
+    jobs: int=1
+) -> None:
 
     filters = ("boot=yes",)
 
@@ -143,16 +162,18 @@ def autostop(
         logger=logger,
         filters=filters
     )
+    jails: typing.List[iocage.lib.Jail.JailGenerator] = typing.cast(
+        typing.List[iocage.lib.Jail.JailGenerator],
+        list(iter(ioc_jails))
+    )
 
-    # sort jails by their priority
-    jails = reversed(sorted(
-        list(ioc_jails),
-        key=lambda x: x.config["priority"]
-    ))
+    if len(jails) == 0:
+        iocage.cli.shared.jail.exit_no_jails_matched(filters, logger)
 
     stop_jails(
         jails,
         logger=logger,
         print_function=print_function,
-        force=False
+        force=False,
+        jobs=jobs
     )
@@ -25,12 +25,114 @@ import typing
 import re
 
 import iocage.lib.Config.Jail.JailConfigProperties
+import iocage.lib.Config.Jail.Property
 import iocage.lib.errors
 import iocage.lib.helpers
 
 # mypy
 import iocage.lib.Logger
 
+# Marks keys that did not exist before they were changed
+_MISSING = object()
+
+# Changed property names mapped to their (old, new) raw values
+ConfigChanges = typing.Dict[str, typing.Tuple[typing.Any, typing.Any]]
+
+
+class ConfigData(dict):
+    """
+    Raw config data that records the keys changed since it was saved
+
+    The first change of a key records its original value, so that changes
+    reverted before the next save do not mark the data dirty.
+    """
+
+    revision: int
+    _original_values: typing.Dict[str, typing.Any]
+    _setter_changes: ConfigChanges
+
+    def __init__(self, data: typing.Optional[dict]=None) -> None:
+        dict.__init__(self, {} if (data is None) else data)
+        self.revision = 0
+        self._original_values = {}
+        self._setter_changes = {}
+
+    def __setitem__(self, key: str, value: typing.Any) -> None:
+        exists = key in self
+        if exists and (dict.__getitem__(self, key) == value):
+            return
+        self._touch(key, exists)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._touch(key, True)
+        dict.__delitem__(self, key)
+
+    def update(self, *args, **kwargs) -> None:  # noqa: T484
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key: str, *args) -> typing.Any:  # noqa: T484
+        if key in self:
+            self._touch(key, True)
+        return dict.pop(self, key, *args)
+
+    def clear(self) -> None:
+        for key in list(self.keys()):
+            del self[key]
+
+    def _touch(self, key: str, exists: bool) -> None:
+        if key not in self._original_values:
+            if exists is True:
+                self._original_values[key] = dict.__getitem__(self, key)
+            else:
+                self._original_values[key] = _MISSING
+        self.revision += 1
+
+    def touch_setter_change(
+        self,
+        key: str,
+        old_value: typing.Any,
+        new_value: typing.Any
+    ) -> None:
+        """
+        Record a property change made by a setter outside of the data
+        """
+        if key in self._setter_changes:
+            old_value = self._setter_changes[key][0]
+        self._setter_changes[key] = (old_value, new_value)
+        self.revision += 1
+
+    @property
+    def changes(self) -> ConfigChanges:
+        """
+        Map changed keys to their (old, new) raw values
+
+        Keys that did not exist before or were deleted have a None value.
+        """
+        changes: ConfigChanges = {}
+        for key, (old_value, new_value) in self._setter_changes.items():
+            if old_value != new_value:
+                changes[key] = (old_value, new_value)
+        for key, old_value in self._original_values.items():
+            new_value = dict.get(self, key, _MISSING)
+            if (old_value is new_value) or (old_value == new_value):
+                continue
+            changes[key] = (
+                None if (old_value is _MISSING) else old_value,
+                None if (new_value is _MISSING) else new_value
+            )
+        return changes
+
+    def clear_changes(self) -> None:
+        """
+        Mark the current data as saved
+        """
+        self._original_values = {}
+        self._setter_changes = {}
+
 
 class BaseConfig(dict):
     """
@@ -70,14 +172,41 @@ class BaseConfig(dict):
         'iocage.lib.Config.Jail.'
         'JailConfigProperties.JailConfigProperties'
     )
-    data: typing.Dict[str, typing.Any]
+    data: ConfigData
+
+    # Per class lookup tables resolved by _init_dispatch_tables
+    _class_attributes: typing.FrozenSet[str]
+    _getters: typing.Dict[str, str]
+    _setters: typing.Dict[str, str]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._init_dispatch_tables()
+
+    @classmethod
+    def _init_dispatch_tables(cls) -> None:
+        """
+        Map property names to the _get_* and _set_* methods of the class
+        """
+        class_attributes = frozenset(dir(cls))
+        cls._class_attributes = class_attributes
+        cls._getters = dict([
+            (name[len("_get_"):], name)
+            for name in class_attributes
+            if name.startswith("_get_")
+        ])
+        cls._setters = dict([
+            (name[len("_set_"):], name)
+            for name in class_attributes
+            if name.startswith("_set_")
+        ])
 
     def __init__(
         self,
         logger: typing.Optional[iocage.lib.Logger.Logger]=None
     ) -> None:
 
-        self.data = {}
+        self.data = ConfigData()
         dict.__init__(self)
 
         self.logger = iocage.lib.helpers.init_logger(self, logger)
@@ -131,6 +260,29 @@ class BaseConfig(dict):
                 del data["uuid"]
 
         self.clone(data)
+        self.clear_changes()
+
+    @property
+    def changes(self) -> ConfigChanges:
+        """
+        Raw values of the properties changed since the config was read
+
+        Returns a dictionary mapping the property names to (old, new) tuples.
+        """
+        return self.data.changes
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        True if the config differs from its last read or saved state
+        """
+        return (len(self.changes) > 0) is True
+
+    def clear_changes(self) -> None:
+        """
+        Mark the current config as saved
+        """
+        self.data.clear_changes()
 
     def update_special_property(self, name: str) -> bool:
         try:
@@ -273,6 +425,34 @@ class BaseConfig(dict):
         if self._has_legacy_tag is True:
             del self.data["tag"]
 
+    def _get_depends(self) -> typing.List[str]:
+        return list(filter(
+            lambda name: name != "",
+            iocage.lib.helpers.parse_list(self.data["depends"])
+        ))
+
+    def _set_depends(
+        self,
+        value: typing.Optional[typing.Union[str, typing.List[str]]],
+        **kwargs
+    ) -> None:
+
+        names = [] if (value is None) else list(filter(
+            lambda name: name != "",
+            iocage.lib.helpers.parse_list(value)
+        ))
+        for name in names:
+            is_valid_name = iocage.lib.helpers.validate_name(name) or \
+                iocage.lib.helpers.is_uuid(name)
+            if is_valid_name is False:
+                raise iocage.lib.errors.InvalidJailConfigValue(
+                    property_name="depends",
+                    reason=f"{name} is not a valid jail name",
+                    logger=self.logger
+                )
+
+        self.data["depends"] = ",".join(names)
+
     def _get_basejail(self) -> bool:
         return iocage.lib.helpers.parse_bool(self.data["basejail"]) is True
 
@@ -430,20 +610,20 @@ class BaseConfig(dict):
     def __getitem_user(self, key: str) -> typing.Any:
 
         # passthrough existing properties
-        try:
-            return self.__getattribute__(key)
-        except AttributeError:
-            pass
+        if (key in self._class_attributes) or (key in self.__dict__):
+            try:
+                return self.__getattribute__(key)
+            except AttributeError:
+                pass
 
-        is_special_property = self.special_properties.is_special_property(key)
+        is_special_property = key in SPECIAL_PROPERTY_CLASSES
         is_existing = key in self.data.keys()
         if (is_special_property and is_existing) is True:
             return self.special_properties.get_or_create(key)
 
         # data with mappings
-        method_name = f"_get_{key}"
-        if method_name in dict.__dir__(self):
-            get_method = self.__getattribute__(method_name)
+        if key in self._getters:
+            get_method = self.__getattribute__(self._getters[key])
             return get_method()
 
         # plain data attribute
@@ -473,15 +653,14 @@ class BaseConfig(dict):
 
         parsed_value = iocage.lib.helpers.parse_user_input(value)
 
-        if self.special_properties.is_special_property(key):
+        if key in SPECIAL_PROPERTY_CLASSES:
             special_property = self.special_properties.get_or_create(key)
             special_property.set(value)
             self.update_special_property(key)
             return
 
-        setter_method_name = f"_set_{key}"
-        if setter_method_name in object.__dir__(self):
-            setter_method = self.__getattribute__(setter_method_name)
+        if key in self._setters:
+            setter_method = self.__getattribute__(self._setters[key])
             setter_method(parsed_value, **kwargs)
             return
 
@@ -506,29 +685,28 @@ class BaseConfig(dict):
 
             bool: True if the JailConfig was changed
         """
-        hash_before: typing.Any
-        hash_after: typing.Any
-
-        existed_before = key in self.user_data
-
-        try:
-            hash_before = str(self.__getitem_user(key)).__hash__()
-        except Exception:
-            hash_before = None
-
+        revision = self.data.revision
+        old_value = self._get_or_missing(key)
         self.__setitem__(key, value, **kwargs)
+        if self.data.revision != revision:
+            return True
 
-        exists_after = key in self.user_data
+        # custom setters may change a property without writing the data
+        new_value = self._get_or_missing(key)
+        if (old_value is new_value) or (old_value == new_value):
+            return False
+        self.data.touch_setter_change(
+            key,
+            None if (old_value is _MISSING) else old_value,
+            None if (new_value is _MISSING) else new_value
+        )
+        return True
 
+    def _get_or_missing(self, key: str) -> typing.Any:
         try:
-            hash_after = str(self.__getitem_user(key)).__hash__()
-        except Exception:
-            hash_after = None
-
-        if existed_before != exists_after:
-            return True
-
-        return (hash_before != hash_after) is True
+            return self[key]
+        except KeyError:
+            return _MISSING
 
     @property
     def user_data(self) -> typing.Dict[str, typing.Any]:
@@ -559,6 +737,11 @@ class BaseConfig(dict):
         return iocage.lib.helpers.to_string(parsed_input)
 
 
+BaseConfig._init_dispatch_tables()
+
+SPECIAL_PROPERTY_CLASSES = iocage.lib.Config.Jail.Property.CLASSES
+
+
 class JailConfigList(list):
 
     def __str__(self) -> str:
@@ -22,28 +22,44 @@
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 import typing
+import types
 
 import iocage.lib.Config.Jail.BaseConfig
 
 
-class DefaultsUserData(dict):
+class DefaultsUserData(iocage.lib.Config.Jail.BaseConfig.ConfigData):
 
-    user_properties: set = set()
+    user_properties: typing.Set[str]
 
     def __init__(self, defaults: dict={}) -> None:
         self.defaults = defaults
-        dict.__init__(self, defaults)
+        self.user_properties = set()
+        super().__init__(defaults)
+
+    def copy(self) -> 'DefaultsUserData':
+        """
+        Copy the data including the user properties and the change records
+        """
+        data = DefaultsUserData(defaults=self.defaults)
+        dict.update(data, self)
+        data.user_properties = set(self.user_properties)
+        data.revision = self.revision
+        data._original_values = dict(self._original_values)
+        return data
 
     def __setitem__(self, key: str, value: typing.Any) -> None:
-        dict.__setitem__(self, key, value)
-        self.user_properties.add(key)
+        super().__setitem__(key, value)
+        if key not in self.user_properties:
+            self.user_properties.add(key)
+            self.revision += 1
 
     def __delitem__(self, key: str) -> None:
         if key in self.defaults:
-            self[key] = self.defaults[key]
+            super().__setitem__(key, self.defaults[key])
         else:
-            del self[key]
+            super().__delitem__(key)
         self.user_properties.remove(key)
+        self.revision += 1
 
     @property
     def exclusive_user_data(self) -> dict:
@@ -56,6 +72,14 @@ class DefaultsUserData(dict):
 class JailConfigDefaults(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
 
     _user_data: DefaultsUserData
+    _user_data_shared: bool = False
+
+    # parsed values and sorted property names of a data revision
+    _frozen_revision: typing.Optional[
+        typing.Tuple[DefaultsUserData, int]
+    ] = None
+    _frozen_values: typing.Mapping[str, typing.Any]
+    _frozen_properties: typing.Tuple[str, ...]
 
     DEFAULTS: dict = {
         "id": None,
@@ -112,6 +136,7 @@ class JailConfigDefaults(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
         "mount_fdescfs": "1",
         "securelevel": "2",
         "tags": [],
+        "depends": [],
         "template": False,
         "jail_zfs": False
     }
@@ -126,6 +151,37 @@ class JailConfigDefaults(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
         )
         super().__init__(logger=logger)
 
+    def share_user_data(self, user_data: DefaultsUserData) -> None:
+        """
+        Use user data that is shared with other configs
+
+        The shared data is copied before it gets modified by this config.
+        """
+        self._user_data = user_data
+        self._user_data_shared = True
+
+    def _require_private_user_data(self) -> None:
+        if self._user_data_shared is True:
+            self._user_data = self._user_data.copy()
+            self._user_data_shared = False
+
+    def __setitem__(self, key: str, value: typing.Any, **kwargs) -> None:
+        self._require_private_user_data()
+        super().__setitem__(key, value, **kwargs)
+
+    def __delitem__(self, key: str) -> None:
+        self._require_private_user_data()
+        super().__delitem__(key)
+
+    def update_special_property(self, name: str) -> bool:
+        self._require_private_user_data()
+        return super().update_special_property(name)
+
+    def clear_changes(self) -> None:
+        # shared data is never changed
+        if self._user_data_shared is False:
+            super().clear_changes()
+
     @property
     def data(self) -> DefaultsUserData:
         return self._user_data
@@ -134,6 +190,71 @@ class JailConfigDefaults(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
     def data(self, value: dict):
         pass
 
+    @property
+    def frozen_values(self) -> typing.Mapping[str, typing.Any]:
+        """
+        Read-only map of all default properties to their parsed values
+
+        The map is built once and again after the defaults were changed.
+        List values are stored as tuples, so that they cannot be modified.
+        """
+        self._require_frozen_values()
+        return self._frozen_values
+
+    @property
+    def frozen_properties(self) -> typing.Tuple[str, ...]:
+        """
+        Sorted names of all default properties
+        """
+        self._require_frozen_values()
+        return self._frozen_properties
+
+    def lookup(self, key: str) -> typing.Any:
+        """
+        Return the parsed default value of a property
+
+        Properties that are not stored in the defaults are resolved by their
+        getter method or raise a KeyError. List values are returned as a new
+        list that can be modified by the caller.
+        """
+        try:
+            value = self.frozen_values[key]
+        except KeyError:
+            return self[key]
+
+        if isinstance(value, tuple) is True:
+            return list(value)
+        return value
+
+    def _require_frozen_values(self) -> None:
+        revision = (self._user_data, self._user_data.revision)
+        frozen_revision = self._frozen_revision
+        if (frozen_revision is not None) and \
+                (frozen_revision[0] is revision[0]) and \
+                (frozen_revision[1] == revision[1]):
+            return
+
+        values: typing.Dict[str, typing.Any] = {}
+        for key in list(self._user_data.keys()):
+            try:
+                value = self[key]
+            except Exception:
+                # errors are raised again when the property is looked up
+                continue
+
+            # special properties are subclasses and kept as they are
+            if type(value) is list:
+                value = tuple(value)
+            values[key] = value
+
+        self._frozen_values = types.MappingProxyType(values)
+        self._frozen_properties = tuple(sorted(self._user_data.keys()))
+        self._frozen_revision = revision
+
+    @property
+    def all_properties(self) -> list:
+        return list(self.frozen_properties)
+
     @property
     def user_data(self) -> dict:
         return self._user_data.exclusive_user_data
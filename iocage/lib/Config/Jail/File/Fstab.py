@@ -25,6 +25,7 @@ import typing
 import os.path
 import random
 
+import iocage.lib.FileWriter
 import iocage.lib.helpers
 import iocage.lib.Config.Jail.File.Prototype
 
@@ -126,7 +127,7 @@ class Fstab(list, iocage.lib.Config.Jail.File.Prototype.ResourceConfigFile):
 
         This is the file read from and written to.
         """
-        path = f"{self.jail.dataset.mountpoint}/fstab"
+        path = f"{self.jail.mountpoint}/fstab"
         self._require_path_relative_to_resource(
             filepath=path,
             resource=self.jail
@@ -214,37 +215,31 @@ class Fstab(list, iocage.lib.Config.Jail.File.Prototype.ResourceConfigFile):
 
     def read_file(self) -> None:
         if os.path.isfile(self.path):
-            with open(self.path, "r") as f:
-                self._read_file_handle(f)
-                self.logger.debug(f"fstab loaded from {self.path}")
+            self.parse_lines(iocage.lib.FileWriter.writer.read(self.path))
+            self.logger.debug(f"fstab loaded from {self.path}")
 
-    def save(self) -> None:
-        with open(self.path, "w") as f:
-            self._save_file_handle(f)
-            self.logger.verbose(f"{self.path} written")
-
-    def _save_file_handle(self, f) -> None:
-        f.write(self.__str__())
-        f.truncate()
+    def save(self) -> bool:
+        """
+        Write the fstab file unless its content is already up to date
 
-    def _read_file_handle(self, f) -> None:
-        self.parse_lines(f.read())
+        Returns True when the file was written.
+        """
+        written = iocage.lib.FileWriter.writer.write(
+            self.path,
+            self.__str__(),
+            logger=self.logger,
+            fsync=True
+        )
+        if written is True:
+            self.logger.verbose(f"{self.path} written")
+        return written
 
     def update_and_save(
         self
-    ) -> None:
-
-        # print("!!!", str(self))
-        # raise Exception("FOO")
-        if os.path.isfile(self.path):
-            f = open(self.path, "r+")
-            self._read_file_handle(f)
-            f.seek(0)
-        else:
-            f = open(self.path, "w")
+    ) -> bool:
 
-        self._save_file_handle(f)
-        f.close()
+        self.read_file()
+        return self.save()
 
     def update_release(
         self,
@@ -309,11 +304,11 @@ class Fstab(list, iocage.lib.Config.Jail.File.Prototype.ResourceConfigFile):
         )
 
         fstab_basejail_lines = []
-        release_root_path = self.release.root_dataset.mountpoint
+        release_root_path = self.release.root_path
         for basedir in basedirs:
 
             source = f"{release_root_path}/{basedir}"
-            destination = f"{self.jail.root_dataset.mountpoint}/{basedir}"
+            destination = f"{self.jail.root_path}/{basedir}"
             fstab_basejail_lines.append(FstabLine({
                 "source": source,
                 "destination": destination,
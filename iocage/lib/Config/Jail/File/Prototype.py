@@ -45,7 +45,7 @@ class ResourceConfigFile:
         resource: 'iocage.lib.LaunchableResource.LaunchableResource'
     ) -> bool:
 
-        real_resource_path = self._resolve_path(resource.dataset.mountpoint)
+        real_resource_path = self._resolve_path(resource.mountpoint)
         real_file_path = self._resolve_path(filepath)
 
         return real_file_path.startswith(real_resource_path)
@@ -26,6 +26,7 @@ import typing
 
 import ucl
 
+import iocage.lib.FileWriter
 import iocage.lib.helpers
 import iocage.lib.Config.Jail.File.Prototype
 
@@ -62,7 +63,7 @@ class RCConf(
 
     @property
     def path(self):
-        path = f"{self.resource.root_dataset.mountpoint}/{self.file}"
+        path = f"{self.resource.root_path}/{self.file}"
         self._require_path_relative_to_resource(
             filepath=path,
             resource=self.resource
@@ -139,7 +140,7 @@ class RCConf(
             self._file_content_changed = False
 
     def _read(self, silent=False) -> dict:
-        data = dict(ucl.load(open(self.path).read()))
+        data = dict(ucl.load(iocage.lib.FileWriter.writer.read(self.path)))
         self.logger.spam(f"rc.conf was read from {self.path}")
         return data
 
@@ -149,21 +150,23 @@ class RCConf(
             self.logger.debug("rc.conf was not modified - skipping write")
             return False
 
-        with open(self.path, "w") as rcconf:
+        output = ucl.dump(self, ucl.UCL_EMIT_CONFIG)
+        output = output.replace(" = \"", "=\"")
+        output = output.replace("\";\n", "\"\n")
 
-            output = ucl.dump(self, ucl.UCL_EMIT_CONFIG)
-            output = output.replace(" = \"", "=\"")
-            output = output.replace("\";\n", "\"\n")
+        self.logger.verbose(f"Writing rc.conf to {self.path}")
 
-            self.logger.verbose(f"Writing rc.conf to {self.path}")
-
-            rcconf.write(output)
-            rcconf.truncate()
-            rcconf.close()
+        written = iocage.lib.FileWriter.writer.write(
+            self.path,
+            output,
+            logger=self.logger,
+            fsync=True
+        )
 
-            self._file_content_changed = False
+        self._file_content_changed = False
+        if written is True:
             self.logger.spam(output[:-1], indent=1)
-            return True
+        return written
 
     def __setitem__(self, key, value):
         val = iocage.lib.helpers.to_string(
@@ -34,11 +34,17 @@ class JailConfig(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
 
     legacy: bool = False
     jail: typing.Optional['iocage.lib.Jail.JailGenerator']
-    data: dict = {}
+    data: iocage.lib.Config.Jail.BaseConfig.ConfigData
+
+    # sorted jail and default property names of a config revision
+    _all_properties_revision: typing.Optional[
+        typing.Tuple[int, typing.Tuple[str, ...]]
+    ] = None
+    _all_properties: typing.List[str]
 
     def __init__(
         self,
-        data: dict={},
+        data: typing.Optional[dict]=None,
         jail: typing.Optional['iocage.lib.Jail.JailGenerator']=None,
         new: bool=False,
         logger: typing.Optional['iocage.lib.Logger.Logger']=None,
@@ -52,10 +58,13 @@ class JailConfig(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
 
         self.host = iocage.lib.helpers.init_host(self, host)
 
+        if data is None:
+            data = {}
+
         if len(data.keys()) == 0:
-            self.data = {
+            self.data = iocage.lib.Config.Jail.BaseConfig.ConfigData({
                 "id": None
-            }
+            })
 
         self.jail = jail
 
@@ -85,15 +94,56 @@ class JailConfig(iocage.lib.Config.Jail.BaseConfig.BaseConfig):
             return self.jail.humanreadable_name
 
     def __getitem__(self, key: str) -> typing.Any:
+
+        # plain properties that are not set fall back to the defaults
+        is_plain_property = (key not in self._getters) and \
+            (key not in self._class_attributes) and \
+            (key not in self.data) and \
+            (key not in self.__dict__)
+        if is_plain_property is True:
+            return self.host.default_config.lookup(key)
+
         try:
             return super().__getitem__(key)
         except KeyError:
             # fall back to default
-            return self.host.default_config[key]
+            return self.host.default_config.lookup(key)
+
+    @property
+    def revision(self) -> typing.Tuple[int, typing.Tuple[str, ...]]:
+        """
+        Changes whenever the jail config or the defaults change
+
+        The defaults are represented by their frozen property names, which
+        are replaced when the defaults change.
+        """
+        default_properties = self.host.default_config.frozen_properties
+        return (self.data.revision, default_properties)
+
+    def is_revision(
+        self,
+        revision: typing.Optional[typing.Tuple[int, typing.Tuple[str, ...]]]
+    ) -> bool:
+        """
+        Returns True if the config did not change since the given revision
+        """
+        if revision is None:
+            return False
+        current_revision = self.revision
+        return (revision[0] == current_revision[0]) and \
+            (revision[1] is current_revision[1])
 
     @property
     def all_properties(self) -> list:
-        jail_config_properties = set(super().all_properties)
-        default_config_properties = set(
-            self.host.default_config.all_properties)
-        return sorted(list(jail_config_properties | default_config_properties))
+        """
+        Sorted names of the jail and default properties
+
+        The list is cached until the jail config or the defaults change.
+        """
+        if self.is_revision(self._all_properties_revision) is False:
+            revision = self.revision
+            self._all_properties = sorted(
+                set(self.data.keys()) | set(revision[1])
+            )
+            self._all_properties_revision = revision
+        return list(self._all_properties)
@@ -22,7 +22,9 @@
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 import typing
+import io
 import os.path
+import iocage.lib.FileWriter
 import iocage.lib.helpers
 import iocage.lib.Config.Prototype
 
@@ -32,7 +34,7 @@ import iocage.lib.Logger
 
 class Prototype:
 
-    logger: typing.Type[iocage.lib.Logger.Logger]
+    logger: iocage.lib.Logger.Logger
     data: dict = {}
     _file: str
 
@@ -55,20 +57,27 @@ class Prototype:
     def file(self, value: str):
         self._file = value
 
-    def read(self):
+    def read(self) -> typing.Dict[str, typing.Any]:
         try:
-            with open(self.file, "r") as data:
-                return self.map_input(data)
+            content = iocage.lib.FileWriter.writer.read(self.file)
         except FileNotFoundError:
             return {}
+        data: typing.Dict[str, typing.Any]
+        data = self.map_input(io.StringIO(content))
+        return data
 
-    def write(self, data: dict) -> None:
+    def write(self, data: dict) -> bool:
         """
         Writes changes to the config file
+
+        Returns True when the file content was changed.
         """
-        with open(self.file, "w") as conf:
-            conf.write(self.map_output(data))
-            conf.truncate()
+        return iocage.lib.FileWriter.writer.write(
+            self.file,
+            self.map_output(data),
+            logger=self.logger,
+            fsync=True
+        )
 
     def map_input(self, data: typing.Any):
         # result = data  # type: typing.Dict[str, typing.Any]
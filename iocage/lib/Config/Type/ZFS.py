@@ -27,6 +27,7 @@ import libzfs
 import iocage.lib.Config.Dataset
 import iocage.lib.Resource
 import iocage.lib.errors
+import iocage.lib.helpers
 
 
 ZFS_PROPERTY_PREFIX = "org.freebsd.iocage:"
@@ -49,6 +50,7 @@ def get_iocage_property_name(zfs_property_name: str) -> str:
 class BaseConfigZFS(iocage.lib.Config.Dataset.DatasetConfig):
 
     config_type = "zfs"
+    zfs: 'iocage.lib.ZFS.ZFS'
 
     def read(self) -> dict:
         try:
@@ -56,34 +58,40 @@ class BaseConfigZFS(iocage.lib.Config.Dataset.DatasetConfig):
         except AttributeError:
             return {}
 
-    def write(self, data: dict) -> None:
+    def write(self, data: dict) -> bool:
         """
         Writes changes to the config file
+
+        Properties that are not in the data anymore are removed. Returns True
+        when a property was changed.
         """
         output_data = {}
         for key, value in data.items():
-            output_data[key] = self._to_string(value)
-
-        # ToDo: Delete unnecessary ZFS options
-        # existing_property_names = list(
-        #   map(lambda x: get_iocage_property_name(x),
-        #     filter(
-        #       lambda name: is_iocage_property(name),
-        #       self.jail.dataset.properties
-        #     )
-        #   )
-        # )
-        # data_keys = list(self.data)
-        # for existing_property_name in existing_property_names:
-        #   if not existing_property_name in data_keys:
-        #     pass
-
-        for key, value in output_data.items():
             prop_name = f"{ZFS_PROPERTY_PREFIX}{key}"
-            prop = libzfs.ZFSUserProperty(
-                self._to_string(value)
+            output_data[prop_name] = self._to_string(value)
+
+        prefetched_dataset = self.prefetched_dataset
+        if prefetched_dataset is not None:
+            current_properties = dict(prefetched_dataset.user_properties)
+        else:
+            current_properties = self._get_iocage_properties()
+
+        changed_properties, removed_properties = (
+            self.zfs.update_user_properties(
+                self.dataset,
+                output_data,
+                property_prefix=ZFS_PROPERTY_PREFIX,
+                current_properties=current_properties
             )
-            self.dataset.properties[prop_name] = prop
+        )
+
+        if prefetched_dataset is not None:
+            user_properties = prefetched_dataset.user_properties
+            user_properties.update(changed_properties)
+            for prop_name in removed_properties:
+                del user_properties[prop_name]
+
+        return (len(changed_properties) + len(removed_properties)) > 0
 
     def map_input(self, data: dict) -> typing.Dict[str, typing.Any]:
         parse_user_input = iocage.lib.helpers.parse_user_input
@@ -102,36 +110,69 @@ class BaseConfigZFS(iocage.lib.Config.Dataset.DatasetConfig):
         """
         Returns True, when this configuration was found in the dataset
         """
-        for prop in self.dataset.properties:
-            if is_iocage_property(prop):
-                return True
+        return len(self._get_iocage_properties()) > 0
 
-        return False
+    @property
+    def prefetched_dataset(
+        self
+    ) -> typing.Optional['iocage.lib.ZFS.PrefetchedDataset']:
+        return None
 
     def _read_properties(self) -> dict:
         data = {}
-        for prop in self.dataset.properties:
-            if is_iocage_property(prop):
-                name = get_iocage_property_name(prop)
-                data[name] = self.dataset.properties[prop].value
+        for prop, value in self._get_iocage_properties().items():
+            data[get_iocage_property_name(prop)] = value
         return data
 
+    def _get_iocage_properties(self) -> typing.Dict[str, str]:
+        """
+        Values of the iocage ZFS properties
+
+        Prefetched dataset properties are preferred over reading the
+        property list of the dataset, which libzfs builds on every access.
+        """
+        prefetched_dataset = self.prefetched_dataset
+        if prefetched_dataset is not None:
+            return dict(filter(
+                lambda item: is_iocage_property(item[0]),
+                prefetched_dataset.user_properties.items()
+            ))
+
+        properties = self.dataset.properties
+        return dict([
+            (name, properties[name].value)
+            for name in properties
+            if is_iocage_property(name)
+        ])
+
 
 class ConfigZFS(BaseConfigZFS):
 
     def __init__(
         self,
         dataset: libzfs.ZFSDataset,
+        prefetched_dataset: typing.Optional[
+            'iocage.lib.ZFS.PrefetchedDataset'
+        ]=None,
+        zfs: typing.Optional['iocage.lib.ZFS.ZFS']=None,
         **kwargs
     ) -> None:
 
         self._dataset = dataset
+        self._prefetched_dataset = prefetched_dataset
         iocage.lib.Config.Dataset.DatasetConfig.__init__(self, **kwargs)
+        self.zfs = iocage.lib.helpers.init_zfs(self, zfs)
 
     @property
     def dataset(self) -> libzfs.ZFSDataset:
         return self._dataset
 
+    @property
+    def prefetched_dataset(
+        self
+    ) -> typing.Optional['iocage.lib.ZFS.PrefetchedDataset']:
+        return self._prefetched_dataset
+
 
 class ResourceConfigZFS(BaseConfigZFS):
 
@@ -143,8 +184,15 @@ class ResourceConfigZFS(BaseConfigZFS):
 
         self.resource = resource
         iocage.lib.Config.Dataset.DatasetConfig.__init__(self, **kwargs)
+        self.zfs = iocage.lib.helpers.init_zfs(self, resource.zfs)
 
     @property
     def dataset(self) -> libzfs.ZFSDataset:
         dataset: libzfs.ZFSDataset = self.resource.dataset
         return dataset
+
+    @property
+    def prefetched_dataset(
+        self
+    ) -> typing.Optional['iocage.lib.ZFS.PrefetchedDataset']:
+        return self.resource.prefetched_dataset
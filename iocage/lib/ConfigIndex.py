@@ -0,0 +1,178 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import typing
+import copy
+import json
+import os
+import threading
+
+import iocage.lib.FileWriter
+import iocage.lib.helpers
+import iocage.lib.Logger
+
+ConfigData = typing.Dict[str, typing.Any]
+FileKey = typing.List[int]
+
+
+class ConfigIndex(dict):
+    """
+    Persistent index of resource configurations
+
+    The index maps the dataset name of a resource to its parsed configuration
+    data. Each entry is keyed by the inode, modification time and size of
+    the config file it was read from. Only entries whose file changed are read
+    again, so that listing many jails does not parse all config files.
+
+    The index is stored as JSON lines in the iocage root dataset. Configs
+    stored as ZFS properties are not indexed. Resources loaded in parallel
+    share the index, so that all access to the entries is locked.
+    """
+
+    DEFAULT_FILE = ".config_index.jsonl"
+
+    def __init__(
+        self,
+        file: str,
+        logger: typing.Optional[iocage.lib.Logger.Logger]=None
+    ) -> None:
+
+        dict.__init__(self)
+        self.logger = iocage.lib.helpers.init_logger(self, logger)
+        self.file = file
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._read_file()
+
+    def read_config(
+        self,
+        dataset_name: str,
+        config_file: str,
+        read: typing.Callable[[], ConfigData]
+    ) -> ConfigData:
+        """
+        Return the config data of a resource from the index
+
+        Args:
+
+            dataset_name:
+                Name of the resource dataset the config belongs to
+
+            config_file:
+                Absolute path of the config file
+
+            read:
+                Reads the config data when the entry is missing or outdated
+        """
+        file_key = self._get_file_key(config_file)
+
+        with self._lock:
+            try:
+                entry = self[dataset_name]
+                if (file_key is not None) and (entry["key"] == file_key):
+                    self.hits += 1
+                    return copy.deepcopy(entry["config"])
+            except KeyError:
+                pass
+            self.misses += 1
+
+        # the config file is read without holding the lock
+        data = read()
+
+        with self._lock:
+            if file_key is None:
+                self.remove(dataset_name)
+            else:
+                self[dataset_name] = {
+                    "key": file_key,
+                    "config": copy.deepcopy(data)
+                }
+                self.changed = True
+
+        return data
+
+    def remove(self, dataset_name: str) -> None:
+        with self._lock:
+            if dataset_name in self.keys():
+                del self[dataset_name]
+                self.changed = True
+
+    def prune(self, dataset_names: typing.Iterable[str]) -> None:
+        """
+        Remove all entries of datasets not found in the list
+        """
+        existing_dataset_names = set(dataset_names)
+        with self._lock:
+            for dataset_name in list(self.keys()):
+                if dataset_name not in existing_dataset_names:
+                    self.remove(dataset_name)
+
+    def save(self) -> None:
+        """
+        Write the index file when entries were changed
+        """
+        with self._lock:
+            if self.changed is False:
+                return
+
+            output = "".join(map(
+                lambda item: json.dumps({
+                    "dataset": item[0],
+                    "key": item[1]["key"],
+                    "config": item[1]["config"]
+                }, sort_keys=True) + "\n",
+                self.items()
+            ))
+
+            iocage.lib.FileWriter.writer.write(self.file, output)
+
+            self.changed = False
+        self.logger.spam(
+            f"Config index written to {self.file} "
+            f"({self.hits} hits, {self.misses} misses)"
+        )
+
+    def _read_file(self) -> None:
+        try:
+            with open(self.file, "r") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self[entry["dataset"]] = {
+                        "key": entry["key"],
+                        "config": entry["config"]
+                    }
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            self.logger.verbose(f"Discarding invalid config index {self.file}")
+            self.clear()
+            self.changed = True
+
+    def _get_file_key(self, file: str) -> typing.Optional[FileKey]:
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return None
+        return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
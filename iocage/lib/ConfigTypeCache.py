@@ -0,0 +1,87 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import typing
+import os
+
+DirectorySignature = typing.Tuple[int, int]
+
+
+class ConfigTypeCache(dict):
+    """
+    Remembers the detected config types of resources
+
+    The cache maps the dataset name of a resource to the config type that
+    was detected in its mountpoint. Creating, renaming or deleting a config
+    file changes the modification time of the directory, so an entry is
+    valid as long as the inode and mtime of the mountpoint did not change.
+    This saves probing config files and ZFS properties of every resource.
+    """
+
+    def get_config_type(
+        self,
+        dataset_name: str,
+        mountpoint: typing.Optional[str]
+    ) -> typing.Optional[str]:
+        """
+        Return the cached config type or None when it needs to be detected
+        """
+        try:
+            signature, config_type = self[dataset_name]
+        except KeyError:
+            return None
+
+        if signature != _get_directory_signature(mountpoint):
+            self.remove(dataset_name)
+            return None
+
+        return str(config_type)
+
+    def set_config_type(
+        self,
+        dataset_name: str,
+        mountpoint: typing.Optional[str],
+        config_type: str
+    ) -> None:
+        signature = _get_directory_signature(mountpoint)
+        if signature is None:
+            return
+        self[dataset_name] = (signature, config_type)
+
+    def remove(self, dataset_name: str) -> None:
+        self.pop(dataset_name, None)
+
+
+def _get_directory_signature(
+    directory: typing.Optional[str]
+) -> typing.Optional[DirectorySignature]:
+
+    if directory is None:
+        return None
+
+    try:
+        stat = os.stat(directory)
+    except OSError:
+        return None
+
+    return (stat.st_ino, stat.st_mtime_ns)
@@ -68,7 +68,7 @@ class Datasets:
 
     @property
     def _active_pool_or_none(self) -> typing.Optional[libzfs.ZFSPool]:
-        zpools: typing.List[libzfs.ZFSPool] = list(self.zfs.pools)
+        zpools = list(self.zfs.pools_by_name.values())
         for pool in zpools:
             if self._is_pool_active(pool):
                 return pool
@@ -237,6 +237,7 @@ class Datasets:
             dataset = self.zfs.get_dataset(dataset_name)
         except libzfs.ZFSException:
             target_pool.create(dataset_name, {})
+            self.zfs.forget_dataset(dataset_name)
             dataset = self.zfs.get_dataset(dataset_name)
 
             if mountpoint is not None:
@@ -21,10 +21,10 @@
 # STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
-import os.path
 import re
 
 import iocage.lib.errors
+import iocage.lib.FileWriter
 import iocage.lib.helpers
 
 
@@ -316,11 +316,11 @@ class DevfsRules(list):
 
     def _read_rules_file(self, file, system=False):
 
-        f = open(file, "r")
+        content = iocage.lib.FileWriter.writer.read(file)
 
         current_ruleset = None
 
-        for line in f.readlines():
+        for line in content.splitlines():
 
             line = line.strip().rstrip("\n")
 
@@ -346,8 +346,6 @@ class DevfsRules(list):
 
             current_ruleset.append(line)
 
-        f.close()
-
     def save(self):
         """
         Apply changes to the devfs.rules file
@@ -355,18 +353,15 @@ class DevfsRules(list):
         Automatically restarts devfs service when the file was changed
         """
 
-        content_before = None
-
-        if os.path.isfile(self.rules_file):
-            f = open(self.rules_file, "r+")
-            content_before = f.read()
-            f.seek(0)
-        else:
-            f = open(self.rules_file, "w")
-
         new_content = self.__str__()
 
-        if content_before == new_content:
+        written = iocage.lib.FileWriter.writer.write(
+            self.rules_file,
+            new_content,
+            logger=self.logger
+        )
+
+        if written is False:
             if self.logger is not None:
                 self.logger.verbose(
                     f"devfs.rules file {self.rules_file} unchanged"
@@ -374,16 +369,12 @@ class DevfsRules(list):
         else:
             if self.logger is not None:
                 self.logger.verbose(
-                    f"Writing devfs.rules to {self.rules_file}"
+                    f"Wrote devfs.rules to {self.rules_file}"
                 )
                 self.logger.spam(new_content, indent=1)
 
-            f.write(new_content)
-            f.truncate()
             self._restart_devfs_service()
 
-        f.close()
-
     def _restart_devfs_service(self):
         """
         Restart devfs service after changing devfs.rules
@@ -0,0 +1,216 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import typing
+import hashlib
+import os
+import tempfile
+import threading
+
+import iocage.lib.Logger
+
+FileSignature = typing.Tuple[int, int, int]
+
+# mode of new files before the umask is applied, as with open()
+DEFAULT_FILE_MODE = 0o666
+
+_umask_lock = threading.Lock()
+
+
+def _get_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("UTF-8")).hexdigest()
+
+
+def _get_new_file_mode() -> int:
+    # the umask can only be read by replacing it
+    with _umask_lock:
+        umask = os.umask(0o022)
+        os.umask(umask)
+    return DEFAULT_FILE_MODE & ~umask
+
+
+def _get_signature(stat_result: os.stat_result) -> FileSignature:
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+class FileWriter:
+    """
+    Writes text files atomically and only when their content changed
+
+    The content is written to a temporary file in the same directory that
+    replaces the target, so that readers never see a partially written file.
+    Content digests of files read or written are remembered together with
+    the inode, modification time and size of the file. Unchanged content is
+    detected without reading the file again, as long as it was not modified
+    by someone else in the meantime.
+
+    Symlinks are resolved, so that their target is replaced instead of the
+    link. The mode, owner and group of an existing file are kept, while new
+    files get the default mode reduced by the umask of the process.
+
+    With fsync enabled the file content is synced before replacing the
+    target. The directory entries are synced in a batch by calling sync().
+    Writes of files that need to be durable enable fsync per call.
+    """
+
+    def __init__(self, fsync: bool=False) -> None:
+        self.fsync = fsync
+        self._digests: typing.Dict[str, typing.Tuple[FileSignature, str]] = {}
+        self._unsynced_directories: typing.Set[str] = set()
+        self._lock = threading.Lock()
+
+    def read(self, path: str) -> str:
+        """
+        Read a text file and remember its content digest
+        """
+        path = os.path.realpath(path)
+        with open(path, "r") as f:
+            content = f.read()
+            signature = _get_signature(os.fstat(f.fileno()))
+        self._remember(path, signature, _get_digest(content))
+        return content
+
+    def write(
+        self,
+        path: str,
+        content: str,
+        logger: typing.Optional[iocage.lib.Logger.Logger]=None,
+        fsync: typing.Optional[bool]=None
+    ) -> bool:
+        """
+        Replace the file content unless it is already up to date
+
+        Returns True when the file was written.
+
+        Args:
+
+            fsync (bool): (default=None)
+                Sync the file before replacing the target. Defaults to the
+                fsync setting of the FileWriter.
+        """
+        if fsync is None:
+            fsync = self.fsync
+        path = os.path.realpath(path)
+        digest = _get_digest(content)
+
+        try:
+            stat_result: typing.Optional[os.stat_result] = os.stat(path)
+        except FileNotFoundError:
+            stat_result = None
+
+        if stat_result is not None:
+            if self._is_current(path, _get_signature(stat_result), digest):
+                if logger is not None:
+                    logger.spam(f"{path} is up to date - skipping write")
+                return False
+            file_mode = stat_result.st_mode & 0o7777
+        else:
+            file_mode = _get_new_file_mode()
+
+        directory = os.path.dirname(path)
+        fd, temp_file = tempfile.mkstemp(dir=directory, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+                f.flush()
+                if fsync is True:
+                    os.fsync(f.fileno())
+            os.chmod(temp_file, file_mode)
+            if stat_result is not None:
+                self._copy_ownership(temp_file, stat_result)
+            os.replace(temp_file, path)
+        except BaseException:
+            os.unlink(temp_file)
+            raise
+
+        self._remember(path, _get_signature(os.stat(path)), digest)
+        if fsync is True:
+            with self._lock:
+                self._unsynced_directories.add(directory)
+
+        if logger is not None:
+            logger.spam(f"{path} was written")
+        return True
+
+    def sync(self) -> None:
+        """
+        Sync the directories of all files replaced since the last sync
+        """
+        with self._lock:
+            directories = self._unsynced_directories
+            self._unsynced_directories = set()
+
+        for directory in directories:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def forget(self, path: str) -> None:
+        path = os.path.realpath(path)
+        with self._lock:
+            if path in self._digests:
+                del self._digests[path]
+
+    def _copy_ownership(
+        self,
+        path: str,
+        stat_result: os.stat_result
+    ) -> None:
+        current_stat_result = os.stat(path)
+        owner = (stat_result.st_uid, stat_result.st_gid)
+        if owner != (current_stat_result.st_uid, current_stat_result.st_gid):
+            os.chown(path, stat_result.st_uid, stat_result.st_gid)
+
+    def _is_current(
+        self,
+        path: str,
+        signature: FileSignature,
+        digest: str
+    ) -> bool:
+
+        with self._lock:
+            known = self._digests.get(path, None)
+
+        if (known is not None) and (known[0] == signature):
+            return (known[1] == digest) is True
+
+        # the file is unknown or was changed by someone else
+        try:
+            return (_get_digest(self.read(path)) == digest) is True
+        except (FileNotFoundError, UnicodeDecodeError):
+            return False
+
+    def _remember(
+        self,
+        path: str,
+        signature: FileSignature,
+        digest: str
+    ) -> None:
+        with self._lock:
+            self._digests[path] = (signature, digest)
+
+
+# shared by all config files of the process
+writer = FileWriter()
@@ -21,6 +21,7 @@
 # STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
+import functools
 import re
 import typing
 
@@ -28,18 +29,120 @@ import iocage.lib.errors
 import iocage.lib.helpers
 import iocage.lib.Resource
 
+# Data sources a filter term can be evaluated on, ordered by their cost
+TERM_SOURCES = (
+    "name",  # name of the resource dataset
+    "state",  # runtime state (jls)
+    "config",  # raw configuration data
+    "resource"  # fully loaded resource
+)
 
-def match_filter(value: str, filter_string: str):
-    escaped_characters = [".", "$", "^", "(", ")", "?"]
-    for character in escaped_characters:
+
+# Characters that are escaped in filter strings
+ESCAPED_CHARACTERS = [".", "$", "^", "(", ")", "?"]
+
+# Characters that keep a special meaning in the filter regular expression
+PATTERN_CHARACTERS = ["*", "+", "[", "]", "{", "}", "|", "\\"]
+
+FILTER_PATTERN_CACHE_SIZE = 256
+TERM_MATCHER_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=FILTER_PATTERN_CACHE_SIZE)
+def compile_filter(filter_string: str) -> typing.Pattern:
+    """
+    Compile a filter string to a regular expression
+
+    Compiled patterns are held in a bounded cache.
+    """
+    for character in ESCAPED_CHARACTERS:
         filter_string = filter_string.replace(character, f"\\{character}")
     filter_string = filter_string.replace("*", ".*")
     filter_string = filter_string.replace("+", ".+")
-    pattern = f"^{filter_string}$"
-    match = re.match(pattern, value)
+    return re.compile(f"^{filter_string}$")
+
+
+def match_filter(value: str, filter_string: str):
+    match = compile_filter(filter_string).match(value)
     return match is not None
 
 
+def _is_exact_filter(filter_string: str) -> bool:
+    for character in PATTERN_CHARACTERS:
+        if character in filter_string:
+            return False
+    return True
+
+
+class TermMatcher:
+    """
+    A compiled predicate for the values of a filter term
+
+    Exact filter values are matched with a set lookup, pure prefix globs
+    like `web*` with str.startswith and only other globs with a regular
+    expression.
+    """
+
+    def __init__(
+        self,
+        filter_values: typing.Iterable[str],
+        short: bool=False
+    ) -> None:
+
+        self.exact_values: typing.Set[str] = set()
+        self.short_values: typing.Set[str] = set()
+        prefixes: typing.List[str] = []
+        patterns: typing.List[typing.Pattern] = []
+
+        for filter_value in filter_values:
+
+            # 8 characters without globs match a jail's shortname as well
+            has_humanreadable_length = (len(filter_value) == 8)
+            if (short and has_humanreadable_length) is True:
+                if ("*" not in filter_value) and ("+" not in filter_value):
+                    self.short_values.add(filter_value)
+
+            if _is_exact_filter(filter_value):
+                self.exact_values.add(filter_value)
+                continue
+
+            prefix = filter_value[:-1]
+            if filter_value.endswith("*") and _is_exact_filter(prefix):
+                prefixes.append(prefix)
+                continue
+
+            patterns.append(compile_filter(filter_value))
+
+        self.prefixes = tuple(prefixes)
+        self.patterns = tuple(patterns)
+
+    def __call__(self, value: str) -> bool:
+
+        if value in self.exact_values:
+            return True
+
+        if (len(self.prefixes) > 0) and value.startswith(self.prefixes):
+            return True
+
+        for pattern in self.patterns:
+            if pattern.match(value) is not None:
+                return True
+
+        if len(self.short_values) > 0:
+            shortname = iocage.lib.helpers.to_humanreadable_name(value)
+            return (shortname in self.short_values) is True
+
+        return False
+
+
+@functools.lru_cache(maxsize=TERM_MATCHER_CACHE_SIZE)
+def get_term_matcher(
+    filter_values: typing.Tuple[str, ...],
+    short: bool=False
+) -> TermMatcher:
+    return TermMatcher(filter_values, short)
+
+
 class Term(list):
 
     glob_characters = ["*", "+"]
@@ -89,26 +192,13 @@ class Term(list):
             return any(map(self.matches, value))
 
         input_value = iocage.lib.helpers.to_string(value)
+        return self.matcher(short)(input_value)
 
-        for filter_value in self:
-
-            if match_filter(input_value, filter_value):
-                return True
-
-            if short is False:
-                continue
-
-            # match against humanreadable names as well
-            has_humanreadble_length = (len(filter_value) == 8)
-            has_no_globs = not self._filter_string_has_globs(filter_value)
-            if (has_humanreadble_length and has_no_globs) is True:
-                shortname = iocage.lib.helpers.to_humanreadable_name(
-                    input_value
-                )
-                if shortname == filter_value:
-                    return True
-
-        return False
+    def matcher(self, short: bool=False) -> TermMatcher:
+        """
+        The compiled predicate for the current filter values
+        """
+        return get_term_matcher(tuple(self), short is True)
 
     def _filter_string_has_globs(self, filter_string: str) -> bool:
         for glob in self.glob_characters:
@@ -152,6 +242,10 @@ class Term(list):
         ) is True
 
 
+# Filter terms or the filter strings they are parsed from
+TermsInput = typing.Iterable[typing.Union[Term, str]]
+
+
 class Terms(list):
     """
     A group of filter terms.
@@ -162,9 +256,7 @@ class Terms(list):
 
     def __init__(
             self,
-            terms: typing.Optional[
-                typing.Iterable[typing.Union[Term, str]]
-            ]=None) -> None:
+            terms: typing.Optional[TermsInput]=None) -> None:
 
         data: typing.List[typing.Union[Term, str]] = []
 
@@ -199,18 +291,60 @@ class Terms(list):
         Returns True if the given value matches all terms for the specified key
         Returns Fals if one of the terms does not match
         """
+        short = (key == "name")
+
+        if (value is not None) and isinstance(value, list):
+            input_value = None
+        else:
+            # stringify the value once for all terms
+            input_value = iocage.lib.helpers.to_string(value)
+
         for term in self:
 
             if term.key != key:
                 continue
 
-            short = (key == "name")
+            if input_value is None:
+                matches = term.matches(value, short)
+            else:
+                matches = term.matcher(short)(input_value)
 
-            if term.matches(value, short) is False:
+            if matches is False:
                 return False
 
         return True
 
+    def plan(
+        self,
+        get_source: typing.Callable[[Term], str]
+    ) -> typing.List[typing.Tuple[str, 'Terms']]:
+        """
+        Group the terms by the data source required to evaluate them
+
+        Args:
+
+            get_source:
+                Returns the name of the cheapest source (see TERM_SOURCES)
+                a term can be evaluated on
+
+        Returns a list of (source, terms) tuples ordered by the source cost.
+        Sources without terms are omitted.
+        """
+        groups: typing.Dict[str, Terms] = {}
+        for term in self:
+            source = get_source(term)
+            if source not in TERM_SOURCES:
+                source = "resource"
+            if source not in groups:
+                groups[source] = Terms()
+            groups[source].append(term)
+
+        return [
+            (source, groups[source])
+            for source in TERM_SOURCES
+            if source in groups
+        ]
+
     def _parse_term(self, user_input: str) -> typing.List[Term]:
 
         terms = []
@@ -28,14 +28,17 @@ import re
 
 import libzfs
 
+import iocage.lib.ConfigIndex
+import iocage.lib.ConfigTypeCache
 import iocage.lib.Datasets
 import iocage.lib.DevfsRules
 import iocage.lib.Distribution
+import iocage.lib.JailState
 import iocage.lib.Resource
 import iocage.lib.helpers
 
 # MyPy
-import iocage.lib.Config.Jail.BaseConfig  # noqa: F401
+import iocage.lib.Config.Jail.Defaults  # noqa: F401
 import iocage.lib.DevfsRules
 _distribution_types = typing.Union[
     iocage.lib.Distribution.DistributionGenerator,
@@ -48,6 +51,9 @@ class HostGenerator:
     _class_distribution = iocage.lib.Distribution.DistributionGenerator
 
     _devfs: iocage.lib.DevfsRules.DevfsRules
+    _config_index: iocage.lib.ConfigIndex.ConfigIndex
+    _config_type_cache: iocage.lib.ConfigTypeCache.ConfigTypeCache
+    _jail_states: iocage.lib.JailState.JailStates
     _defaults: iocage.lib.Resource.DefaultResource
     releases_dataset: libzfs.ZFSDataset
     datasets: iocage.lib.Datasets.Datasets
@@ -70,11 +76,15 @@ class HostGenerator:
         root_dataset: typing.Optional[libzfs.ZFSDataset]=None,
         defaults: typing.Optional[iocage.lib.Resource.DefaultResource]=None,
         zfs: typing.Optional[iocage.lib.ZFS.ZFS]=None,
-        logger: typing.Optional[iocage.lib.Logger.Logger]=None
+        logger: typing.Optional[iocage.lib.Logger.Logger]=None,
+        config_index: bool=False,
+        jail_state_ttl: float=1
     ) -> None:
 
         self.logger = iocage.lib.helpers.init_logger(self, logger)
         self.zfs = iocage.lib.helpers.init_zfs(self, zfs)
+        self.use_config_index = (config_index is True)
+        self.jail_state_ttl = jail_state_ttl
 
         self.datasets = iocage.lib.Datasets.Datasets(
             logger=self.logger,
@@ -99,7 +109,7 @@ class HostGenerator:
     @property
     def default_config(
         self
-    ) -> 'iocage.lib.Config.Jail.BaseConfig.BaseConfig':
+    ) -> 'iocage.lib.Config.Jail.Defaults.JailConfigDefaults':
         return self.defaults.config
 
     def _load_defaults(self) -> iocage.lib.Resource.DefaultResource:
@@ -108,7 +118,7 @@ class HostGenerator:
             logger=self.logger,
             zfs=self.zfs
         )
-        defaults_resource.config.read(data=defaults_resource.read_config())
+        iocage.lib.Resource.defaults_registry.load(defaults_resource)
         return defaults_resource
 
     @property
@@ -122,6 +132,50 @@ class HostGenerator:
             )
         return self._devfs
 
+    @property
+    def config_index(
+        self
+    ) -> typing.Optional['iocage.lib.ConfigIndex.ConfigIndex']:
+        """
+        Lazy-loaded persistent index of jail configs or None if disabled
+        """
+        if self.use_config_index is False:
+            return None
+
+        if "_config_index" not in dir(self):
+            index_file = os.path.join(
+                self.datasets.root.mountpoint,
+                iocage.lib.ConfigIndex.ConfigIndex.DEFAULT_FILE
+            )
+            self._config_index = iocage.lib.ConfigIndex.ConfigIndex(
+                file=index_file,
+                logger=self.logger
+            )
+        return self._config_index
+
+    @property
+    def config_type_cache(self) -> iocage.lib.ConfigTypeCache.ConfigTypeCache:
+        """
+        Config types of the resources detected on this host
+        """
+        if "_config_type_cache" not in dir(self):
+            cache = iocage.lib.ConfigTypeCache.ConfigTypeCache()
+            self._config_type_cache = cache
+        return self._config_type_cache
+
+    @property
+    def jail_states(self) -> iocage.lib.JailState.JailStates:
+        """
+        Snapshot of all jail states shared by the jails of this host
+
+        The snapshot is reused for jail_state_ttl seconds.
+        """
+        if "_jail_states" not in dir(self):
+            self._jail_states = iocage.lib.JailState.JailStates(
+                ttl=self.jail_state_ttl
+            )
+        return self._jail_states
+
     @property
     def userland_version(self) -> float:
         return float(self.release_version.partition("-")[0])
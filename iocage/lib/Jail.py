@@ -33,8 +33,10 @@ import iocage.lib.events
 import iocage.lib.helpers
 import iocage.lib.JailState
 import iocage.lib.DevfsRules
+import iocage.lib.FileWriter
 import iocage.lib.Host
 import iocage.lib.Config.Jail.JailConfig
+import iocage.lib.ConfigTypeCache
 import iocage.lib.Network
 import iocage.lib.NullFSBasejailStorage
 import iocage.lib.Release
@@ -89,6 +91,13 @@ class JailResource(iocage.lib.LaunchableResource.LaunchableResource):
 
         raise Exception("This resource is not a jail or not linked to one")
 
+    @property
+    def config_type_cache(self) -> iocage.lib.ConfigTypeCache.ConfigTypeCache:
+        """
+        Config types of all jails are remembered by the host
+        """
+        return self.host.config_type_cache
+
     @property
     def fstab(self) -> 'iocage.lib.Config.Jail.File.Fstab.Fstab':
 
@@ -129,6 +138,7 @@ class JailResource(iocage.lib.LaunchableResource.LaunchableResource):
     @dataset_name.setter
     def dataset_name(self, value: str) -> None:
         self._dataset_name = value
+        self._prefetched_dataset = None
 
     @property
     def _dataset_name_from_jail_name(self) -> str:
@@ -139,6 +149,22 @@ class JailResource(iocage.lib.LaunchableResource.LaunchableResource):
 
         return f"{self.__jails_dataset_name}/{jail_id}"
 
+    def read_config(self) -> typing.Dict[str, typing.Any]:
+        """
+        Read the config data, from the host config index if enabled
+        """
+        config_index = self.host.config_index
+        if (config_index is None) or (self.config_type not in ["json", "ucl"]):
+            return iocage.lib.Resource.Resource.read_config(self)
+
+        config_handler = self.config_handler
+        data: typing.Dict[str, typing.Any] = config_index.read_config(
+            self.dataset_name,
+            config_handler.file,
+            config_handler.read
+        )
+        return data
+
     def get(self, key: str) -> typing.Any:
         try:
             out = self.jail.config[key]
@@ -193,7 +219,18 @@ class JailGenerator(JailResource):
     """
 
     _class_storage = iocage.lib.Storage.Storage
-    _state: typing.Optional[iocage.lib.JailState.JailState]
+    _state: typing.Optional[iocage.lib.JailState.JailState] = None
+
+    # config revision the auto-generated files were last saved for
+    _autoconfig_revision: typing.Optional[
+        typing.Tuple[int, typing.Tuple[str, ...]]
+    ] = None
+
+    # hook environment of the property values and its config revision
+    _property_env: typing.Dict[str, str]
+    _property_env_revision: typing.Optional[
+        typing.Tuple[int, typing.Tuple[str, ...]]
+    ] = None
 
     def __init__(
         self,
@@ -269,22 +306,35 @@ class JailGenerator(JailResource):
 
     @property
     def state(self) -> iocage.lib.JailState.JailState:
-        if "_state" not in object.__dir__(self):
-            return self._init_state()
-        elif object.__getattribute__(self, "_state") is None:
+        if self._state is None:
             return self._init_state()
-        return object.__getattribute__(self, "_state")
+        return self._state
 
     @state.setter
     def state(self, value: iocage.lib.JailState):
         object.__setattr__(self, '_state', value)
 
     def _init_state(self) -> iocage.lib.JailState.JailState:
-        state = iocage.lib.JailState.JailState(self.identifier)
+        state = iocage.lib.JailState.JailState(
+            self.identifier,
+            states=self.host.jail_states
+        )
         self.state = state
         state.query()
         return state
 
+    def _query_fresh_state(self) -> None:
+        """
+        Query the jail state bypassing the host state snapshot
+
+        Used when the jail state was changed or must be accurate, like
+        after starting or stopping the jail.
+        """
+        self.host.jail_states.invalidate(self.identifier)
+        if self.state.states is None:
+            self.state.states = self.host.jail_states
+        self.state.query()
+
     def start(
         self,
         quick: bool=False,
@@ -425,7 +475,7 @@ class JailGenerator(JailResource):
         self._teardown_mounts()
         yield jailMountTeardownEvent.end()
 
-        self.state.query()
+        self._query_fresh_state()
 
     def destroy(self, force: bool=False) -> None:
         """
@@ -439,7 +489,7 @@ class JailGenerator(JailResource):
                 requires it to be stopped.
         """
 
-        self.state.query()
+        self._query_fresh_state()
 
         if self.running is True and force is True:
             self.stop(force=True)
@@ -447,6 +497,9 @@ class JailGenerator(JailResource):
             self.require_jail_stopped()
 
         self.zfs.delete_dataset_recursive(self.dataset)
+        self._prefetched_dataset = None
+        self.invalidate_handles()
+        self.host.jail_states.invalidate(self.identifier)
 
     def rename(
         self,
@@ -475,8 +528,10 @@ class JailGenerator(JailResource):
 
         def revert_id_change() -> None:
             self.config["id"] = current_id
+            self.invalidate_handles()
             self.logger.debug(f"Jail id reverted to {current_id}")
         jailRenameEvent.add_rollback_step(revert_id_change)
+        self.invalidate_handles()
 
         try:
             events = self.storage_backend.rename(
@@ -532,7 +587,7 @@ class JailGenerator(JailResource):
             yield jailMountTeardownEvent.skip()
 
         try:
-            self.state.query()
+            self._query_fresh_state()
         except Exception as e:
             self.logger.warn(str(e))
 
@@ -605,6 +660,7 @@ class JailGenerator(JailResource):
 
         self.create_resource()
         self.get_or_create_dataset("root")
+        self.invalidate_handles()
         self._update_fstab()
 
         backend = self.storage_backend
@@ -623,16 +679,130 @@ class JailGenerator(JailResource):
         elif is_basejail and self.config["basejail_type"] == "zfs":
             return iocage.lib.ZFSBasejailStorage.ZFSBasejailStorage
 
-    def save(self) -> None:
-        self.write_config(self.config.data)
+    def save(self, force: bool=False) -> None:
+        """
+        Write the jail config and auto-generated files
+
+        Args:
+
+            force (bool): (default=False)
+                Write the config even when it was not changed
+        """
+        if (force is True) or (self.config.is_dirty is True):
+            self.write_config(self.config.data)
+            self.config.clear_changes()
+        else:
+            self.logger.debug("Jail config was not modified - skipping write")
         self._save_autoconfig()
+        iocage.lib.FileWriter.writer.sync()
+
+    def migrate_config(
+        self,
+        dry_run: bool=False
+    ) -> typing.Iterable['iocage.lib.events.IocageEvent']:
+        """
+        Convert a legacy ZFS or UCL jail config to JSON
+
+        The written config is verified by reading it again. The legacy config
+        is kept, but no longer used because JSON configs are detected first.
+
+        Args:
+
+            dry_run (bool): (default=False)
+                Only report the conversion without writing the config
+        """
+        current_config_type = self.config_type
+        if current_config_type is None:
+            # without a config type there is no legacy config to convert
+            return
+
+        jailConfigMigrationEvent = iocage.lib.events.JailConfigMigration(
+            jail=self,
+            current_config_type=current_config_type,
+            config_type="json"
+        )
+
+        yield jailConfigMigrationEvent.begin()
+
+        if current_config_type not in self.LEGACY_CONFIG_TYPES:
+            yield jailConfigMigrationEvent.skip()
+            return
+
+        if dry_run is True:
+            yield jailConfigMigrationEvent.end(
+                message=f"{current_config_type} -> json (dry-run)"
+            )
+            return
+
+        json_handler = self._get_config_handler("json")
+
+        def revert_config_type() -> None:
+            self.config_type = current_config_type
+            self.config_type_cache.remove(self.dataset_name)
+            try:
+                os.remove(json_handler.file)
+            except FileNotFoundError:
+                pass
+            iocage.lib.FileWriter.writer.forget(json_handler.file)
+            self.logger.debug(
+                f"Config type reverted to {current_config_type}"
+            )
+        jailConfigMigrationEvent.add_rollback_step(revert_config_type)
+
+        try:
+            self.config_type = "json"
+            self.save(force=True)
+            self._verify_config_file(json_handler)
+            self.config_type_cache.set_config_type(
+                self.dataset_name,
+                self.dataset.mountpoint,
+                "json"
+            )
+            yield jailConfigMigrationEvent.end()
+        except BaseException as e:
+            yield jailConfigMigrationEvent.fail(e)
+            raise
+
+    def _verify_config_file(
+        self,
+        config_handler: 'iocage.lib.Config.Prototype.Prototype'
+    ) -> None:
+        """
+        Raise when a written config does not read back to the jail config
+        """
+        config = iocage.lib.Config.Jail.JailConfig.JailConfig(
+            data={"id": self.config["id"]},
+            host=self.host,
+            jail=self,
+            logger=self.logger
+        )
+        config.read(data=config_handler.read())
+
+        to_json = iocage.lib.helpers.to_json
+        if to_json(config.data) != to_json(self.config.data):
+            raise iocage.lib.errors.JailConfigMigrationFailed(
+                jail=self,
+                reason=f"{config_handler.file} differs from the jail config",
+                logger=self.logger
+            )
 
     def _save_autoconfig(self) -> None:
         """
         Saves auto-generated files
+
+        The files are only updated when the config changed since they were
+        last saved by this instance.
         """
+        config_revision = self.config.revision
+        if self.config.is_revision(self._autoconfig_revision) is True:
+            if self.rc_conf.changed is False:
+                self.logger.spam("Auto-generated files are up to date")
+                return
+
         self.rc_conf.save()
         self._update_fstab()
+        self._autoconfig_revision = config_revision
+        iocage.lib.FileWriter.writer.sync()
 
     def _update_fstab(self) -> None:
 
@@ -727,7 +897,29 @@ class JailGenerator(JailResource):
         jail.config["devfs_ruleset"] and rules automatically added by iocage
         appears, the according rule is automatically created and added to the
         /etc/devfs.rules file on the host
+
+        The ruleset number is memoized until the jail config changes.
+        """
+        revision, ruleset_number = self._get_handle(
+            "devfs_ruleset",
+            self._get_devfs_ruleset
+        )
+        if self.config.is_revision(revision) is False:
+            self._forget_handle("devfs_ruleset")
+            revision, ruleset_number = self._get_handle(
+                "devfs_ruleset",
+                self._get_devfs_ruleset
+            )
+        return ruleset_number
+
+    def _get_devfs_ruleset(self) -> typing.Tuple[
+        typing.Tuple[int, typing.Tuple[str, ...]],
+        iocage.lib.DevfsRules.DevfsRuleset
+    ]:
+        """
+        Return the config revision and the devfs ruleset number of the jail
         """
+        revision = self.config.revision
 
         # users may reference a rule by numeric identifier or name
         # numbers are automatically selected, so it's advisable to use names
@@ -755,10 +947,10 @@ class JailGenerator(JailResource):
             # note: name and number of devfs_ruleset are both None
             new_ruleset_number = self.host.devfs.new_ruleset(devfs_ruleset)
             self.host.devfs.save()
-            return new_ruleset_number
+            return (revision, new_ruleset_number)
         else:
             ruleset_line_position = self.host.devfs.index(devfs_ruleset)
-            return self.host.devfs[ruleset_line_position].number
+            return (revision, self.host.devfs[ruleset_line_position].number)
 
     def _launch_jail(self) -> None:
 
@@ -788,7 +980,7 @@ class JailGenerator(JailResource):
             f"name={self.identifier}",
             f"host.hostname={self.config['host_hostname']}",
             f"host.domainname={self.config['host_domainname']}",
-            f"path={self.root_dataset.mountpoint}",
+            f"path={self.root_path}",
             f"securelevel={self._get_value('securelevel')}",
             f"host.hostuuid={self.name}",
             f"devfs_ruleset={self.devfs_ruleset}",
@@ -838,7 +1030,7 @@ class JailGenerator(JailResource):
         humanreadable_name = self.humanreadable_name
         try:
             iocage.lib.helpers.exec(command, logger=self.logger)
-            self.state.query()
+            self._query_fresh_state()
             self.logger.verbose(
                 f"Jail '{humanreadable_name}' started with JID {self.jid}",
                 jail=self
@@ -1194,10 +1386,7 @@ class JailGenerator(JailResource):
         The JID of a running jail or None if the jail is not running
         """
 
-        # force state init when jid was requested
-        if "_state" not in object.__dir__(self):
-            self._init_state()
-
+        # the state getter initializes the state when jid was requested
         try:
             return int(self.state["jid"])
         except (KeyError, TypeError):
@@ -1207,35 +1396,54 @@ class JailGenerator(JailResource):
     def env(self):
         """
         Environment variables for hook scripts
+
+        The IOCAGE_* property variables are cached until the config changes.
         """
         jail_env = os.environ.copy()
+        jail_env.update(self._get_property_env())
+        jail_env["IOCAGE_JAIL_PATH"] = self.root_path
 
-        for prop in self.config.all_properties:
-            prop_name = f"IOCAGE_{prop.upper()}"
-            jail_env[prop_name] = self.getstring(prop)
+        return jail_env
 
-        jail_env["IOCAGE_JAIL_PATH"] = self.root_dataset.mountpoint
+    def _get_property_env(self) -> typing.Dict[str, str]:
 
-        return jail_env
+        config = self.config
+        if config.is_revision(self._property_env_revision) is True:
+            return self._property_env
+
+        revision = config.revision
+        property_env: typing.Dict[str, str] = {}
+        for prop in config.all_properties:
+            prop_name = f"IOCAGE_{prop.upper()}"
+            property_env[prop_name] = self.getstring(prop)
+
+        self._property_env = property_env
+        self._property_env_revision = revision
+        return property_env
 
     @property
     def identifier(self):
         """
         Used internally to identify jails (in snapshots, jls, etc)
         """
-        config = object.__getattribute__(self, 'config')
-        return f"ioc-{config['id']}"
+        return f"ioc-{self.config['id']}"
 
     @property
     def release(self):
         """
         The iocage.Release instance linked with the jail
+
+        The instance is memoized until the release of the jail changes.
         """
-        return iocage.lib.Release.Release(
-            name=self.config["release"],
-            logger=self.logger,
-            host=self.host,
-            zfs=self.zfs
+        release_name = self.config["release"]
+        return self._get_handle(
+            f"release:{release_name}",
+            lambda: iocage.lib.Release.Release(
+                name=release_name,
+                logger=self.logger,
+                host=self.host,
+                zfs=self.zfs
+            )
         )
 
     @property
@@ -1245,17 +1453,18 @@ class JailGenerator(JailResource):
         """
         return f"{self.host.datasets.logs.mountpoint}-console.log"
 
-    def __getattribute__(self, key: str):
-
-        try:
-            return object.__getattribute__(self, key)
-        except AttributeError:
-            pass
+    def __getattr__(self, key: str) -> typing.Any:
+        """
+        Fall back to the runtime state of the jail
 
-        if "_state" in object.__dir__(self):
+        Only called when the regular attribute lookup failed, so that other
+        attributes of the jail are accessed without overhead.
+        """
+        state = self._state
+        if state is not None:
             try:
-                return object.__getattribute__(self, "state")[key]
-            except (AttributeError, KeyError):
+                return state[key]
+            except KeyError:
                 pass
 
         raise AttributeError(f"Jail property {key} not found")
@@ -1296,3 +1505,10 @@ class Jail(JailGenerator):
     ) -> typing.List['iocage.lib.events.IocageEvent']:
 
         return list(JailGenerator.rename(self, *args, **kwargs))
+
+    def migrate_config(
+        self,
+        dry_run: bool=False
+    ) -> typing.List['iocage.lib.events.IocageEvent']:
+
+        return list(JailGenerator.migrate_config(self, dry_run=dry_run))
@@ -0,0 +1,418 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import typing
+import collections
+import concurrent.futures
+import heapq
+import queue
+
+import iocage.lib.errors
+import iocage.lib.events
+import iocage.lib.helpers
+import iocage.lib.Logger
+
+# MyPy
+import iocage.lib.Jail  # noqa: F401
+
+JailList = typing.List['iocage.lib.Jail.JailGenerator']
+EventGenerator = typing.Generator['iocage.lib.events.IocageEvent', None, None]
+JailAction = typing.Callable[['iocage.lib.Jail.JailGenerator'], EventGenerator]
+JailNames = typing.Dict[str, typing.Set[str]]
+
+
+class JailDependencyGraph:
+    """
+    Dependencies between jails declared by their `depends` property
+
+    Only dependencies between the given jails are part of the graph. Jails
+    that are not in the list are neither started nor stopped with the others,
+    so that dependencies on them are ignored.
+    """
+
+    def __init__(
+        self,
+        jails: typing.Iterable['iocage.lib.Jail.JailGenerator'],
+        logger: typing.Optional[iocage.lib.Logger.Logger]=None
+    ) -> None:
+        """
+        Args:
+
+            jails:
+                The jails of the graph
+
+        Raises JailDependencyCycle when the dependencies form a cycle.
+        """
+        self.logger = iocage.lib.helpers.init_logger(self, logger)
+
+        self.jails: typing.Dict[str, 'iocage.lib.Jail.JailGenerator']
+        self.jails = collections.OrderedDict()
+        for jail in jails:
+            self.jails[jail.name] = jail
+
+        self.dependencies: JailNames = {}
+        self.dependents: JailNames = {name: set() for name in self.jails}
+        for name, jail in self.jails.items():
+            self.dependencies[name] = set()
+            for dependency in jail.config["depends"]:
+                if dependency not in self.jails:
+                    self.logger.verbose(
+                        f"Ignoring dependency of {jail.humanreadable_name} "
+                        f"on {dependency} that is not selected"
+                    )
+                    continue
+                self.dependencies[name].add(dependency)
+                self.dependents[dependency].add(name)
+
+        self.order = self._sort()
+
+    def _sort(self) -> typing.List[str]:
+        """
+        Topologically sort the jail names with dependencies first
+        """
+        remaining = dict([
+            (name, len(dependencies))
+            for name, dependencies in self.dependencies.items()
+        ])
+        queued = collections.deque([
+            name for name, count in remaining.items() if count == 0
+        ])
+
+        order: typing.List[str] = []
+        while len(queued) > 0:
+            name = queued.popleft()
+            order.append(name)
+            for dependent in sorted(self.dependents[name]):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queued.append(dependent)
+
+        if len(order) < len(self.jails):
+            cyclic_names = set(self.jails.keys()) - set(order)
+            raise iocage.lib.errors.JailDependencyCycle(
+                cycle=self._find_cycle(cyclic_names),
+                logger=self.logger
+            )
+
+        return order
+
+    def _find_cycle(self, names: typing.Set[str]) -> typing.List[str]:
+        """
+        Follow the dependencies of jails that could not be sorted to a cycle
+
+        Each of these jails depends on at least one other of them.
+        """
+        path: typing.List[str] = []
+        name = min(names)
+        while name not in path:
+            path.append(name)
+            name = min(self.dependencies[name] & names)
+        return path[path.index(name):] + [name]
+
+
+class JailScheduler:
+    """
+    Start and stop jails in the order of their dependencies
+
+    A jail is started as soon as all jails it depends on are running, and it
+    is stopped as soon as all jails depending on it were stopped. Up to `jobs`
+    jails are started or stopped concurrently, so that the total duration
+    follows the longest dependency chain instead of the sum of all jails.
+
+    Jails are started in groups of equal priority, smaller values first.
+    The next group is started when every jail of the previous group was
+    started or failed. Stopping runs the groups in reverse order. A jail
+    that depends on a jail with a larger priority value joins the group of
+    its dependency. A failed jail does not abort the others, but the jails
+    waiting for it are not started or stopped.
+    """
+
+    def __init__(
+        self,
+        jails: typing.Iterable['iocage.lib.Jail.JailGenerator'],
+        jobs: int=1,
+        logger: typing.Optional[iocage.lib.Logger.Logger]=None
+    ) -> None:
+        """
+        Args:
+
+            jails:
+                The jails to start or stop
+
+            jobs (int): (default=1)
+                Number of jails that are started or stopped concurrently
+
+        Raises JailDependencyCycle when the dependencies form a cycle.
+        """
+        self.logger = iocage.lib.helpers.init_logger(self, logger)
+        # iter() avoids counting a resource list before loading it
+        self.jails = list(iter(jails))
+        self.jobs = max(1, int(jobs))
+        self.graph = JailDependencyGraph(self.jails, logger=self.logger)
+        self._positions = dict([
+            (name, position)
+            for position, name in enumerate(self.graph.order)
+        ])
+        self._groups = self._get_groups()
+        self.started_jails: JailList = []
+        self.stopped_jails: JailList = []
+        self.failed_jails: typing.List[typing.Tuple[
+            'iocage.lib.Jail.JailGenerator',
+            BaseException
+        ]] = []
+
+    def start(self) -> EventGenerator:
+        """
+        Start all jails and yield their events as they occur
+        """
+        yield from self._run(
+            action=lambda jail: jail.start(),
+            prepare=self._prepare_jail,
+            finished_jails=self.started_jails
+        )
+
+    def stop(self, force: bool=False) -> EventGenerator:
+        """
+        Stop all jails and yield their events as they occur
+
+        Args:
+
+            force (bool): (default=False)
+                Skip checks and enforce the jail shutdown
+        """
+        yield from self._run(
+            action=lambda jail: jail.stop(force=force),
+            prepare=None,
+            finished_jails=self.stopped_jails,
+            reverse=True
+        )
+
+    def _run(
+        self,
+        action: JailAction,
+        prepare: typing.Optional[
+            typing.Callable[['iocage.lib.Jail.JailGenerator'], bool]
+        ],
+        finished_jails: JailList,
+        reverse: bool=False
+    ) -> EventGenerator:
+
+        # when stopping, a jail waits for its dependents instead
+        if reverse is False:
+            blockers = self.graph.dependencies
+            successors = self.graph.dependents
+        else:
+            blockers = self.graph.dependents
+            successors = self.graph.dependencies
+
+        waiting = dict([
+            (name, set(names))
+            for name, names in blockers.items()
+            if len(names) > 0
+        ])
+        ready: typing.List[typing.Tuple[int, int, int, str]] = []
+        for name in self.graph.jails.keys():
+            if name not in waiting:
+                heapq.heappush(ready, self._get_order_key(name, reverse))
+
+        # jails of a group that were not finished or failed yet
+        pending_groups: typing.Dict[int, int] = collections.Counter([
+            self._get_order_key(name, reverse)[0]
+            for name in self.graph.jails.keys()
+        ])
+
+        def finish(names: typing.Iterable[str]) -> None:
+            for name in names:
+                group = self._get_order_key(name, reverse)[0]
+                pending_groups[group] -= 1
+                if pending_groups[group] == 0:
+                    del pending_groups[group]
+
+        # events of all workers are passed to the consumer in this thread
+        # a (jail, error) tuple marks a jail that was finished or failed
+        events: queue.Queue = queue.Queue()
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.jobs
+        )
+        running_jails = 0
+        try:
+            while (len(ready) > 0) or (running_jails > 0):
+
+                while (len(ready) > 0) and (running_jails < self.jobs):
+                    # the next group waits for all jails of the current one
+                    if ready[0][0] != min(pending_groups.keys()):
+                        break
+                    name = heapq.heappop(ready)[-1]
+                    jail = self.graph.jails[name]
+                    if (prepare is not None) and (prepare(jail) is False):
+                        finish([name])
+                        finish(self._fail_successors(
+                            name, successors, waiting, reverse
+                        ))
+                        continue
+                    executor.submit(self._run_jail, jail, action, events)
+                    running_jails += 1
+
+                if running_jails == 0:
+                    break
+
+                item = events.get()
+                if not isinstance(item, tuple):
+                    yield item
+                    continue
+
+                running_jails -= 1
+                jail, error = item
+                finish([jail.name])
+                if error is not None:
+                    self._fail_jail(jail, error, reverse)
+                    finish(self._fail_successors(
+                        jail.name, successors, waiting, reverse
+                    ))
+                    continue
+
+                finished_jails.append(jail)
+                for successor in sorted(successors[jail.name]):
+                    if successor not in waiting:
+                        continue
+                    waiting[successor].discard(jail.name)
+                    if len(waiting[successor]) == 0:
+                        del waiting[successor]
+                        heapq.heappush(
+                            ready,
+                            self._get_order_key(successor, reverse)
+                        )
+        finally:
+            executor.shutdown(wait=True)
+
+    def _get_groups(self) -> typing.Dict[str, int]:
+        """
+        Priority group of each jail
+
+        A jail is in the group of its own priority, or in the group of a
+        jail it depends on when that has a larger priority value.
+        """
+        groups: typing.Dict[str, int] = {}
+        for name in self.graph.order:
+            groups[name] = max([
+                int(self.graph.jails[name].config["priority"])
+            ] + [
+                groups[dependency]
+                for dependency in self.graph.dependencies[name]
+            ])
+        return groups
+
+    def _get_order_key(
+        self,
+        name: str,
+        reverse: bool
+    ) -> typing.Tuple[int, int, int, str]:
+        """
+        Sort ready jails by group, priority and their topological position
+        """
+        group = self._groups[name]
+        priority = int(self.graph.jails[name].config["priority"])
+        position = self._positions[name]
+        if reverse is True:
+            return (-group, -priority, -position, name)
+        return (group, priority, position, name)
+
+    def _prepare_jail(self, jail: 'iocage.lib.Jail.JailGenerator') -> bool:
+        """
+        Check a jail and resolve its devfs ruleset before it is started
+
+        New devfs rulesets are written to the devfs.rules file of the host,
+        which must not happen concurrently. The ruleset number is memoized
+        by the jail, so that starting it does not modify the file.
+        """
+        try:
+            jail.require_jail_not_template()
+            jail.devfs_ruleset
+            return True
+        except Exception as e:
+            self._fail_jail(jail, e, reverse=False)
+            return False
+
+    def _run_jail(
+        self,
+        jail: 'iocage.lib.Jail.JailGenerator',
+        action: JailAction,
+        events: queue.Queue
+    ) -> None:
+
+        error: typing.Optional[BaseException] = None
+        try:
+            for event in action(jail):
+                events.put(event)
+        except Exception as e:
+            error = e
+        finally:
+            events.put((jail, error))
+
+    def _fail_successors(
+        self,
+        name: str,
+        successors: JailNames,
+        waiting: JailNames,
+        reverse: bool
+    ) -> typing.List[str]:
+        """
+        Fail all jails that directly or indirectly wait for a failed jail
+
+        Returns the names of the failed jails.
+        """
+        failed_successors: typing.List[str] = []
+        failed_names = [name]
+        while len(failed_names) > 0:
+            blocker = self.graph.jails[failed_names.pop()]
+            for successor in sorted(successors[blocker.name]):
+                if successor not in waiting:
+                    continue
+                del waiting[successor]
+                jail = self.graph.jails[successor]
+                error = iocage.lib.errors.JailDependencyFailed(
+                    jail=jail,
+                    blocker=blocker,
+                    action="stopped" if (reverse is True) else "started",
+                    logger=self.logger
+                )
+                self.failed_jails.append((jail, error))
+                failed_names.append(successor)
+                failed_successors.append(successor)
+        return failed_successors
+
+    def _fail_jail(
+        self,
+        jail: 'iocage.lib.Jail.JailGenerator',
+        error: BaseException,
+        reverse: bool
+    ) -> None:
+
+        self.failed_jails.append((jail, error))
+
+        # iocage exceptions were logged when they were raised
+        if not isinstance(error, iocage.lib.errors.IocageException):
+            action = "Stopping" if (reverse is True) else "Starting"
+            self.logger.error(
+                f"{action} jail {jail.humanreadable_name} failed: {error}"
+            )
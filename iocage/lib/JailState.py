@@ -24,6 +24,8 @@
 import typing
 import json
 import subprocess
+import threading
+import time
 
 import iocage.lib.errors
 
@@ -48,16 +50,37 @@ class JailState(dict):
     def __init__(
         self,
         name: str,
-        data: typing.Optional[typing.Dict[str, str]]=None
+        data: typing.Optional[typing.Dict[str, str]]=None,
+        states: typing.Optional['JailStates']=None
     ) -> None:
+        """
+        Args:
+
+            name (str):
+                The jail identifier (ioc-<id>)
+
+            data (dict): (optional)
+                Already known state data
+
+            states (JailStates): (optional)
+                Host state snapshot that is used instead of querying jls
+                while it is fresh
+        """
 
         self.name = name
+        self.states = states
 
         if data is not None:
             self._data = data
 
     def query(self) -> typing.Dict[str, str]:
 
+        if self.states is not None:
+            cached_data = self.states.get_state_data(self.name)
+            if cached_data is not None:
+                self._data = cached_data
+                return cached_data
+
         data: typing.Dict[str, str] = {}
         try:
             stdout = subprocess.check_output([
@@ -74,6 +97,8 @@ class JailState(dict):
             pass
 
         self._data = data
+        if self.states is not None:
+            self.states.set_state_data(self.name, data)
         return data
 
     @property
@@ -95,21 +120,116 @@ class JailState(dict):
 
 
 class JailStates(dict):
+    """
+    Snapshot of the states of all jails on the host
+
+    Within the time to live after a query, the snapshot answers state
+    lookups of single jails, so that jls does not need to run per jail.
+    Jails that change their state invalidate their entry.
+    """
+
+    updated_at: typing.Optional[float] = None
 
     def __init__(
         self,
-        states: typing.Optional[JailStatesDict]=None
+        states: typing.Optional[JailStatesDict]=None,
+        ttl: float=0
     ) -> None:
+        """
+        Args:
+
+            states (dict): (optional)
+                Initial JailState objects by their identifier
+
+            ttl (float): (default=0)
+                Seconds a query result is reused. With a value of 0 each
+                query runs jls again.
+        """
 
         if states is None:
             dict.__init__(self, {})
         else:
             dict.__init__(self, states)
 
-    def query(self):
+        self.ttl = ttl
+        self._invalidated: typing.Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def fresh(self) -> bool:
+        """
+        True while the last query is within the time to live
+        """
+        if self.updated_at is None:
+            return False
+        return (time.monotonic() - self.updated_at) < self.ttl
+
+    def get_state_data(
+        self,
+        identifier: str
+    ) -> typing.Optional[typing.Dict[str, str]]:
+        """
+        State data of a jail from a fresh snapshot
+
+        Jails that are not in the snapshot are stopped and get empty data.
+        Returns None when the snapshot or the jails entry is outdated.
+        """
+        if (self.fresh is False) or (identifier in self._invalidated):
+            return None
+
+        if identifier in self.keys():
+            state: JailState = dict.__getitem__(self, identifier)
+            return state.data
+
+        return {}
+
+    def set_state_data(
+        self,
+        identifier: str,
+        data: typing.Dict[str, str]
+    ) -> None:
+        """
+        Update the snapshot with freshly queried data of a single jail
+        """
+        self._invalidated.discard(identifier)
+        if len(data) == 0:
+            dict.pop(self, identifier, None)
+        else:
+            state = JailState(identifier, data, states=self)
+            dict.__setitem__(self, identifier, state)
+
+    def invalidate(self, identifier: typing.Optional[str]=None) -> None:
+        """
+        Mark the state of a jail or the whole snapshot as outdated
+
+        Args:
+
+            identifier (str): (optional)
+                The identifier of the jail that changed. The full snapshot
+                is outdated when no identifier is given.
+        """
+        if identifier is None:
+            self.updated_at = None
+            self._invalidated.clear()
+        else:
+            self._invalidated.add(identifier)
+
+    def query(self, force: bool=False) -> None:
         """
         Invoke update of the jail state from jls output
+
+        Args:
+
+            force (bool): (default=False)
+                Run jls even though the snapshot is still fresh
         """
+        with self._lock:
+            if (force is False) and (self.fresh is True):
+                if len(self._invalidated) == 0:
+                    return
+            self._query()
+
+    def _query(self) -> None:
         try:
             stdout = subprocess.check_output([
                 "/usr/sbin/jls",
@@ -119,8 +239,12 @@ class JailStates(dict):
             ], shell=False, stderr=subprocess.DEVNULL)  # nosec TODO use helper
             output = stdout.decode().strip()
             output_data = _parse_json(output)
+            self.clear()
             for name in output_data:
+                output_data[name].states = self
                 dict.__setitem__(self, name, output_data[name])
+            self.updated_at = time.monotonic()
+            self._invalidated.clear()
 
         except BaseException:
             raise iocage.lib.errors.JailStateUpdateFailed()
@@ -23,17 +23,26 @@
 # POSSIBILITY OF SUCH DAMAGE.
 import libzfs
 import typing
+import os.path
 
+import iocage.lib.Config.Jail.JailConfig
+import iocage.lib.Config.Jail.Property
+import iocage.lib.Config.Prototype
+import iocage.lib.Config.Type.JSON
+import iocage.lib.Config.Type.UCL
+import iocage.lib.Config.Type.ZFS
+import iocage.lib.events
 import iocage.lib.Jail
+import iocage.lib.JailState
 import iocage.lib.Filter
 import iocage.lib.Resource
+import iocage.lib.ZFS
 import iocage.lib.helpers
 
 
 class JailsGenerator(iocage.lib.Resource.ListableResource):
 
     _class_jail = iocage.lib.Jail.JailGenerator
-    states = iocage.lib.JailState.JailStates()
 
     # Keys that are stored on the Jail object, not the configuration
     JAIL_KEYS = [
@@ -44,12 +53,30 @@ class JailsGenerator(iocage.lib.Resource.ListableResource):
         "ip6.addr"
     ]
 
+    # Keys that address the jail by its name
+    NAME_KEYS = [
+        "name",
+        "id",
+        "uuid"
+    ]
+
+    # JailConfig attributes that are not configuration properties
+    CONFIG_INSTANCE_ATTRIBUTES = [
+        "data",
+        "host",
+        "jail",
+        "logger",
+        "special_properties"
+    ]
+
     def __init__(
         self,
-        filters: typing.Optional[iocage.lib.Filter.Terms]=None,
+        filters: typing.Optional[iocage.lib.Filter.TermsInput]=None,
         host=None,
         logger=None,
-        zfs=None
+        zfs=None,
+        parallel: int=1,
+        ordered: bool=True
     ) -> None:
 
         self.logger = iocage.lib.helpers.init_logger(self, logger)
@@ -59,9 +86,18 @@ class JailsGenerator(iocage.lib.Resource.ListableResource):
         iocage.lib.Resource.ListableResource.__init__(
             self,
             dataset=self.host.datasets.jails,
-            filters=filters
+            filters=filters,
+            parallel=parallel,
+            ordered=ordered
         )
 
+    @property
+    def states(self) -> iocage.lib.JailState.JailStates:
+        """
+        The jail state snapshot of the host
+        """
+        return self.host.jail_states
+
     def _create_resource_instance(
         self,
         dataset: libzfs.ZFSDataset,
@@ -82,26 +118,450 @@ class JailsGenerator(iocage.lib.Resource.ListableResource):
             self.logger.spam(
                 f"Injecting pre-loaded state to '{jail.humanreadable_name}'"
             )
-            jail.jail_state = self.states[jail.identifier]
+            jail.state = self.states[jail.identifier]
 
         return jail
 
+    def _get_key_source(self, key: str) -> str:
+        """
+        Name of the cheapest data source a jail property can be read from
+        """
+        if key in self.NAME_KEYS:
+            return "name"
+
+        if key in self.JAIL_KEYS:
+            return "state"
+
+        if self._is_raw_config_key(key) is True:
+            return "config"
+
+        return "resource"
+
+    def get_column_getter(
+        self,
+        key: str
+    ) -> iocage.lib.Resource.ColumnGetter:
+        """
+        Accessor for a property of listed jails
+
+        Instead of probing the config and jail attributes for every jail,
+        the property is read from the jail state, the config data or its
+        config getter directly.
+        """
+        source = self._get_key_source(key)
+
+        if source == "name":
+            return lambda jail: jail.config._get_id()
+
+        if source == "state":
+            return self._get_state_getter(key)
+
+        if source == "config":
+            return self._get_config_getter(key)
+
+        config_class = iocage.lib.Config.Jail.JailConfig.JailConfig
+        is_derived = (
+            hasattr(config_class, f"_get_{key}")
+            and not hasattr(config_class, key)
+            and key not in iocage.lib.Config.Jail.Property.CLASSES.keys()
+        )
+        if is_derived is True:
+            return self._get_derived_getter(key)
+
+        return iocage.lib.Resource.ListableResource.get_column_getter(
+            self,
+            key
+        )
+
+    def _get_state_getter(
+        self,
+        key: str
+    ) -> iocage.lib.Resource.ColumnGetter:
+
+        if key == "jid":
+            return lambda jail: jail.jid
+
+        if key == "running":
+            return lambda jail: jail.running
+
+        def get_state_value(jail: iocage.lib.Jail.JailGenerator) -> typing.Any:
+            try:
+                return jail.state[key]
+            except KeyError:
+                return None
+
+        return get_state_value
+
+    def _get_config_getter(
+        self,
+        key: str
+    ) -> iocage.lib.Resource.ColumnGetter:
+
+        default_config = self.host.default_config
+
+        def get_config_value(
+            jail: iocage.lib.Jail.JailGenerator
+        ) -> typing.Any:
+            data = jail.config.data
+            if key in data.keys():
+                return data[key]
+            try:
+                return default_config.lookup(key)
+            except KeyError:
+                return jail.get(key)
+
+        return get_config_value
+
+    def _get_derived_getter(
+        self,
+        key: str
+    ) -> iocage.lib.Resource.ColumnGetter:
+
+        method_name = f"_get_{key}"
+
+        def get_derived_value(
+            jail: iocage.lib.Jail.JailGenerator
+        ) -> typing.Any:
+            try:
+                return getattr(jail.config, method_name)()
+            except KeyError:
+                return jail.get(key)
+
+        return get_derived_value
+
+    def _is_raw_config_key(self, key: str) -> bool:
+        """
+        True if the config value can be read from raw config data
+
+        Special properties, properties with getters or setters and attributes
+        of the JailConfig need to be looked up from a fully loaded jail.
+        """
+        config_class = iocage.lib.Config.Jail.JailConfig.JailConfig
+
+        if key in iocage.lib.Config.Jail.Property.CLASSES.keys():
+            return False
+
+        if key in self.CONFIG_INSTANCE_ATTRIBUTES:
+            return False
+
+        for attribute in [key, f"_get_{key}", f"_set_{key}"]:
+            if hasattr(config_class, attribute):
+                return False
+
+        return True
+
+    def _get_filter_value(
+        self,
+        source: str,
+        key: str,
+        dataset: libzfs.ZFSDataset,
+        name: str,
+        source_data: typing.Dict[str, typing.Any]
+    ) -> typing.Any:
+
+        if source == "state":
+            return self._get_state_value(key, name)
+
+        if source == "config":
+            if "config" not in source_data:
+                source_data["config"] = self._read_raw_config(
+                    self._get_prefetched_dataset(dataset, source_data)
+                )
+            return self._get_raw_config_value(key, source_data["config"])
+
+        return iocage.lib.Resource.ListableResource._get_filter_value(
+            self,
+            source,
+            key,
+            dataset=dataset,
+            name=name,
+            source_data=source_data
+        )
+
+    def _get_state_value(self, key: str, name: str) -> typing.Any:
+
+        identifier = f"ioc-{name}"
+        if identifier in self.states:
+            state = self.states[identifier]
+        else:
+            state = iocage.lib.JailState.JailState(
+                identifier,
+                {},
+                states=self.states
+            )
+
+        if key in ["jid", "running"]:
+            try:
+                jid: typing.Optional[int] = int(state["jid"])
+            except (KeyError, TypeError):
+                jid = None
+            return jid if (key == "jid") else (jid is not None)
+
+        try:
+            return state[key]
+        except KeyError:
+            return None
+
+    def _get_raw_config_value(
+        self,
+        key: str,
+        data: typing.Optional[typing.Dict[str, typing.Any]]
+    ) -> typing.Any:
+
+        if data is None:
+            raise KeyError("Raw config of the jail is unavailable")
+
+        if key in data.keys():
+            return iocage.lib.helpers.parse_user_input(data[key])
+
+        # raises a KeyError when the key is not in the defaults either
+        return self.host.default_config.lookup(key)
+
+    def _read_raw_config(
+        self,
+        prefetched_dataset: iocage.lib.ZFS.PrefetchedDataset
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """
+        Read a jails config data without loading the jail
+
+        The config type is detected in the same order as a Resource does.
+        Returns None when the config cannot be read, so that the jail is
+        fully loaded and reports the error.
+        """
+        dataset = prefetched_dataset.dataset
+        mountpoint = prefetched_dataset.mountpoint
+        config_type_cache = self.host.config_type_cache
+        try:
+            config_type = config_type_cache.get_config_type(
+                dataset.name,
+                mountpoint
+            )
+            if config_type is not None:
+                config = self._get_raw_config_handler(
+                    prefetched_dataset,
+                    config_type
+                )
+            else:
+                for config_type in ["json", "ucl", "zfs"]:
+                    config = self._get_raw_config_handler(
+                        prefetched_dataset,
+                        config_type
+                    )
+                    if config.exists:
+                        config_type_cache.set_config_type(
+                            dataset.name,
+                            mountpoint,
+                            config_type
+                        )
+                        break
+                else:
+                    return {}
+
+            if config_type == "zfs":
+                return dict(config.read())
+            return self._read_indexed_config(dataset, config)
+        except (OSError, ValueError, libzfs.ZFSException) as e:
+            self.logger.debug(
+                f"Reading the raw config of {dataset.name} failed: {e}"
+            )
+            return None
+
+    def _get_raw_config_handler(
+        self,
+        prefetched_dataset: iocage.lib.ZFS.PrefetchedDataset,
+        config_type: str
+    ) -> 'iocage.lib.Config.Prototype.Prototype':
+
+        if config_type == "zfs":
+            return iocage.lib.Config.Type.ZFS.ConfigZFS(
+                dataset=prefetched_dataset.dataset,
+                prefetched_dataset=prefetched_dataset,
+                logger=self.logger,
+                zfs=self.zfs
+            )
+
+        mountpoint = prefetched_dataset.mountpoint
+        if mountpoint is None:
+            raise OSError(f"{prefetched_dataset.name} is not mounted")
+
+        handler_class: typing.Type[iocage.lib.Config.Prototype.Prototype]
+        if config_type == "json":
+            file = self._class_jail.DEFAULT_JSON_FILE
+            handler_class = iocage.lib.Config.Type.JSON.ConfigJSON
+        else:
+            file = self._class_jail.DEFAULT_UCL_FILE
+            handler_class = iocage.lib.Config.Type.UCL.ConfigUCL
+
+        return handler_class(
+            file=os.path.join(mountpoint, file),
+            logger=self.logger
+        )
+
+    def _read_indexed_config(
+        self,
+        dataset: libzfs.ZFSDataset,
+        config: 'iocage.lib.Config.Prototype.Prototype'
+    ) -> typing.Dict[str, typing.Any]:
+
+        config_index = self.host.config_index
+        if config_index is None:
+            return dict(config.read())
+
+        return dict(config_index.read_config(
+            dataset.name,
+            config.file,
+            config.read
+        ))
+
+    def get_values(
+        self,
+        keys: typing.List[str]
+    ) -> typing.Generator[iocage.lib.Resource.ResourceValues, None, None]:
+
+        # states are only required when filtering on or reading them
+        sources = [self._get_key_source(key) for key in keys]
+        sources += [source for source, terms in self._plan_filters()]
+        if "state" in sources:
+            self.states.query()
+
+        try:
+            yield from iocage.lib.Resource.ListableResource.get_values(
+                self,
+                keys
+            )
+        finally:
+            self._save_config_index()
+
+    def migrate_config(
+        self,
+        dry_run: bool=False
+    ) -> typing.Generator['iocage.lib.events.IocageEvent', None, None]:
+        """
+        Convert the legacy ZFS and UCL configs of all matching jails to JSON
+
+        With parallel > 1 the jails are converted concurrently. A failed
+        conversion is reported by its event and does not stop the others.
+
+        Args:
+
+            dry_run (bool): (default=False)
+                Only report the jails that would be converted
+        """
+        filter_plan = self._plan_filters()
+        results: typing.Iterable[
+            typing.List['iocage.lib.events.IocageEvent']
+        ]
+        if self.parallel > 1:
+            results = self._load_children_parallel(
+                self._migrate_child_config,
+                filter_plan,
+                dry_run
+            )
+        else:
+            results = map(
+                lambda child_dataset: self._migrate_child_config(
+                    child_dataset,
+                    filter_plan,
+                    dry_run
+                ),
+                self.dataset.children
+            )
+
+        try:
+            for events in results:
+                yield from events
+        finally:
+            self._save_config_index()
+
+    def _migrate_child_config(
+        self,
+        child_dataset: libzfs.ZFSDataset,
+        filter_plan: typing.List[typing.Tuple[str, iocage.lib.Filter.Terms]],
+        dry_run: bool
+    ) -> typing.List['iocage.lib.events.IocageEvent']:
+
+        # the children of JailsGenerator are jails
+        jail: typing.Optional['iocage.lib.Jail.JailGenerator']
+        jail = self._load_child(child_dataset, filter_plan)  # type: ignore
+        if jail is None:
+            return []
+
+        current_config_type = jail.config_type
+        if current_config_type not in jail.LEGACY_CONFIG_TYPES:
+            return []
+
+        events: typing.List['iocage.lib.events.IocageEvent'] = []
+        try:
+            for event in jail.migrate_config(dry_run=dry_run):
+                events.append(event)
+        except Exception as e:
+            if (len(events) > 0) and (events[-1].error is not None):
+                # the failed event reports the error
+                pass
+            elif (len(events) > 0) and (events[-1].pending is True):
+                events.append(events[-1].fail(e))
+            else:
+                # raised before the migration event began
+                events.append(iocage.lib.events.JailConfigMigration(
+                    jail=jail,
+                    current_config_type=str(current_config_type),
+                    config_type="json"
+                ).fail(e))
+        return events
+
+    def _match_children(self) -> typing.Generator[bool, None, None]:
+
+        # states are only required when filtering on them
+        for source, terms in self._plan_filters():
+            if source == "state":
+                self.states.query()
+                break
+
+        try:
+            yield from iocage.lib.Resource.ListableResource._match_children(
+                self
+            )
+        finally:
+            self._save_config_index()
+
     def __iter__(
         self
     ) -> typing.Generator['iocage.lib.Resource.Resource', None, None]:
 
         self.states.query()
 
-        for jail in iocage.lib.Resource.ListableResource.__iter__(self):
+        try:
+            for jail in iocage.lib.Resource.ListableResource.__iter__(self):
 
-            if jail.identifier in self.states:
-                jail.state = self.states[jail.identifier]
-            else:
-                jail.state = iocage.lib.JailState.JailState(
-                    jail.identifier, {}
-                )
+                if jail.identifier in self.states:
+                    jail.state = self.states[jail.identifier]
+                else:
+                    jail.state = iocage.lib.JailState.JailState(
+                        jail.identifier,
+                        {},
+                        states=self.states
+                    )
+
+                yield jail
+        finally:
+            self._save_config_index()
+
+    def _save_config_index(self) -> None:
+        """
+        Persist the configs that were read through the host config index
+
+        The index is saved whenever the jails were listed, counted or read,
+        also when the iteration was stopped early.
+        """
+        config_index = self.host.config_index
+        if config_index is None:
+            return
 
-            yield jail
+        config_index.prune(map(
+            lambda dataset: dataset.name,
+            self.dataset.children
+        ))
+        config_index.save()
 
 
 class Jails(JailsGenerator):
@@ -38,6 +38,11 @@ class LaunchableResource(iocage.lib.Resource.Resource):
     _rc_conf: typing.Optional[iocage.lib.Config.Jail.File.RCConf.RCConf] = None
     config: iocage.lib.Config.Jail.JailConfig.JailConfig
 
+    # dataset handles and mountpoints and the dataset name they belong to
+    _handles: typing.Optional[
+        typing.Tuple[str, typing.Dict[str, typing.Any]]
+    ] = None
+
     def __init__(self, *args, **kwargs) -> None:
         iocage.lib.Resource.Resource.__init__(self, *args, **kwargs)
 
@@ -46,6 +51,7 @@ class LaunchableResource(iocage.lib.Resource.Resource):
         Creates the root dataset
         """
         iocage.lib.Resource.Resource.create_resource(self)
+        self.invalidate_handles()
         self.zfs.create_dataset(self.root_dataset_name)
 
     def _require_dataset_mounted(self, dataset: libzfs.ZFSDataset) -> None:
@@ -55,13 +61,82 @@ class LaunchableResource(iocage.lib.Resource.Resource):
                 logger=self.logger
             )
 
+    def _get_handle(
+        self,
+        key: str,
+        lookup: typing.Callable[[], typing.Any]
+    ) -> typing.Any:
+        """
+        Return a memoized dataset handle or mountpoint of the resource
+
+        The handles are bound to the dataset name of the resource, so that
+        they are looked up again after the resource was renamed.
+
+        Args:
+
+            key:
+                Name of the handle
+
+            lookup:
+                Returns the value when it is not cached yet
+        """
+        dataset_name = self.dataset_name
+        if (self._handles is None) or (self._handles[0] != dataset_name):
+            self._handles = (dataset_name, {})
+
+        handles = self._handles[1]
+        try:
+            return handles[key]
+        except KeyError:
+            pass
+
+        value = lookup()
+        handles[key] = value
+        return value
+
+    def _forget_handle(self, key: str) -> None:
+        if self._handles is not None:
+            self._handles[1].pop(key, None)
+
+    def invalidate_handles(self) -> None:
+        """
+        Forget memoized dataset handles and mountpoints
+
+        Required when datasets of the resource were created or destroyed.
+        """
+        self._handles = None
+
+    @property
+    def mountpoint(self) -> str:
+        """
+        Memoized mountpoint of the resource dataset
+        """
+        mountpoint: str = self._get_handle(
+            "mountpoint",
+            lambda: str(self.dataset.mountpoint)
+        )
+        return mountpoint
+
     @property
     def root_path(self) -> str:
-        return str(self.root_dataset.mountpoint)
+        """
+        Memoized mountpoint of the root dataset
+        """
+        root_path: str = self._get_handle(
+            "root_path",
+            lambda: str(self.root_dataset.mountpoint)
+        )
+        return root_path
 
     @property
     def root_dataset(self) -> libzfs.ZFSDataset:
-        # ToDo: Memoize root_dataset
+        root_dataset: libzfs.ZFSDataset = self._get_handle(
+            "root_dataset",
+            self._get_root_dataset
+        )
+        return root_dataset
+
+    def _get_root_dataset(self) -> libzfs.ZFSDataset:
         root_dataset = self.get_dataset("root")  # type: libzfs.ZFSDataset
         self._require_dataset_mounted(root_dataset)
         return root_dataset
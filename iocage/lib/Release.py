@@ -107,6 +107,7 @@ class ReleaseResource(iocage.lib.LaunchableResource.LaunchableResource):
     @dataset_name.setter
     def dataset_name(self, value: str) -> None:
         self._dataset_name = value
+        self._prefetched_dataset = None
 
     @property
     def base_dataset(self) -> libzfs.ZFSDataset:
@@ -672,7 +673,7 @@ class ReleaseGenerator(ReleaseResource):
             self.logger.verbose(
                 f"Deleting release snapshot {self.name}@{identifier}"
             )
-            existing_snapshot.delete()
+            self.zfs.delete_snapshot(existing_snapshot)
             existing_snapshot = None
 
         self.dataset.snapshot(snapshot_name)
@@ -965,6 +966,8 @@ class ReleaseGenerator(ReleaseResource):
 
     def destroy(self, force: bool=False) -> None:
         self.zfs.delete_dataset_recursive(self.dataset)
+        self._prefetched_dataset = None
+        self.invalidate_handles()
 
 
 class Release(ReleaseGenerator):
@@ -38,10 +38,12 @@ class ReleasesGenerator(iocage.lib.Resource.ListableResource):
 
     def __init__(
         self,
-        filters: typing.Optional[iocage.lib.Filter.Terms]=None,
+        filters: typing.Optional[iocage.lib.Filter.TermsInput]=None,
         host=None,
         zfs=None,
-        logger=None
+        logger=None,
+        parallel: int=1,
+        ordered: bool=True
     ) -> None:
 
         self.logger = iocage.lib.helpers.init_logger(self, logger)
@@ -51,20 +53,23 @@ class ReleasesGenerator(iocage.lib.Resource.ListableResource):
         iocage.lib.Resource.ListableResource.__init__(
             self,
             dataset=self.host.datasets.releases,
-            filters=filters
+            filters=filters,
+            parallel=parallel,
+            ordered=ordered
         )
 
     @property
     def local(self):
-        release_datasets = self.dataset.children
+        prefetched_datasets = self.zfs.fetch_children(self.dataset)
         return list(map(
             lambda x: self._class_release(
                 name=x.name.split("/").pop(),
                 logger=self.logger,
                 host=self.host,
-                zfs=self.zfs
+                zfs=self.zfs,
+                prefetched_dataset=x
             ),
-            release_datasets
+            prefetched_datasets
         ))
 
     @property
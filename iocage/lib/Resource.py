@@ -24,14 +24,19 @@
 import typing
 import os.path
 import abc
+import concurrent.futures
+import threading
 
 import libzfs
 
 import iocage.lib.Config
 import iocage.lib.Config.Jail.Defaults
+import iocage.lib.Config.Resource.ResourceConfig
 import iocage.lib.Config.Type.JSON
 import iocage.lib.Config.Type.UCL
 import iocage.lib.Config.Type.ZFS
+import iocage.lib.ConfigTypeCache
+import iocage.lib.FileWriter
 import iocage.lib.Filter
 import iocage.lib.Logger
 import iocage.lib.Types
@@ -77,13 +82,28 @@ class Resource(metaclass=abc.ABCMeta):
         "auto"
     )
 
+    # config types that are slower to read than JSON
+    LEGACY_CONFIG_TYPES = (
+        "ucl",
+        "zfs"
+    )
+
     DEFAULT_JSON_FILE = "config.json"
     DEFAULT_UCL_FILE = "config"
 
     _config_type: typing.Optional[int] = None
     _config_file: typing.Optional[str] = None
+    _config_handlers: typing.Optional[
+        typing.Dict[str, 'iocage.lib.Config.Prototype.Prototype']
+    ] = None
+    _config_type_cache: typing.Optional[
+        iocage.lib.ConfigTypeCache.ConfigTypeCache
+    ] = None
     _dataset: libzfs.ZFSDataset
     _dataset_name: str
+    _prefetched_dataset: typing.Optional[
+        iocage.lib.ZFS.PrefetchedDataset
+    ] = None
 
     def __init__(
         self,
@@ -92,7 +112,10 @@ class Resource(metaclass=abc.ABCMeta):
         config_type: str="auto",  # auto, json, zfs, ucl
         config_file: typing.Optional[str]=None,  # 'config.json', 'config', etc
         logger: typing.Optional[iocage.lib.Logger.Logger]=None,
-        zfs: typing.Optional[iocage.lib.ZFS.ZFS]=None
+        zfs: typing.Optional[iocage.lib.ZFS.ZFS]=None,
+        prefetched_dataset: typing.Optional[
+            iocage.lib.ZFS.PrefetchedDataset
+        ]=None
     ) -> None:
 
         self.logger = iocage.lib.helpers.init_logger(self, logger)
@@ -105,30 +128,75 @@ class Resource(metaclass=abc.ABCMeta):
             self.dataset_name = dataset_name
         elif dataset is not None:
             self.dataset = dataset
+        elif prefetched_dataset is not None:
+            self.dataset = prefetched_dataset.dataset
+
+        # assigned after the dataset, because changing it resets the data
+        self._prefetched_dataset = prefetched_dataset
 
     @property
     def config_json(self) -> 'iocage.lib.Config.Type.JSON.ResourceConfigJSON':
-        default = self.DEFAULT_JSON_FILE
-        file = self._config_file if self._config_file is not None else default
-        return iocage.lib.Config.Type.JSON.ResourceConfigJSON(
-            file=file,
-            resource=self,
-            logger=self.logger
+        return typing.cast(
+            iocage.lib.Config.Type.JSON.ResourceConfigJSON,
+            self._get_config_handler("json")
         )
 
     @property
     def config_ucl(self) -> 'iocage.lib.Config.Type.UCL.ResourceConfigUCL':
-        default = self.DEFAULT_UCL_FILE
-        file = self._config_file if self._config_file is not None else default
-        return iocage.lib.Config.Type.UCL.ResourceConfigUCL(
-            file=file,
-            resource=self,
-            logger=self.logger
+        return typing.cast(
+            iocage.lib.Config.Type.UCL.ResourceConfigUCL,
+            self._get_config_handler("ucl")
         )
 
     @property
     def config_zfs(self) -> 'iocage.lib.Config.Type.ZFS.ResourceConfigZFS':
-        return iocage.lib.Config.Type.ZFS.ResourceConfigZFS(
+        return typing.cast(
+            iocage.lib.Config.Type.ZFS.ResourceConfigZFS,
+            self._get_config_handler("zfs")
+        )
+
+    def _get_config_handler(
+        self,
+        config_type: str
+    ) -> 'iocage.lib.Config.Prototype.Prototype':
+        """
+        Return the config handler of a type, created once per resource
+        """
+        if self._config_handlers is None:
+            self._config_handlers = {}
+        try:
+            return self._config_handlers[config_type]
+        except KeyError:
+            pass
+
+        handler = self._create_config_handler(config_type)
+        self._config_handlers[config_type] = handler
+        return handler
+
+    def _create_config_handler(
+        self,
+        config_type: str
+    ) -> 'iocage.lib.Config.Prototype.Prototype':
+
+        if config_type == "zfs":
+            return iocage.lib.Config.Type.ZFS.ResourceConfigZFS(
+                resource=self,
+                logger=self.logger
+            )
+
+        handler_class: typing.Type[
+            iocage.lib.Config.Resource.ResourceConfig.ResourceConfig
+        ]
+        if config_type == "json":
+            default = self.DEFAULT_JSON_FILE
+            handler_class = iocage.lib.Config.Type.JSON.ResourceConfigJSON
+        else:
+            default = self.DEFAULT_UCL_FILE
+            handler_class = iocage.lib.Config.Type.UCL.ResourceConfigUCL
+
+        file = self._config_file if self._config_file is not None else default
+        return handler_class(
+            file=file,
             resource=self,
             logger=self.logger
         )
@@ -146,8 +214,22 @@ class Resource(metaclass=abc.ABCMeta):
     def pool_name(self) -> str:
         return str(self.pool.name)
 
+    @property
+    def prefetched_dataset(
+        self
+    ) -> typing.Optional[iocage.lib.ZFS.PrefetchedDataset]:
+        """
+        Dataset properties read in bulk when the resource was listed
+
+        The data is dropped when the dataset of the resource changes.
+        """
+        return self._prefetched_dataset
+
     @property
     def exists(self) -> bool:
+        if self._prefetched_dataset is not None:
+            mountpoint = self._prefetched_dataset.mountpoint
+            return (mountpoint is not None) and os.path.isdir(mountpoint)
         try:
             return os.path.isdir(self.dataset.mountpoint)
         except (AttributeError, libzfs.ZFSException):
@@ -177,6 +259,7 @@ class Resource(metaclass=abc.ABCMeta):
     @dataset_name.setter
     def dataset_name(self, value: str) -> None:
         self._dataset_name = value
+        self._prefetched_dataset = None
 
     @property
     def dataset(self) -> libzfs.ZFSDataset:
@@ -198,32 +281,54 @@ class Resource(metaclass=abc.ABCMeta):
         except AttributeError:
             pass
         self._dataset = value
+        self._prefetched_dataset = None
 
     @property
     def config_type(self) -> typing.Optional[str]:
         if self._config_type is None:
             return None
         elif self._config_type == self.CONFIG_TYPES.index("auto"):
-            self._config_type = self._detect_config_type()
+            return self.CONFIG_TYPES[self._detect_config_type()]
         return self.CONFIG_TYPES[self._config_type]
 
     @config_type.setter
-    def config_type(self, value: typing.Optional[int]):
+    def config_type(self, value: typing.Optional[str]) -> None:
         if value is None:
             self._config_type = None
         else:
             self._config_type = self.CONFIG_TYPES.index(value)
 
-    def _detect_config_type(self) -> int:
-
-        if self.config_json.exists:
-            return self.CONFIG_TYPES.index("json")
+    @property
+    def config_type_cache(self) -> iocage.lib.ConfigTypeCache.ConfigTypeCache:
+        """
+        Remembers the detected config type of the resource
+        """
+        if self._config_type_cache is None:
+            self._config_type_cache = (
+                iocage.lib.ConfigTypeCache.ConfigTypeCache()
+            )
+        return self._config_type_cache
 
-        if self.config_ucl.exists:
-            return self.CONFIG_TYPES.index("ucl")
+    def _detect_config_type(self) -> int:
 
-        if self.config_zfs.exists:
-            return self.CONFIG_TYPES.index("zfs")
+        if self._prefetched_dataset is not None:
+            mountpoint = self._prefetched_dataset.mountpoint
+        else:
+            try:
+                mountpoint = self.dataset.mountpoint
+            except (AttributeError, libzfs.ZFSException):
+                mountpoint = None
+
+        dataset_name = self.dataset_name
+        cache = self.config_type_cache
+        config_type = cache.get_config_type(dataset_name, mountpoint)
+        if config_type is not None:
+            return self.CONFIG_TYPES.index(config_type)
+
+        for config_type in ["json", "ucl", "zfs"]:
+            if self._get_config_handler(config_type).exists:
+                cache.set_config_type(dataset_name, mountpoint, config_type)
+                return self.CONFIG_TYPES.index(config_type)
 
         return 0
 
@@ -249,6 +354,7 @@ class Resource(metaclass=abc.ABCMeta):
     @config_file.setter
     def config_file(self, value: str) -> None:
         self._config_file = value
+        self._config_handlers = None
 
     def create_resource(self) -> None:
         """
@@ -295,7 +401,7 @@ class Resource(metaclass=abc.ABCMeta):
 
     def get(self, key: str) -> typing.Any:
         try:
-            return self.__getattribute__(key)
+            return getattr(self, key)
         except AttributeError:
             return None
 
@@ -347,19 +453,95 @@ class DefaultResource(Resource):
 
     def save(self) -> None:
         self.write_config(self.config.user_data)
+        iocage.lib.FileWriter.writer.sync()
+
+
+class DefaultsRegistry(dict):
+    """
+    Parsed defaults shared by all hosts of the process
+
+    Entries are keyed by the path of the defaults file and stay valid while
+    the inode, modification time and size of the file are unchanged. The
+    registered user data is shared read-only; a config that modifies its
+    defaults continues with a private copy.
+    """
+
+    def __init__(self) -> None:
+        dict.__init__(self)
+        self._lock = threading.Lock()
+
+    def load(self, resource: DefaultResource) -> None:
+        """
+        Read the config of a DefaultResource, from the registry if possible
+        """
+        if resource.config_type not in ["json", "ucl"]:
+            resource.config.read(data=resource.read_config())
+            return
+
+        file = resource.config_handler.file
+        try:
+            stat = os.stat(file)
+            signature: typing.Optional[typing.Tuple[int, int, int]] = (
+                stat.st_ino,
+                stat.st_mtime_ns,
+                stat.st_size
+            )
+        except OSError:
+            signature = None
+
+        with self._lock:
+            entry = self.get(file, None)
+
+        if (signature is not None) and (entry is not None):
+            if entry[0] == signature:
+                resource.config.share_user_data(entry[1])
+                return
+
+        resource.config.read(data=resource.read_config())
+
+        if signature is not None:
+            user_data = resource.config.data
+            with self._lock:
+                self[file] = (signature, user_data)
+            resource.config.share_user_data(user_data)
+
+
+defaults_registry = DefaultsRegistry()
+
+
+# Name of a listed resource and the values of the requested properties
+ResourceValues = typing.Tuple[str, typing.List[typing.Any]]
+
+# Accessor for a property of the resources of a ListableResource subclass
+ColumnGetter = typing.Callable[[typing.Any], typing.Any]
 
 
 class ListableResource(list, Resource):
 
     _filters: typing.Optional[iocage.lib.Filter.Terms] = None
 
+    # Resources loaded ahead of the consumer per parallel worker
+    PREFETCH_WINDOW_FACTOR = 2
+
     def __init__(
         self,
         dataset: typing.Optional[libzfs.ZFSDataset]=None,
-        filters: typing.Optional[iocage.lib.Filter.Terms]=None,
+        filters: typing.Optional[iocage.lib.Filter.TermsInput]=None,
         logger: typing.Optional[iocage.lib.Logger.Logger]=None,
         zfs: typing.Optional[iocage.lib.ZFS.ZFS]=None,
+        parallel: int=1,
+        ordered: bool=True
     ) -> None:
+        """
+        Args:
+
+            parallel (int): (default=1)
+                Number of threads loading resources concurrently
+
+            ordered (bool): (default=True)
+                Yield resources in dataset order. Parallel loading yields
+                resources as soon as they are loaded when disabled
+        """
 
         list.__init__(self, [])
 
@@ -371,6 +553,8 @@ class ListableResource(list, Resource):
         )
 
         self.filters = filters
+        self.parallel = max(1, int(parallel))
+        self.ordered = ordered
 
     def destroy(self, force: bool=False) -> None:
         raise NotImplementedError("destroy unimplemented for ListableResource")
@@ -379,22 +563,431 @@ class ListableResource(list, Resource):
         self
     ) -> typing.Generator[Resource, None, None]:
 
-        for child_dataset in self.dataset.children:
+        filter_plan = self._plan_filters()
+
+        resources: typing.Iterable[typing.Optional[Resource]]
+        if self.parallel > 1:
+            resources = self._load_children_parallel(
+                self._load_child,
+                filter_plan
+            )
+        else:
+            resources = map(
+                lambda child_dataset: self._load_child(
+                    child_dataset,
+                    filter_plan
+                ),
+                self.dataset.children
+            )
+
+        for resource in resources:
+            if resource is not None:
+                yield resource
+
+    def _load_child(
+        self,
+        child_dataset: libzfs.ZFSDataset,
+        filter_plan: typing.List[typing.Tuple[str, iocage.lib.Filter.Terms]]
+    ) -> typing.Optional[Resource]:
+        """
+        Load the resource of a child dataset
+
+        Returns None when the resource does not match the filters.
+        """
+        name = self._get_asset_name_from_dataset(child_dataset)
+        source_data: typing.Dict[str, typing.Any] = {}
+        remaining_terms = self._prefilter_dataset(
+            child_dataset,
+            name,
+            filter_plan,
+            source_data
+        )
+
+        if remaining_terms is None:
+            # Skip resources that do not match the cheap filter terms
+            return None
+
+        return self._load_prefiltered_child(
+            child_dataset,
+            remaining_terms,
+            source_data
+        )
+
+    def _load_prefiltered_child(
+        self,
+        child_dataset: libzfs.ZFSDataset,
+        remaining_terms: iocage.lib.Filter.Terms,
+        source_data: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[Resource]:
+
+        resource = self._get_resource_from_dataset(
+            child_dataset,
+            prefetched_dataset=self._get_prefetched_dataset(
+                child_dataset,
+                source_data
+            )
+        )
+        if remaining_terms.match_resource(resource):
+            return resource
+
+        return None
+
+    def _load_children_parallel(
+        self,
+        load: typing.Callable[..., typing.Any],
+        *args
+    ) -> typing.Generator[typing.Any, None, None]:
+        """
+        Load child resources in a thread pool
+
+        Only a small window of resources is loaded ahead of the consumer,
+        so that memory usage does not grow with the number of children.
 
-            name = self._get_asset_name_from_dataset(child_dataset)
-            if self._filters is not None and \
-               self._filters.match_key("name", name) is not True:
-                # Skip all jails that do not even match the name
+        Args:
+
+            load:
+                Called with each child dataset and the additional args
+        """
+        window = self.parallel * self.PREFETCH_WINDOW_FACTOR
+        pending: typing.List[concurrent.futures.Future] = []
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.parallel
+        )
+        try:
+            for child_dataset in self.dataset.children:
+                pending.append(executor.submit(
+                    load,
+                    child_dataset,
+                    *args
+                ))
+                while len(pending) >= window:
+                    yield from self._pop_loaded(pending)
+
+            while len(pending) > 0:
+                yield from self._pop_loaded(pending)
+        finally:
+            # the consumer may stop before all resources were loaded
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _pop_loaded(
+        self,
+        pending: typing.List[concurrent.futures.Future]
+    ) -> typing.List[typing.Any]:
+        """
+        Wait for the next loaded resources and remove them from pending
+        """
+        if self.ordered is True:
+            done = [pending.pop(0)]
+        else:
+            completed, _ = concurrent.futures.wait(
+                pending,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            done = [future for future in pending if future in completed]
+            for future in done:
+                pending.remove(future)
+
+        return [future.result() for future in done]
+
+    def _plan_filters(
+        self
+    ) -> typing.List[typing.Tuple[str, iocage.lib.Filter.Terms]]:
+
+        if self._filters is None:
+            return []
+
+        return self._filters.plan(self._get_filter_source)
+
+    def _prefilter_dataset(
+        self,
+        dataset: libzfs.ZFSDataset,
+        name: str,
+        filter_plan: typing.List[typing.Tuple[str, iocage.lib.Filter.Terms]],
+        source_data: typing.Dict[str, typing.Any]
+    ) -> typing.Optional[iocage.lib.Filter.Terms]:
+        """
+        Evaluate filter terms on lightweight data of a child dataset
+
+        Returns None when the dataset does not match the filters. Otherwise
+        the terms that could not be decided without loading the full resource
+        are returned.
+        """
+        remaining_terms = iocage.lib.Filter.Terms()
+
+        for source, terms in filter_plan:
+
+            if source == "resource":
+                remaining_terms += terms
                 continue
 
-            # ToDo: Do not load jail if filters do not require to
-            resource = self._get_resource_from_dataset(child_dataset)
-            if self._filters is not None:
-                if self._filters.match_resource(resource):
-                    yield resource
+            for term in terms:
+                try:
+                    value = self._get_filter_value(
+                        source,
+                        term.key,
+                        dataset=dataset,
+                        name=name,
+                        source_data=source_data
+                    )
+                except KeyError:
+                    remaining_terms.append(term)
+                    continue
+
+                if term.matches(value, term.short) is False:
+                    return None
+
+        return remaining_terms
+
+    def _get_filter_source(self, term: iocage.lib.Filter.Term) -> str:
+        """
+        Name of the cheapest data source a filter term can be evaluated on
+        """
+        return self._get_key_source(term.key)
+
+    def _get_key_source(self, key: str) -> str:
+        """
+        Name of the cheapest data source a property can be read from
+        """
+        if key == "name":
+            return "name"
+        return "resource"
+
+    def _get_prefetched_dataset(
+        self,
+        dataset: libzfs.ZFSDataset,
+        source_data: typing.Dict[str, typing.Any]
+    ) -> iocage.lib.ZFS.PrefetchedDataset:
+        """
+        Properties of a child dataset shared during one iteration
+
+        The ZFS property list is only read once, when the resource needs
+        its user properties, for example to read a ZFS config.
+        """
+        if "dataset" not in source_data:
+            source_data["dataset"] = iocage.lib.ZFS.LazyPrefetchedDataset(
+                dataset,
+                zfs=self.zfs,
+                property_prefix=iocage.lib.Config.Type.ZFS.ZFS_PROPERTY_PREFIX
+            )
+        prefetched_dataset: iocage.lib.ZFS.PrefetchedDataset
+        prefetched_dataset = source_data["dataset"]
+        return prefetched_dataset
+
+    def _get_filter_value(
+        self,
+        source: str,
+        key: str,
+        dataset: libzfs.ZFSDataset,
+        name: str,
+        source_data: typing.Dict[str, typing.Any]
+    ) -> typing.Any:
+        """
+        Lookup a filter value from lightweight data of a child dataset
+
+        Raises a KeyError when the value cannot be determined without
+        loading the full resource.
+
+        Args:
+
+            source:
+                The data source to read the value from
+
+            key:
+                The property name of the filter term
+
+            dataset:
+                The child dataset of the resource
+
+            name:
+                The name of the child resource
+
+            source_data:
+                Data already loaded for the dataset, shared between terms
+        """
+        if source == "name":
+            return name
+
+        raise KeyError(f"Cannot lookup {key} from {source}")
+
+    def get_column_getter(
+        self,
+        key: str
+    ) -> ColumnGetter:
+        """
+        Accessor for a property of the listed resources
+
+        Listings that read the same properties of many resources resolve
+        each property once instead of for every resource.
+        """
+        return lambda resource: resource.get(key)
+
+    def get_values(
+        self,
+        keys: typing.List[str]
+    ) -> typing.Generator[ResourceValues, None, None]:
+        """
+        Property values of the resources matching the filters
+
+        Yields the name of each matching resource with the values of the
+        given keys. Values are read from the child dataset names, states or
+        raw configuration data when possible. Resources are only loaded for
+        properties or filter terms that require them.
+        """
+        filter_plan = self._plan_filters()
+        getters = list(map(
+            lambda key: (
+                key,
+                self._get_key_source(key),
+                self.get_column_getter(key)
+            ),
+            keys
+        ))
+
+        results: typing.Iterable[typing.Optional[ResourceValues]]
+        if self.parallel > 1:
+            results = self._load_children_parallel(
+                self._get_child_values,
+                filter_plan,
+                getters
+            )
+        else:
+            results = map(
+                lambda child_dataset: self._get_child_values(
+                    child_dataset,
+                    filter_plan,
+                    getters
+                ),
+                self.dataset.children
+            )
+
+        for result in results:
+            if result is not None:
+                yield result
+
+    def _get_child_values(
+        self,
+        child_dataset: libzfs.ZFSDataset,
+        filter_plan: typing.List[typing.Tuple[str, iocage.lib.Filter.Terms]],
+        getters: typing.List[typing.Tuple[
+            str,
+            str,
+            typing.Callable[[Resource], typing.Any]
+        ]]
+    ) -> typing.Optional[ResourceValues]:
+
+        name = self._get_asset_name_from_dataset(child_dataset)
+        source_data: typing.Dict[str, typing.Any] = {}
+        remaining_terms = self._prefilter_dataset(
+            child_dataset,
+            name,
+            filter_plan,
+            source_data
+        )
+
+        if remaining_terms is None:
+            return None
+
+        resource: typing.Optional[Resource] = None
+        if len(remaining_terms) > 0:
+            resource = self._load_prefiltered_child(
+                child_dataset,
+                remaining_terms,
+                source_data
+            )
+            if resource is None:
+                return None
+
+        values: typing.List[typing.Any] = []
+        for key, source, getter in getters:
+
+            if (resource is None) and (source != "resource"):
+                try:
+                    values.append(self._get_filter_value(
+                        source,
+                        key,
+                        dataset=child_dataset,
+                        name=name,
+                        source_data=source_data
+                    ))
+                    continue
+                except KeyError:
+                    pass
+
+            if resource is None:
+                resource = self._get_resource_from_dataset(
+                    child_dataset,
+                    prefetched_dataset=self._get_prefetched_dataset(
+                        child_dataset,
+                        source_data
+                    )
+                )
+            values.append(getter(resource))
+
+        return (name, values)
+
+    def count_matches(self) -> int:
+        """
+        Number of resources matching the filters
+
+        Resources are only loaded when the filters cannot be decided on
+        the child dataset names, states or raw configuration data.
+        """
+        return sum(self._match_children())
+
+    def any_match(self) -> bool:
+        """
+        True when at least one resource matches the filters
+        """
+        return any(self._match_children())
 
     def __len__(self) -> int:
-        return len(list(self.__iter__()))
+        """
+        Number of resources matching the filters
+
+        list(), sorted() and tuple() request the length before iterating,
+        so that they scan the resources twice. Consume iter() explicitly
+        when the resources are loaded into a list anyway.
+        """
+        return self.count_matches()
+
+    def __bool__(self) -> bool:
+        return self.any_match()
+
+    def _match_children(self) -> typing.Generator[bool, None, None]:
+        filter_plan = self._plan_filters()
+        for child_dataset in self.dataset.children:
+            yield self._match_child(child_dataset, filter_plan)
+
+    def _match_child(
+        self,
+        child_dataset: libzfs.ZFSDataset,
+        filter_plan: typing.List[typing.Tuple[str, iocage.lib.Filter.Terms]]
+    ) -> bool:
+
+        name = self._get_asset_name_from_dataset(child_dataset)
+        source_data: typing.Dict[str, typing.Any] = {}
+        remaining_terms = self._prefilter_dataset(
+            child_dataset,
+            name,
+            filter_plan,
+            source_data
+        )
+
+        if remaining_terms is None:
+            return False
+
+        if len(remaining_terms) == 0:
+            return True
+
+        resource = self._load_prefiltered_child(
+            child_dataset,
+            remaining_terms,
+            source_data
+        )
+        return resource is not None
 
     def _get_asset_name_from_dataset(
         self,
@@ -411,10 +1004,11 @@ class ListableResource(list, Resource):
 
     def _get_resource_from_dataset(
         self,
-        dataset: libzfs.ZFSDataset
+        dataset: libzfs.ZFSDataset,
+        **kwargs
     ) -> Resource:
 
-        return self._create_resource_instance(dataset)
+        return self._create_resource_instance(dataset, **kwargs)
 
     @property
     def filters(self) -> typing.Optional[iocage.lib.Filter.Terms]:
@@ -423,8 +1017,8 @@ class ListableResource(list, Resource):
     @filters.setter
     def filters(
         self,
-        value: typing.Iterable[typing.Union[iocage.lib.Filter.Term, str]]
-    ):
+        value: typing.Optional[iocage.lib.Filter.TermsInput]
+    ) -> None:
 
         if isinstance(value, iocage.lib.Filter.Terms):
             self._filters = value
@@ -92,7 +92,7 @@ class Storage:
                 self.jail.host.datasets.jails.name,
                 new_name
             ])
-            self.jail.dataset.rename(new_dataset_name)
+            self.zfs.rename_dataset(self.jail.dataset, new_dataset_name)
             self.jail.dataset_name = new_dataset_name
             self.logger.verbose(
                 f"Dataset {current_dataset_name} renamed to {new_dataset_name}"
@@ -147,7 +147,7 @@ class Storage:
             )
             if existing_dataset.mountpoint is not None:
                 existing_dataset.umount()
-            existing_dataset.delete()
+            self.zfs.delete_dataset(existing_dataset)
             del existing_dataset
 
         # delete existing snapshot if existing
@@ -161,7 +161,7 @@ class Storage:
                 f"Deleting existing snapshot {snapshot_name}",
                 jail=self.jail
             )
-            existing_snapshot.delete()
+            self.zfs.delete_snapshot(existing_snapshot)
 
         # snapshot release
         self.zfs.get_dataset(source).snapshot(snapshot_name)
@@ -173,7 +173,7 @@ class Storage:
                 f"Cloning snapshot {snapshot_name} to {target}",
                 jail=self.jail
             )
-            snapshot.clone(target)
+            self.zfs.clone_snapshot(snapshot, target)
         except libzfs.ZFSException:
             parent = "/".join(target.split("/")[:-1])
             self.logger.debug(
@@ -182,7 +182,7 @@ class Storage:
                 jail=self.jail
             )
             self.zfs.create_dataset(parent)
-            snapshot.clone(target)
+            self.zfs.clone_snapshot(snapshot, target)
 
         target_dataset = self.zfs.get_dataset(target)
         target_dataset.mount()
@@ -192,7 +192,7 @@ class Storage:
         )
 
     def create_jail_mountpoint(self, basedir: str) -> None:
-        basedir = f"{self.jail.root_dataset.mountpoint}/{basedir}"
+        basedir = f"{self.jail.root_path}/{basedir}"
         if not os.path.isdir(basedir):
             self.logger.verbose(f"Creating mountpoint {basedir}")
             os.makedirs(basedir)
@@ -205,7 +205,7 @@ class Storage:
                     "-t",
                     "procfs"
                     "proc"
-                    f"{self.jail.root_dataset.mountpoint}/proc"
+                    f"{self.jail.root_path}/proc"
                 ])
         except KeyError:
             raise iocage.lib.errors.MountFailed(
@@ -245,7 +245,7 @@ class Storage:
 
         uid = pwd.getpwnam(user).pw_uid
         gid = grp.getgrnam(group).gr_gid
-        folder = f"{self.jail.root_dataset.mountpoint}{directory}"
+        folder = f"{self.jail.root_path}{directory}"
         if not os.path.isdir(folder):
             os.makedirs(folder, permissions)
             os.chown(folder, uid, gid, follow_symlinks=False)
@@ -22,6 +22,8 @@
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 import typing
+import collections
+import threading
 import libzfs
 
 import iocage.lib.Logger
@@ -29,10 +31,120 @@ import iocage.lib.helpers
 import iocage.lib.errors
 
 
+class PrefetchedDataset:
+    """
+    Properties of a dataset read in a single pass
+
+    The values are a snapshot taken at the time of the fetch and are not
+    updated when the dataset changes.
+    """
+
+    def __init__(
+        self,
+        dataset: libzfs.ZFSDataset,
+        mountpoint: typing.Optional[str]=None,
+        origin: typing.Optional[str]=None,
+        user_properties: typing.Optional[typing.Dict[str, str]]=None
+    ) -> None:
+
+        self.dataset = dataset
+        self.name = str(dataset.name)
+        self._mountpoint = mountpoint
+        self._origin = origin
+        self._user_properties = user_properties or {}
+
+    @property
+    def mountpoint(self) -> typing.Optional[str]:
+        return self._mountpoint
+
+    @property
+    def origin(self) -> typing.Optional[str]:
+        return self._origin
+
+    @property
+    def user_properties(self) -> typing.Dict[str, str]:
+        return self._user_properties
+
+
+class LazyPrefetchedDataset(PrefetchedDataset):
+    """
+    Properties of a dataset that are read on first use
+
+    The mountpoint is taken from the dataset handle, which does not read
+    the property list. The origin and user properties are fetched in a
+    single pass when one of them is accessed first. Listing resources
+    with config files therefore never reads their ZFS properties.
+    """
+
+    _fetched: typing.Optional[PrefetchedDataset] = None
+    _mountpoint_read: bool = False
+
+    def __init__(
+        self,
+        dataset: libzfs.ZFSDataset,
+        zfs: 'ZFS',
+        property_prefix: str=""
+    ) -> None:
+
+        PrefetchedDataset.__init__(self, dataset)
+        self._zfs = zfs
+        self._property_prefix = property_prefix
+
+    @property
+    def mountpoint(self) -> typing.Optional[str]:
+        if self._fetched is not None:
+            return self._fetched.mountpoint
+        if self._mountpoint_read is False:
+            try:
+                self._mountpoint = self.dataset.mountpoint
+            except (AttributeError, libzfs.ZFSException):
+                self._mountpoint = None
+            self._mountpoint_read = True
+        return self._mountpoint
+
+    @property
+    def origin(self) -> typing.Optional[str]:
+        return self._fetch().origin
+
+    @property
+    def user_properties(self) -> typing.Dict[str, str]:
+        return self._fetch().user_properties
+
+    def _fetch(self) -> PrefetchedDataset:
+        if self._fetched is None:
+            self._fetched = self._zfs.fetch_dataset(
+                self.dataset,
+                property_prefix=self._property_prefix
+            )
+        return self._fetched
+
+
 class ZFS(libzfs.ZFS):
+    """
+    libzfs with iocage helpers and a cache of pool and dataset handles
+
+    Pools are looked up by name from a map that is built once. The most
+    recently used dataset handles are kept by name. Datasets created,
+    cloned, renamed or destroyed through this class are removed from the
+    cache.
+    """
 
     logger: typing.Optional[iocage.lib.Logger.Logger] = None
 
+    # Number of dataset handles kept in the cache
+    DATASET_CACHE_SIZE = 256
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pools_by_name: typing.Optional[
+            typing.Dict[str, libzfs.ZFSPool]
+        ] = None
+        self._dataset_cache: 'collections.OrderedDict[str, libzfs.ZFSDataset]'
+        self._dataset_cache = collections.OrderedDict()
+        self._dataset_cache_lock = threading.Lock()
+        self.dataset_cache_hits = 0
+        self.dataset_cache_misses = 0
+
     def create_dataset(
         self,
         dataset_name: str,
@@ -41,11 +153,90 @@ class ZFS(libzfs.ZFS):
 
         pool = self.get_pool(dataset_name)
         pool.create(dataset_name, kwargs, create_ancestors=True)
+        self.forget_dataset(dataset_name)
 
         dataset = self.get_dataset(dataset_name)
         dataset.mount()
         return dataset
 
+    def get_dataset(self, name: str) -> libzfs.ZFSDataset:
+        """
+        Return the dataset handle, from the cache if possible
+        """
+        with self._dataset_cache_lock:
+            try:
+                dataset: libzfs.ZFSDataset = self._dataset_cache[name]
+                self._dataset_cache.move_to_end(name)
+                self.dataset_cache_hits += 1
+                return dataset
+            except KeyError:
+                self.dataset_cache_misses += 1
+
+        # raises a ZFSException when the dataset does not exist
+        dataset = super().get_dataset(name)
+
+        with self._dataset_cache_lock:
+            self._dataset_cache[name] = dataset
+            while len(self._dataset_cache) > self.DATASET_CACHE_SIZE:
+                self._dataset_cache.popitem(last=False)
+
+        if self.logger is not None:
+            self.logger.spam(
+                f"Dataset {name} not cached ({self.dataset_cache_hits} hits, "
+                f"{self.dataset_cache_misses} misses)"
+            )
+        return dataset
+
+    def forget_dataset(self, name: str) -> None:
+        """
+        Remove a dataset and its children from the handle cache
+        """
+        prefix = f"{name}/"
+        with self._dataset_cache_lock:
+            for cached_name in list(self._dataset_cache.keys()):
+                if (cached_name == name) or cached_name.startswith(prefix):
+                    del self._dataset_cache[cached_name]
+
+    def rename_dataset(
+        self,
+        dataset: libzfs.ZFSDataset,
+        new_name: str
+    ) -> None:
+        """
+        Rename a dataset and drop the cached handles of the old names
+        """
+        current_name = str(dataset.name)
+        dataset.rename(new_name)
+        self.forget_dataset(current_name)
+        self.forget_dataset(new_name)
+
+    def delete_dataset(self, dataset: libzfs.ZFSDataset) -> None:
+        """
+        Delete a dataset and drop its cached handle
+        """
+        name = str(dataset.name)
+        dataset.delete()
+        self.forget_dataset(name)
+
+    def clone_snapshot(
+        self,
+        snapshot: libzfs.ZFSSnapshot,
+        target: str
+    ) -> None:
+        """
+        Clone a snapshot and drop the cached handles of the target name
+        """
+        snapshot.clone(target)
+        self.forget_dataset(target)
+
+    def delete_snapshot(self, snapshot: libzfs.ZFSSnapshot) -> None:
+        """
+        Delete a snapshot and drop its cached handle
+        """
+        name = str(snapshot.name)
+        snapshot.delete()
+        self.forget_dataset(name)
+
     def get_or_create_dataset(
         self,
         dataset_name: str,
@@ -59,16 +250,177 @@ class ZFS(libzfs.ZFS):
 
         return self.create_dataset(dataset_name, **kwargs)
 
+    @property
+    def pools_by_name(self) -> typing.Dict[str, libzfs.ZFSPool]:
+        """
+        Map of the imported pools by their name
+
+        The map is built on first use and when an unknown pool is requested.
+        """
+        if self._pools_by_name is None:
+            self._pools_by_name = dict(map(
+                lambda pool: (str(pool.name), pool),
+                self.pools
+            ))
+        return self._pools_by_name
+
     def get_pool(self, name: str) -> libzfs.ZFSPool:
         pool_name = name.split("/")[0]
-        for pool in self.pools:
-            if pool.name == pool_name:
-                return pool
-        raise iocage.lib.errors.ZFSPoolUnavailable(
-            pool_name=pool_name,
-            logger=self.logger
+        try:
+            return self.pools_by_name[pool_name]
+        except KeyError:
+            pass
+
+        # the pool might have been imported in the meantime
+        self._pools_by_name = None
+        try:
+            return self.pools_by_name[pool_name]
+        except KeyError:
+            raise iocage.lib.errors.ZFSPoolUnavailable(
+                pool_name=pool_name,
+                logger=self.logger
+            )
+
+    def fetch_dataset(
+        self,
+        dataset: libzfs.ZFSDataset,
+        property_prefix: str=""
+    ) -> PrefetchedDataset:
+        """
+        Read the mountpoint, origin and user properties of a dataset
+
+        The property list of the dataset is read only once.
+
+        Args:
+
+            dataset (libzfs.ZFSDataset):
+                The dataset to fetch
+
+            property_prefix (str): (default="")
+                Only user properties starting with this prefix are returned
+        """
+        properties = dataset.properties
+
+        mountpoint: typing.Optional[str] = None
+        if self._get_property_value(properties, "mounted") == "yes":
+            mountpoint = self._get_property_value(properties, "mountpoint")
+            if (mountpoint is None) or not mountpoint.startswith("/"):
+                # legacy mountpoints are resolved by libzfs
+                mountpoint = dataset.mountpoint
+
+        origin = self._get_property_value(properties, "origin")
+        if origin in ["", "-"]:
+            origin = None
+
+        user_properties: typing.Dict[str, str] = {}
+        for name, prop in properties.items():
+            if (":" in name) and name.startswith(property_prefix):
+                user_properties[name] = prop.value
+
+        return PrefetchedDataset(
+            dataset=dataset,
+            mountpoint=mountpoint,
+            origin=origin,
+            user_properties=user_properties
         )
 
+    def fetch_children(
+        self,
+        dataset: libzfs.ZFSDataset,
+        property_prefix: str=""
+    ) -> typing.List[PrefetchedDataset]:
+        """
+        Fetch all direct children of a dataset in one pass
+
+        See fetch_dataset for the properties that are read.
+        """
+        return [
+            self.fetch_dataset(child, property_prefix)
+            for child in dataset.children
+        ]
+
+    def update_user_properties(
+        self,
+        dataset: libzfs.ZFSDataset,
+        properties: typing.Dict[str, str],
+        property_prefix: str,
+        current_properties: typing.Optional[typing.Dict[str, str]]=None
+    ) -> typing.Tuple[typing.Dict[str, str], typing.List[str]]:
+        """
+        Make the user properties of a dataset match the desired values
+
+        Only properties that differ from the current values are set. User
+        properties with the prefix that are not desired anymore are
+        inherited, which removes them from the dataset. When libzfs
+        supports it, all changes are applied in a single operation.
+
+        Args:
+
+            dataset (libzfs.ZFSDataset):
+                The dataset to update
+
+            properties (dict):
+                Desired user property values by their full name
+
+            property_prefix (str):
+                Prefix of the user properties managed by the caller
+
+            current_properties (dict): (optional)
+                Known current values that save reading the property list
+
+        Returns the changed properties and the names of removed properties.
+        """
+        if current_properties is None:
+            current_properties = self.fetch_dataset(
+                dataset,
+                property_prefix
+            ).user_properties
+
+        changed_properties = dict(filter(
+            lambda item: current_properties.get(item[0], None) != item[1],
+            properties.items()
+        ))
+        removed_properties = [
+            name for name in current_properties.keys()
+            if name.startswith(property_prefix) and (name not in properties)
+        ]
+
+        if (len(changed_properties) + len(removed_properties)) == 0:
+            return changed_properties, removed_properties
+
+        if self.logger is not None:
+            self.logger.spam(
+                f"Updating {len(changed_properties)} and removing "
+                f"{len(removed_properties)} properties of {dataset.name}"
+            )
+
+        update_properties = getattr(dataset, "update_properties", None)
+        if update_properties is not None:
+            updates: typing.Dict[str, typing.Dict[str, str]] = {}
+            for name, value in changed_properties.items():
+                updates[name] = {"value": value}
+            for name in removed_properties:
+                updates[name] = {"source": "INHERIT"}
+            update_properties(updates)
+        else:
+            dataset_properties = dataset.properties
+            for name, value in changed_properties.items():
+                dataset_properties[name] = libzfs.ZFSUserProperty(value)
+            for name in removed_properties:
+                dataset_properties[name].inherit()
+
+        return changed_properties, removed_properties
+
+    def _get_property_value(
+        self,
+        properties: typing.Dict[str, libzfs.ZFSProperty],
+        name: str
+    ) -> typing.Optional[str]:
+        try:
+            return str(properties[name].value)
+        except KeyError:
+            return None
+
     def delete_dataset_recursive(
         self,
         dataset: libzfs.ZFSDataset,
@@ -90,7 +442,7 @@ class ZFS(libzfs.ZFS):
                     self.logger.verbose(
                         f"Deleting snapshot {snapshot.name}"
                     )
-                snapshot.delete()
+                self.delete_snapshot(snapshot)
 
         origin = None
         if delete_origin_snapshot is True:
@@ -100,13 +452,13 @@ class ZFS(libzfs.ZFS):
 
         if self.logger is not None:
             self.logger.verbose(f"Deleting dataset {dataset.name}")
-        dataset.delete()
+        self.delete_dataset(dataset)
 
         if origin is not None:
             if self.logger is not None:
                 self.logger.verbose(f"Deleting snapshot {origin}")
             origin_snapshot = self.get_snapshot(origin.value)
-            origin_snapshot.delete()
+            self.delete_snapshot(origin_snapshot)
 
 
 def get_zfs(
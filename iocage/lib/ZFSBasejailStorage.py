@@ -26,6 +26,9 @@ import libzfs
 
 
 class ZFSBasejailStorage:
+
+    zfs: 'iocage.lib.ZFS.ZFS'
+
     def prepare(self):
         self._delete_clone_target_datasets()
 
@@ -84,14 +87,14 @@ class ZFSBasejailStorage:
                 # Delete existing snapshots
                 for snapshot in child.snapshots:
                     try:
-                        snapshot.delete()
+                        self.zfs.delete_snapshot(snapshot)
                         self.logger.verbose(
                             f"Snapshot {current_mountpoint} deleted"
                         )
                     except libzfs.ZFSException:
                         pass
 
-                child.delete()
+                self.zfs.delete_dataset(child)
 
             else:
                 self._delete_clone_target_datasets(list(child.children))
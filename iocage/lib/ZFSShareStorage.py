@@ -66,6 +66,7 @@ class ZFSShareStorage:
             try:
                 if auto_create is True:
                     zpool.create(name, {}, create_ancestors=True)
+                    self.zfs.forget_dataset(name)
             except libzfs.ZFSException:
                 pass
 
@@ -126,16 +127,15 @@ class ZFSShareStorage:
 
         target_pool_name = self._get_pool_name_from_dataset_name(dataset_name)
 
-        zpools: typing.List[libzfs.ZFSPool] = list(self.zfs.pools)
-        for zpool in zpools:
-            if zpool.name == target_pool_name:
-                return zpool
-
-        # silent exception, no logger defined
-        raise iocage.lib.errors.ZFSPoolUnavailable(
-            pool_name=target_pool_name,
-            logger=self.logger
-        )
+        try:
+            zpool: libzfs.ZFSPool = self.zfs.pools_by_name[target_pool_name]
+            return zpool
+        except KeyError:
+            # silent exception, no logger defined
+            raise iocage.lib.errors.ZFSPoolUnavailable(
+                pool_name=target_pool_name,
+                logger=self.logger
+            )
 
     def _require_datasets_exist_and_jailed(self) -> None:
 
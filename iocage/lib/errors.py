@@ -161,6 +161,38 @@ class JailStateUpdateFailed(IocageException):
         IocageException.__init__(self, msg, *args, **kwargs)
 
 
+class JailDependencyCycle(IocageException):
+
+    def __init__(
+        self,
+        cycle: typing.List[str],
+        *args,
+        **kwargs
+    ) -> None:
+
+        cycle_text = " -> ".join(cycle)
+        msg = f"The jail dependencies form a cycle: {cycle_text}"
+        IocageException.__init__(self, msg, *args, **kwargs)
+
+
+class JailDependencyFailed(IocageException):
+
+    def __init__(
+        self,
+        jail: 'iocage.lib.Jail.JailGenerator',
+        blocker: 'iocage.lib.Jail.JailGenerator',
+        action: str,
+        *args,
+        **kwargs
+    ) -> None:
+
+        msg = (
+            f"Jail '{jail.humanreadable_name}' was not {action} "
+            f"because '{blocker.humanreadable_name}' failed"
+        )
+        IocageException.__init__(self, msg, *args, **kwargs)
+
+
 # Security
 
 
@@ -233,6 +265,21 @@ class InvalidJailConfigAddress(InvalidJailConfigValue):
         )
 
 
+class JailConfigMigrationFailed(JailConfigError):
+
+    def __init__(
+        self,
+        jail: 'iocage.lib.Jail.JailGenerator',
+        reason: typing.Optional[str]=None,
+        **kwargs
+    ) -> None:
+
+        msg = f"Config migration of jail {jail.humanreadable_name} failed"
+        if reason is not None:
+            msg += f": {reason}"
+        super().__init__(msg, **kwargs)
+
+
 class JailConfigNotFound(IocageException):
 
     def __init__(self, config_type: str, *args, **kwargs) -> None:
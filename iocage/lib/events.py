@@ -22,6 +22,7 @@
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 import typing
+import threading
 from timeit import default_timer as timer
 
 import iocage.lib.errors
@@ -46,8 +47,10 @@ class IocageEvent:
     """
 
     HISTORY: typing.List['IocageEvent'] = []
+    HISTORY_LOCK = threading.Lock()
 
-    PENDING_COUNT: int = 0
+    # jails started concurrently nest their pending events per thread
+    _pending_counts = threading.local()
 
     identifier: typing.Optional[str]
     _started_at: float
@@ -69,18 +72,30 @@ class IocageEvent:
         Initializes an IocageEvent
         """
 
-        for event in IocageEvent.HISTORY:
-            if event.__hash__() == self.__hash__():
-                return event  # type: ignore
+        # rollback steps and child events are tracked per event
+        self._rollback_steps = []
+        self._child_events = []
 
-        self.data = kwargs
-        self.number = len(IocageEvent.HISTORY) + 1
-        self.parent_count = IocageEvent.PENDING_COUNT
+        with IocageEvent.HISTORY_LOCK:
+            for event in IocageEvent.HISTORY:
+                if event.__hash__() == self.__hash__():
+                    return event  # type: ignore
 
-        self.message = message
+            self.data = kwargs
+            self.number = len(IocageEvent.HISTORY) + 1
+            self.parent_count = IocageEvent.get_pending_count()
 
-        if self not in IocageEvent.HISTORY:
-            IocageEvent.HISTORY.append(self)
+            self.message = message
+
+            if self not in IocageEvent.HISTORY:
+                IocageEvent.HISTORY.append(self)
+
+    @staticmethod
+    def get_pending_count() -> int:
+        """
+        Number of events pending in the current thread
+        """
+        return int(getattr(IocageEvent._pending_counts, "value", 0))
 
     def get_state_string(
         self,
@@ -154,7 +169,9 @@ class IocageEvent:
             self._stopped_at = float(timer())
 
         self._pending = new_state
-        IocageEvent.PENDING_COUNT += 1 if (state is True) else -1
+        pending_count = IocageEvent.get_pending_count()
+        pending_count += 1 if (state is True) else -1
+        IocageEvent._pending_counts.value = pending_count
 
     @property
     def duration(self) -> typing.Optional[float]:
@@ -171,7 +188,7 @@ class IocageEvent:
         self._update_message(**kwargs)
         self.pending = True
         self.done = False
-        self.parent_count = IocageEvent.PENDING_COUNT - 1
+        self.parent_count = IocageEvent.get_pending_count() - 1
         return self
 
     def end(self, **kwargs) -> 'IocageEvent':
@@ -179,26 +196,26 @@ class IocageEvent:
         self.done = True
         self.pending = False
         self.done = True
-        self.parent_count = IocageEvent.PENDING_COUNT
+        self.parent_count = IocageEvent.get_pending_count()
         return self
 
     def step(self, **kwargs) -> 'IocageEvent':
         self._update_message(**kwargs)
-        self.parent_count = IocageEvent.PENDING_COUNT
+        self.parent_count = IocageEvent.get_pending_count()
         return self
 
     def skip(self, **kwargs) -> 'IocageEvent':
         self._update_message(**kwargs)
         self.skipped = True
         self.pending = False
-        self.parent_count = IocageEvent.PENDING_COUNT
+        self.parent_count = IocageEvent.get_pending_count()
         return self
 
     def fail(self, exception=True, **kwargs) -> 'IocageEvent':
         self._update_message(**kwargs)
         self.error = exception
         self.pending = False
-        self.parent_count = IocageEvent.PENDING_COUNT
+        self.parent_count = IocageEvent.get_pending_count()
         self.rollback()
         return self
 
@@ -318,6 +335,21 @@ class JailMountTeardown(JailEvent):
 
         JailEvent.__init__(self, jail, **kwargs)
 
+
+class JailConfigMigration(JailEvent):
+
+    def __init__(
+        self,
+        jail: 'iocage.lib.Jail.JailGenerator',
+        current_config_type: str,
+        config_type: str,
+        **kwargs
+    ) -> None:
+
+        kwargs["current_config_type"] = current_config_type
+        kwargs["config_type"] = config_type
+        JailEvent.__init__(self, jail, **kwargs)
+
 # Release
 
 
@@ -21,6 +21,19 @@
 # STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
 # IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
+import json
+import time
+import types
+
+import click
+import click.testing
+
+import iocage.lib.Config.Jail.Defaults
+import iocage.lib.ConfigTypeCache
+import iocage.lib.Jails
+import iocage.lib.JailState
+import iocage.lib.Logger
+import iocage.lib.ZFS
 
 
 def _delete_dataset_recursive(dataset):
@@ -32,3 +45,142 @@ def _delete_dataset_recursive(dataset):
 def unmount_and_destroy_dataset_recursive(dataset):
     dataset.umount_recursive()
     _delete_dataset_recursive(dataset)
+
+
+class FakeProperty(object):
+    """
+    In-memory stand-in for a libzfs.ZFSProperty
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeDataset(object):
+    """
+    In-memory stand-in for a libzfs.ZFSDataset
+
+    Like libzfs the property list is built anew on each access of
+    `properties`. The accesses are counted in `property_reads`, batched
+    property updates in `property_updates`.
+    """
+
+    def __init__(self, name, mountpoint=None, properties={}, children=[]):
+        self.name = name
+        self._mountpoint = mountpoint
+        self._properties = dict(properties)
+        self.children = list(children)
+        self.property_reads = 0
+        self.property_updates = 0
+
+    @property
+    def mountpoint(self):
+        return self._mountpoint
+
+    @property
+    def properties(self):
+        self.property_reads += 1
+        properties = {
+            "mounted": FakeProperty(
+                "no" if self._mountpoint is None else "yes"
+            ),
+            "mountpoint": FakeProperty(self._mountpoint or "none"),
+            "origin": FakeProperty("")
+        }
+        for name, value in self._properties.items():
+            properties[name] = FakeProperty(value)
+        return properties
+
+    def update_properties(self, updates):
+        self.property_updates += 1
+        for name, update in updates.items():
+            if update.get("source", None) == "INHERIT":
+                del self._properties[name]
+            else:
+                self._properties[name] = update["value"]
+
+
+def create_fake_dataset_tree(parent_name, count, properties={}):
+    """
+    Create a fake dataset with `count` children that share properties
+    """
+    children = [
+        FakeDataset(
+            name=f"{parent_name}/{i}",
+            mountpoint=f"/{parent_name}/{i}",
+            properties=properties
+        )
+        for i in range(count)
+    ]
+    return FakeDataset(
+        name=parent_name,
+        mountpoint=f"/{parent_name}",
+        children=children
+    )
+
+
+def create_jails(tmpdir, configs, states={}, config_index=None, **kwargs):
+    """
+    Create a JailsGenerator on jail datasets with JSON configs in tmpdir
+
+    The jail states are a fresh snapshot, so that jls is not run.
+    """
+    children = []
+    for name, config in configs.items():
+        mountpoint = tmpdir.mkdir(name)
+        mountpoint.join("config.json").write(json.dumps(config))
+        children.append(FakeDataset(
+            name=f"pool/iocage/jails/{name}",
+            mountpoint=str(mountpoint)
+        ))
+
+    jail_states = iocage.lib.JailState.JailStates(
+        dict([
+            (identifier, iocage.lib.JailState.JailState(identifier, data))
+            for identifier, data in [
+                (f"ioc-{name}", data) for name, data in states.items()
+            ]
+        ]),
+        ttl=3600
+    )
+    jail_states.updated_at = time.monotonic()
+
+    logger = iocage.lib.Logger.Logger()
+    host = types.SimpleNamespace(
+        datasets=types.SimpleNamespace(
+            jails=FakeDataset(
+                name="pool/iocage/jails",
+                mountpoint=str(tmpdir),
+                children=children
+            )
+        ),
+        default_config=iocage.lib.Config.Jail.Defaults.JailConfigDefaults(
+            logger=logger
+        ),
+        config_index=config_index,
+        config_type_cache=iocage.lib.ConfigTypeCache.ConfigTypeCache(),
+        jail_states=jail_states
+    )
+    return iocage.lib.Jails.JailsGenerator(
+        host=host,
+        logger=logger,
+        zfs=iocage.lib.ZFS.ZFS(),
+        **kwargs
+    )
+
+
+def invoke_cli(command, args, logger=None):
+    """
+    Invoke a cli command below a group that provides the logger like iocage
+    """
+
+    @click.group()
+    @click.pass_context
+    def cli(ctx):
+        if logger is None:
+            ctx.logger = iocage.lib.Logger.Logger()
+        else:
+            ctx.logger = logger
+
+    cli.add_command(command)
+    return click.testing.CliRunner().invoke(cli, [command.name] + list(args))
@@ -0,0 +1,147 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+
+import iocage.lib.ConfigIndex
+
+
+class ConfigReader(object):
+
+    def __init__(self, data):
+        self.data = data
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return dict(self.data)
+
+
+class TestConfigIndex(object):
+
+    def _create_index(self, tmpdir):
+        return iocage.lib.ConfigIndex.ConfigIndex(
+            file=str(tmpdir.join("index.jsonl"))
+        )
+
+    def test_entries_are_reused_while_the_file_is_unchanged(self, tmpdir):
+        config_file = tmpdir.join("config.json")
+        config_file.write("{}")
+        os.utime(str(config_file), ns=(0, 0))
+
+        index = self._create_index(tmpdir)
+        read = ConfigReader({"boot": "yes"})
+        for _ in range(3):
+            data = index.read_config("pool/jails/a", str(config_file), read)
+            assert data == {"boot": "yes"}
+        assert read.reads == 1
+        assert (index.hits, index.misses) == (2, 1)
+
+        # the returned data is a copy of the entry
+        data["boot"] = "no"
+        assert index.read_config("pool/jails/a", str(config_file), read) \
+            == {"boot": "yes"}
+
+    def test_entries_are_invalidated_by_file_changes(self, tmpdir):
+        config_file = tmpdir.join("config.json")
+        config_file.write("{}")
+        os.utime(str(config_file), ns=(0, 0))
+
+        index = self._create_index(tmpdir)
+        read = ConfigReader({"boot": "yes"})
+        index.read_config("pool/jails/a", str(config_file), read)
+
+        # modification time
+        os.utime(str(config_file), ns=(1, 1))
+        index.read_config("pool/jails/a", str(config_file), read)
+        assert read.reads == 2
+
+        # size
+        config_file.write("{ }")
+        os.utime(str(config_file), ns=(1, 1))
+        index.read_config("pool/jails/a", str(config_file), read)
+        assert read.reads == 3
+
+        # inode
+        replacement_file = tmpdir.join("replacement.json")
+        replacement_file.write("{ }")
+        os.utime(str(replacement_file), ns=(1, 1))
+        os.rename(str(replacement_file), str(config_file))
+        index.read_config("pool/jails/a", str(config_file), read)
+        assert read.reads == 4
+
+    def test_missing_files_are_not_indexed(self, tmpdir):
+        index = self._create_index(tmpdir)
+        read = ConfigReader({})
+        missing_file = str(tmpdir.join("missing.json"))
+        index.read_config("pool/jails/a", missing_file, read)
+        index.read_config("pool/jails/a", missing_file, read)
+        assert read.reads == 2
+        assert "pool/jails/a" not in index
+
+    def test_prune_removes_entries_of_other_datasets(self, tmpdir):
+        config_file = tmpdir.join("config.json")
+        config_file.write("{}")
+
+        index = self._create_index(tmpdir)
+        for name in ["a", "b", "c"]:
+            index.read_config(
+                f"pool/jails/{name}",
+                str(config_file),
+                ConfigReader({})
+            )
+        index.save()
+
+        index.prune(["pool/jails/a", "pool/jails/c"])
+        assert sorted(index.keys()) == ["pool/jails/a", "pool/jails/c"]
+        assert index.changed is True
+
+    def test_saved_entries_are_loaded_again(self, tmpdir):
+        config_file = tmpdir.join("config.json")
+        config_file.write("{}")
+
+        index = self._create_index(tmpdir)
+        index.read_config(
+            "pool/jails/a",
+            str(config_file),
+            ConfigReader({"boot": "yes", "tags": ["a", "b"]})
+        )
+        index.save()
+        assert index.changed is False
+
+        loaded_index = self._create_index(tmpdir)
+        read = ConfigReader({})
+        data = loaded_index.read_config(
+            "pool/jails/a",
+            str(config_file),
+            read
+        )
+        assert data == {"boot": "yes", "tags": ["a", "b"]}
+        assert read.reads == 0
+        assert loaded_index.changed is False
+
+    def test_invalid_index_files_are_discarded(self, tmpdir):
+        tmpdir.join("index.jsonl").write("{invalid\n")
+        index = self._create_index(tmpdir)
+        assert len(index) == 0
+        assert index.changed is True
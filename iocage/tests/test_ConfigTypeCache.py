@@ -0,0 +1,47 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+
+import iocage.lib.ConfigTypeCache
+
+
+class TestConfigTypeCache(object):
+
+    def test_entries_are_valid_while_the_directory_is_unchanged(self, tmpdir):
+        cache = iocage.lib.ConfigTypeCache.ConfigTypeCache()
+        mountpoint = str(tmpdir)
+        os.utime(mountpoint, ns=(0, 0))
+        cache.set_config_type("pool/iocage/jails/foo", mountpoint, "json")
+        assert cache.get_config_type("pool/iocage/jails/foo", mountpoint) \
+            == "json"
+
+        tmpdir.join("config").write("")
+        assert cache.get_config_type("pool/iocage/jails/foo", mountpoint) \
+            is None
+        assert len(cache) == 0
+
+    def test_unmounted_resources_are_not_cached(self):
+        cache = iocage.lib.ConfigTypeCache.ConfigTypeCache()
+        cache.set_config_type("pool/iocage/jails/foo", None, "zfs")
+        assert cache.get_config_type("pool/iocage/jails/foo", None) is None
@@ -0,0 +1,109 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+
+import pytest
+
+import iocage.lib.FileWriter
+
+
+class TestFileWriter(object):
+
+    def test_unchanged_content_is_not_written(self, tmpdir):
+        writer = iocage.lib.FileWriter.FileWriter()
+        path = str(tmpdir.join("rc.conf"))
+        assert writer.write(path, "foo=\"YES\"\n") is True
+        inode = os.stat(path).st_ino
+        assert writer.write(path, "foo=\"YES\"\n") is False
+        assert os.stat(path).st_ino == inode
+        assert writer.write(path, "foo=\"NO\"\n") is True
+        assert open(path).read() == "foo=\"NO\"\n"
+        assert os.listdir(str(tmpdir)) == ["rc.conf"]
+
+    def test_foreign_changes_are_detected(self, tmpdir):
+        writer = iocage.lib.FileWriter.FileWriter()
+        path = str(tmpdir.join("fstab"))
+        writer.write(path, "a\n")
+        with open(path, "w") as f:
+            f.write("b\n")
+        assert writer.write(path, "a\n") is True
+        assert open(path).read() == "a\n"
+
+    def test_file_mode_is_kept(self, tmpdir):
+        writer = iocage.lib.FileWriter.FileWriter(fsync=True)
+        path = str(tmpdir.join("devfs.rules"))
+        with open(path, "w") as f:
+            f.write("a\n")
+        os.chmod(path, 0o600)
+        assert writer.write(path, "b\n") is True
+        writer.sync()
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+    def test_new_files_respect_the_umask(self, tmpdir):
+        writer = iocage.lib.FileWriter.FileWriter()
+        umask = os.umask(0o027)
+        try:
+            writer.write(str(tmpdir.join("config.json")), "{}\n")
+            with open(str(tmpdir.join("opened.json")), "w") as f:
+                f.write("{}\n")
+        finally:
+            os.umask(umask)
+        mode = os.stat(str(tmpdir.join("config.json"))).st_mode & 0o777
+        assert mode == 0o640
+        assert mode == os.stat(str(tmpdir.join("opened.json"))).st_mode & 0o777
+
+    def test_symlinks_are_followed(self, tmpdir):
+        writer = iocage.lib.FileWriter.FileWriter()
+        target = str(tmpdir.join("config.json"))
+        link = str(tmpdir.join("link.json"))
+        with open(target, "w") as f:
+            f.write("{}\n")
+        os.symlink(target, link)
+        assert writer.write(link, "{\"a\": 1}\n") is True
+        assert os.path.islink(link) is True
+        assert open(target).read() == "{\"a\": 1}\n"
+        assert writer.write(link, "{\"a\": 1}\n") is False
+
+    @pytest.mark.skipif(os.geteuid() != 0, reason="requires root")
+    def test_file_owner_is_kept(self, tmpdir):
+        writer = iocage.lib.FileWriter.FileWriter()
+        path = str(tmpdir.join("rc.conf"))
+        with open(path, "w") as f:
+            f.write("a\n")
+        os.chown(path, 1, 2)
+        assert writer.write(path, "b\n") is True
+        stat_result = os.stat(path)
+        assert (stat_result.st_uid, stat_result.st_gid) == (1, 2)
+
+    def test_fsync_can_be_enabled_per_write(self, tmpdir, monkeypatch):
+        synced = []
+        monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+        writer = iocage.lib.FileWriter.FileWriter()
+        writer.write(str(tmpdir.join("fstab")), "a\n")
+        writer.sync()
+        assert len(synced) == 0
+        writer.write(str(tmpdir.join("config.json")), "{}\n", fsync=True)
+        assert len(synced) == 1
+        writer.sync()
+        assert len(synced) == 2
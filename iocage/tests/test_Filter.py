@@ -0,0 +1,67 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import iocage.lib.Filter
+
+
+class TestTerm(object):
+
+    def test_exact_values_match(self):
+        term = iocage.lib.Filter.Term("name", "foo,bar.baz")
+        assert term.matches("foo")
+        assert term.matches("bar.baz")
+        assert not term.matches("barxbaz")
+        assert not term.matches("foobar")
+
+    def test_prefix_globs_match(self):
+        term = iocage.lib.Filter.Term("name", "web*")
+        assert term.matches("web")
+        assert term.matches("web-01")
+        assert not term.matches("db-01")
+
+    def test_globs_match(self):
+        term = iocage.lib.Filter.Term("name", "*-0+")
+        assert term.matches("web-01")
+        assert not term.matches("web-0")
+        assert not term.matches("web-10")
+
+    def test_shortnames_match_uuids(self):
+        uuid = "0bdc1ea5-ed83-4c3a-a6d5-fa5d9d3f2c5e"
+        term = iocage.lib.Filter.Term("name", "0bdc1ea5")
+        assert term.matches(uuid, short=True)
+        assert not term.matches(uuid, short=False)
+
+    def test_matcher_is_updated_with_values(self):
+        term = iocage.lib.Filter.Term("name", "foo")
+        assert not term.matches("bar")
+        term.append("bar")
+        assert term.matches("bar")
+
+
+class TestTerms(object):
+
+    def test_match_key_requires_all_terms(self):
+        terms = iocage.lib.Filter.Terms(["web*", "name=*-01", "boot=yes"])
+        assert terms.match_key("name", "web-01")
+        assert not terms.match_key("name", "web-02")
+        assert not terms.match_key("name", "db-01")
@@ -29,6 +29,7 @@ import helper_functions
 import pytest
 
 import iocage.lib.Jail
+import iocage.lib.JailState
 
 
 def read_jail_config_json(config_file):
@@ -96,6 +97,86 @@ class TestJail(object):
 
         cleanup()
 
+    def test_runtime_state_is_exposed_as_attributes(self, host, logger, zfs):
+
+        jail = iocage.lib.Jail.Jail(
+            {
+                "id": "foo"
+            },
+            new=True,
+            host=host,
+            logger=logger,
+            zfs=zfs
+        )
+        jail.state = iocage.lib.JailState.JailState(
+            jail.identifier,
+            {
+                "jid": "42",
+                "ip4.addr": "10.0.0.1"
+            }
+        )
+
+        assert jail.jid == 42
+        assert getattr(jail, "ip4.addr") == "10.0.0.1"
+        assert jail.getstring("ip4.addr") == "10.0.0.1"
+        with pytest.raises(AttributeError):
+            jail.unknown_property
+
+    def test_legacy_zfs_config_can_be_migrated(self, host, local_release,
+                                               logger, zfs, root_dataset):
+
+        jail = iocage.lib.Jail.Jail(
+            new=True,
+            host=host,
+            logger=logger,
+            zfs=zfs
+        )
+        jail.create(local_release.name)
+        jail.config_type = "zfs"
+        jail.config["priority"] = 42
+        jail.save(force=True)
+
+        dataset = zfs.get_dataset(f"{root_dataset.name}/jails/{jail.name}")
+        config_file = f"{dataset.mountpoint}/config.json"
+        os.remove(config_file)
+
+        def cleanup():
+            helper_functions.unmount_and_destroy_dataset_recursive(dataset)
+
+        try:
+            legacy_jail = iocage.lib.Jail.Jail(
+                jail.name,
+                host=host,
+                logger=logger,
+                zfs=zfs
+            )
+            assert legacy_jail.config_type == "zfs"
+
+            events = legacy_jail.migrate_config(dry_run=True)
+            assert all(event.error is None for event in events)
+            assert not os.path.isfile(config_file)
+
+            legacy_jail.migrate_config()
+            assert os.path.isfile(config_file)
+
+            data = read_jail_config_json(config_file)
+            assert data["priority"] == "42"
+
+            migrated_jail = iocage.lib.Jail.Jail(
+                jail.name,
+                host=host,
+                logger=logger,
+                zfs=zfs
+            )
+            assert migrated_jail.config_type == "json"
+            assert str(migrated_jail.config["priority"]) == "42"
+
+        except BaseException as e:
+            cleanup()
+            raise e
+
+        cleanup()
+
 
 class TestNullFSBasejail(object):
 
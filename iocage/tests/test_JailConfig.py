@@ -0,0 +1,122 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import pytest
+
+import iocage.lib.Config.Jail.BaseConfig
+import iocage.lib.Config.Jail.Defaults
+import iocage.lib.errors
+
+
+class TestBaseConfig(object):
+
+    def test_dispatch_tables_are_resolved_per_class(self):
+        config_class = iocage.lib.Config.Jail.Defaults.JailConfigDefaults
+        assert config_class._getters["vnet"] == "_get_vnet"
+        assert config_class._setters["vnet"] == "_set_vnet"
+        assert "ip4_addr" not in config_class._getters
+
+    def test_items_are_read_through_getters(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        config["vnet"] = "on"
+        assert config["vnet"] is True
+        config["vnet"] = "off"
+        assert config["vnet"] is False
+
+    def test_instance_attributes_pass_through(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        config["legacy"] = "yes"
+        assert config["legacy"] is True
+
+    def test_depends_is_a_list_of_jail_names(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        assert config["depends"] == []
+        config["depends"] = "db,cache"
+        assert config["depends"] == ["db", "cache"]
+        assert config.data["depends"] == "db,cache"
+        config["depends"] = ""
+        assert config["depends"] == []
+        with pytest.raises(iocage.lib.errors.InvalidJailConfigValue):
+            config["depends"] = "db,no/jail"
+
+
+class TestConfigChanges(object):
+
+    def test_data_records_old_and_new_values(self):
+        data = iocage.lib.Config.Jail.BaseConfig.ConfigData({"a": "1"})
+        assert data.changes == {}
+        data["a"] = "2"
+        data["b"] = "3"
+        assert data.changes == {"a": ("1", "2"), "b": (None, "3")}
+        del data["b"]
+        assert data.changes == {"a": ("1", "2")}
+        data["a"] = "1"
+        assert data.changes == {}
+
+    def test_set_returns_whether_the_config_changed(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        config.clear_changes()
+        assert config.is_dirty is False
+        assert config.set("vnet", "on") is True
+        assert config.set("vnet", "yes") is False
+        assert config.is_dirty is True
+        assert config.changes["vnet"] == (False, "on")
+        config.clear_changes()
+        assert config.is_dirty is False
+
+    def test_setters_outside_of_the_data_mark_changes(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        config.clear_changes()
+        revision = config.data.revision
+        assert config.set("legacy", "yes") is True
+        assert config.set("legacy", "on") is False
+        assert config.data.revision != revision
+        assert config.is_dirty is True
+        assert config.changes["legacy"] == (False, True)
+        assert config.set("legacy", "no") is True
+        assert config.is_dirty is False
+        config.clear_changes()
+        assert config.is_dirty is False
+
+
+class TestDefaultsLookup(object):
+
+    def test_frozen_values_follow_changes(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        assert config.lookup("vnet") is False
+        properties = config.frozen_properties
+        assert config.frozen_properties is properties
+
+        config["vnet"] = "on"
+        config["custom"] = "foo"
+        assert config.lookup("vnet") is True
+        assert "custom" in config.frozen_properties
+        assert config.all_properties == sorted(config.data.keys())
+
+    def test_list_values_cannot_be_modified(self):
+        config = iocage.lib.Config.Jail.Defaults.JailConfigDefaults()
+        config["tags"] = "a,b"
+        tags = config.lookup("tags")
+        tags.append("c")
+        assert config.lookup("tags") == ["a", "b"]
+        assert config.frozen_values["tags"] == ("a", "b")
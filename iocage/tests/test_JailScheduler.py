@@ -0,0 +1,247 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import time
+
+import pytest
+
+import iocage.lib.errors
+import iocage.lib.events
+import iocage.lib.JailScheduler
+
+
+class FakeJail(object):
+
+    def __init__(self, name, priority, log, fail=False, depends=[]):
+        self.name = name
+        self.humanreadable_name = name
+        self.config = {"priority": priority, "depends": depends}
+        self.devfs_ruleset = 4
+        self.log = log
+        self.fail = fail
+
+    def require_jail_not_template(self):
+        pass
+
+    def start(self):
+        event = iocage.lib.events.JailLaunch(jail=self)
+        yield event.begin()
+        self.log.append(("begin", self.humanreadable_name))
+        time.sleep(0.01)
+        if self.fail is True:
+            raise iocage.lib.errors.JailConfigError("Cannot start")
+        self.log.append(("end", self.humanreadable_name))
+        yield event.end()
+
+    def stop(self, force=False):
+        event = iocage.lib.events.JailShutdown(jail=self)
+        yield event.begin()
+        self.log.append(("stop", self.humanreadable_name))
+        time.sleep(0.01)
+        if self.fail is True:
+            raise iocage.lib.errors.JailConfigError("Cannot stop")
+        self.log.append(("stopped", self.humanreadable_name))
+        yield event.end()
+
+
+class TestJailScheduler(object):
+
+    def test_ready_jails_are_started_in_priority_order(self):
+        log = []
+        jails = [
+            FakeJail("c", 20, log),
+            FakeJail("a", 10, log),
+            FakeJail("d", 20, log),
+            FakeJail("b", 10, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=1)
+        list(scheduler.start())
+
+        assert [name for action, name in log if action == "begin"] == [
+            "a", "b", "c", "d"
+        ]
+        assert [jail.humanreadable_name for jail in (
+            scheduler.started_jails
+        )] == ["a", "b", "c", "d"]
+
+    def test_independent_jails_are_started_concurrently(self):
+        log = []
+        jails = [FakeJail(str(i), 1, log) for i in range(4)]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=4)
+        list(scheduler.start())
+        assert [action for action, _ in log[:4]] == ["begin"] * 4
+
+    def test_priority_groups_are_started_one_after_another(self):
+        log = []
+        jails = [
+            FakeJail("late", 99, log),
+            FakeJail("early", 1, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=2)
+        list(scheduler.start())
+
+        assert log.index(("end", "early")) < log.index(("begin", "late"))
+
+    def test_priority_groups_are_stopped_in_reverse(self):
+        log = []
+        jails = [
+            FakeJail("early", 1, log),
+            FakeJail("late", 99, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=2)
+        list(scheduler.stop())
+
+        assert log.index(("stopped", "late")) < log.index(("stop", "early"))
+
+    def test_dependencies_move_jails_to_later_groups(self):
+        log = []
+        jails = [
+            FakeJail("app", 1, log, depends=["db"]),
+            FakeJail("db", 5, log),
+            FakeJail("cache", 5, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=3)
+        list(scheduler.start())
+
+        assert log.index(("end", "db")) < log.index(("begin", "app"))
+        assert len(scheduler.started_jails) == 3
+
+    def test_failures_do_not_abort_other_jails(self):
+        log = []
+        jails = [
+            FakeJail("a", 1, log, fail=True),
+            FakeJail("b", 1, log),
+            FakeJail("c", 2, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=2)
+        events = list(scheduler.start())
+
+        assert [jail.humanreadable_name for jail, _ in (
+            scheduler.failed_jails
+        )] == ["a"]
+        assert sorted(jail.humanreadable_name for jail in (
+            scheduler.started_jails
+        )) == ["b", "c"]
+        assert len(events) == 5
+
+    def test_jails_are_started_after_their_dependencies(self):
+        log = []
+        jails = [
+            FakeJail("proxy", 1, log, depends=["app"]),
+            FakeJail("app", 1, log, depends=["db"]),
+            FakeJail("db", 1, log),
+            FakeJail("cache", 1, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=4)
+        list(scheduler.start())
+
+        assert log.index(("end", "db")) < log.index(("begin", "app"))
+        assert log.index(("end", "app")) < log.index(("begin", "proxy"))
+
+        # independent jails do not wait for the dependency chain
+        assert log.index(("begin", "cache")) < log.index(("end", "db"))
+
+    def test_jails_are_stopped_before_their_dependencies(self):
+        log = []
+        jails = [
+            FakeJail("db", 1, log),
+            FakeJail("app", 1, log, depends=["db"]),
+            FakeJail("proxy", 1, log, depends=["app"])
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=4)
+        list(scheduler.stop())
+
+        assert [name for action, name in log if action == "stop"] == [
+            "proxy",
+            "app",
+            "db"
+        ]
+        assert len(scheduler.stopped_jails) == 3
+
+    def test_dependents_of_failed_jails_are_not_started(self):
+        log = []
+        jails = [
+            FakeJail("db", 1, log, fail=True),
+            FakeJail("app", 1, log, depends=["db"]),
+            FakeJail("proxy", 1, log, depends=["app"]),
+            FakeJail("cache", 1, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=2)
+        list(scheduler.start())
+
+        assert [jail.humanreadable_name for jail in (
+            scheduler.started_jails
+        )] == ["cache"]
+        assert sorted(jail.humanreadable_name for jail, _ in (
+            scheduler.failed_jails
+        )) == ["app", "db", "proxy"]
+        assert ("begin", "app") not in log
+
+    def test_unselected_dependencies_are_ignored(self):
+        log = []
+        jails = [FakeJail("app", 1, log, depends=["db"])]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails)
+        list(scheduler.start())
+        assert len(scheduler.started_jails) == 1
+
+    def test_dependency_cycles_are_detected(self, capsys):
+        log = []
+        jails = [
+            FakeJail("a", 1, log, depends=["c"]),
+            FakeJail("b", 1, log, depends=["a"]),
+            FakeJail("c", 1, log, depends=["b"]),
+            FakeJail("d", 1, log, depends=["a"])
+        ]
+        with pytest.raises(iocage.lib.errors.JailDependencyCycle):
+            iocage.lib.JailScheduler.JailScheduler(jails)
+        assert "a -> c -> b -> a" in capsys.readouterr().out
+
+    def test_concurrent_jails_nest_their_events_separately(self):
+
+        class NestingJail(FakeJail):
+
+            def start(self):
+                event = iocage.lib.events.JailLaunch(jail=self)
+                yield event.begin()
+                time.sleep(0.01)
+                child_event = iocage.lib.events.JailVnetConfiguration(
+                    jail=self
+                )
+                yield child_event.begin()
+                time.sleep(0.01)
+                yield child_event.end()
+                yield event.end()
+
+        log = []
+        jails = [
+            NestingJail("nested-a", 1, log),
+            NestingJail("nested-b", 1, log)
+        ]
+        scheduler = iocage.lib.JailScheduler.JailScheduler(jails, jobs=2)
+        events = list(scheduler.start())
+
+        assert len(events) == 8
+        for event in events:
+            expected_count = 1 if (event.type == "JailVnetConfiguration") \
+                else 0
+            assert event.parent_count == expected_count
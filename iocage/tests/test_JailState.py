@@ -0,0 +1,60 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import time
+
+import iocage.lib.JailState
+
+
+def _create_snapshot(ttl=60):
+    states = iocage.lib.JailState.JailStates({
+        "ioc-foo": iocage.lib.JailState.JailState("ioc-foo", {"jid": "1"})
+    }, ttl=ttl)
+    states.updated_at = time.monotonic()
+    return states
+
+
+class TestJailStates(object):
+
+    def test_fresh_snapshot_serves_jail_states(self):
+        states = _create_snapshot()
+        state = iocage.lib.JailState.JailState("ioc-foo", states=states)
+        assert state.query() == {"jid": "1"}
+        assert states.get_state_data("ioc-bar") == {}
+
+    def test_outdated_snapshot_is_not_used(self):
+        states = _create_snapshot(ttl=0)
+        assert states.fresh is False
+        assert states.get_state_data("ioc-foo") is None
+
+    def test_invalidated_jails_are_not_served(self):
+        states = _create_snapshot()
+        states.invalidate("ioc-foo")
+        assert states.get_state_data("ioc-foo") is None
+        assert states.get_state_data("ioc-bar") == {}
+
+        states.set_state_data("ioc-foo", {})
+        assert states.get_state_data("ioc-foo") == {}
+
+        states.invalidate()
+        assert states.get_state_data("ioc-bar") is None
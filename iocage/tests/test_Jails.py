@@ -0,0 +1,384 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import json
+
+import helper_functions
+
+import iocage.lib.ConfigIndex
+import iocage.lib.events
+import iocage.lib.helpers
+import iocage.lib.Jail
+
+
+class TestConfigIndex(object):
+
+    def test_reading_values_saves_the_config_index(self, tmpdir):
+        index_file = tmpdir.join("index.jsonl")
+        config_index = iocage.lib.ConfigIndex.ConfigIndex(
+            file=str(index_file)
+        )
+        jails = helper_functions.create_jails(
+            tmpdir.mkdir("jails"),
+            {"a": {"boot": "yes"}, "b": {"boot": "no"}},
+            config_index=config_index,
+            parallel=2
+        )
+
+        values = dict(jails.get_values(["boot"]))
+        assert values == {"a": [True], "b": [False]}
+        assert sorted(
+            json.loads(line)["dataset"] for line in index_file.readlines()
+        ) == ["pool/iocage/jails/a", "pool/iocage/jails/b"]
+
+    def test_counting_saves_the_config_index(self, tmpdir):
+        index_file = tmpdir.join("index.jsonl")
+        jails = helper_functions.create_jails(
+            tmpdir.mkdir("jails"),
+            {"a": {"boot": "yes"}, "b": {"boot": "no"}},
+            config_index=iocage.lib.ConfigIndex.ConfigIndex(
+                file=str(index_file)
+            ),
+            filters=("boot=yes",)
+        )
+        assert jails.any_match() is True
+        assert index_file.check() is True
+
+
+class TestFilterPlan(object):
+
+    def _prefilter(self, jails):
+        filter_plan = jails._plan_filters()
+        results = {}
+        for child_dataset in jails.dataset.children:
+            name = jails._get_asset_name_from_dataset(child_dataset)
+            remaining_terms = jails._prefilter_dataset(
+                child_dataset,
+                name,
+                filter_plan,
+                {}
+            )
+            results[name] = None if (remaining_terms is None) else [
+                term.key for term in remaining_terms
+            ]
+        return results
+
+    def test_terms_are_routed_to_their_cheapest_source(self, tmpdir):
+        jails = helper_functions.create_jails(
+            tmpdir,
+            {},
+            filters=(
+                "web*",
+                "running=yes",
+                "exec_start=x",
+                "priority=5",
+                "ip4_addr=foo"
+            )
+        )
+        plan = [
+            (source, [term.key for term in terms])
+            for source, terms in jails._plan_filters()
+        ]
+        assert plan == [
+            ("name", ["name"]),
+            ("state", ["running"]),
+            ("config", ["exec_start"]),
+            ("resource", ["priority", "ip4_addr"])
+        ]
+
+    def test_only_plain_properties_are_read_from_raw_configs(self, tmpdir):
+        jails = helper_functions.create_jails(tmpdir, {})
+        assert jails._is_raw_config_key("boot") is True
+        assert jails._is_raw_config_key("exec_start") is True
+        # special property
+        assert jails._is_raw_config_key("ip4_addr") is False
+        # property with a getter
+        assert jails._is_raw_config_key("priority") is False
+        # attribute of the JailConfig
+        assert jails._is_raw_config_key("data") is False
+
+    def test_name_state_and_config_terms_are_decided_early(self, tmpdir):
+        jails = helper_functions.create_jails(
+            tmpdir,
+            {
+                "web1": {"boot": "yes"},
+                "web2": {"boot": "no"},
+                "web3": {"boot": "yes"},
+                "db1": {"boot": "yes"}
+            },
+            states={"web1": {"jid": "5"}, "web2": {"jid": "6"}},
+            filters=("web*", "running=yes", "boot=yes")
+        )
+        assert self._prefilter(jails) == {
+            "web1": [],
+            "web2": None,
+            "web3": None,
+            "db1": None
+        }
+
+        jails.filters = ("web*", "priority=5")
+        assert self._prefilter(jails) == {
+            "web1": ["priority"],
+            "web2": ["priority"],
+            "web3": ["priority"],
+            "db1": None
+        }
+
+    def test_unreadable_configs_are_left_to_the_resource(self, tmpdir):
+        jails = helper_functions.create_jails(
+            tmpdir,
+            {"web1": {"boot": "yes"}},
+            filters=("boot=yes",)
+        )
+        tmpdir.join("web1", "config.json").write("{invalid")
+        assert self._prefilter(jails) == {"web1": ["boot"]}
+
+    def test_unmounted_jails_are_left_to_the_resource(self, tmpdir):
+        jails = helper_functions.create_jails(
+            tmpdir,
+            {"web1": {"boot": "yes"}},
+            filters=("boot=yes",)
+        )
+        jails.dataset.children[0]._mountpoint = None
+        assert self._prefilter(jails) == {"web1": ["boot"]}
+
+    def test_empty_filters_match_all_jails(self, tmpdir):
+        jails = helper_functions.create_jails(
+            tmpdir,
+            {"web1": {}, "web2": {}},
+            filters=()
+        )
+        assert jails._plan_filters() == []
+        assert self._prefilter(jails) == {"web1": [], "web2": []}
+        assert jails.count_matches() == 2
+
+
+class TestDatasetProperties(object):
+
+    def _create_jails(self, tmpdir, **kwargs):
+        return helper_functions.create_jails(
+            tmpdir,
+            {"web1": {"boot": "yes", "priority": 3}, "web2": {}},
+            **kwargs
+        )
+
+    def _get_property_reads(self, jails):
+        return [child.property_reads for child in jails.dataset.children]
+
+    def test_json_jails_do_not_read_zfs_properties(self, tmpdir):
+        jails = self._create_jails(tmpdir, filters=("boot=yes",))
+        assert [jail.name for jail in jails] == ["web1"]
+        assert dict(jails.get_values(["boot", "priority"])) == {
+            "web1": [True, 3]
+        }
+        assert jails.count_matches() == 1
+        assert self._get_property_reads(jails) == [0, 0]
+
+    def test_resource_filters_do_not_read_zfs_properties(self, tmpdir):
+        jails = self._create_jails(tmpdir, filters=("priority=3",))
+        assert jails.count_matches() == 1
+        assert dict(jails.get_values(["name"])) == {"web1": ["web1"]}
+        assert self._get_property_reads(jails) == [0, 0]
+
+
+class TestMigrateConfig(object):
+
+    class LegacyJail(object):
+
+        LEGACY_CONFIG_TYPES = ["zfs", "ucl"]
+        config_type = "zfs"
+
+        def __init__(self, name, migrate_config):
+            self.humanreadable_name = name
+            self.migrate_config = migrate_config
+
+    def _migrate(self, tmpdir, monkeypatch, migrate_config):
+        jails = helper_functions.create_jails(tmpdir, {"web1": {}})
+        jail = self.LegacyJail("web1", migrate_config)
+        monkeypatch.setattr(jails, "_load_child", lambda *args: jail)
+        return jails._migrate_child_config(
+            jails.dataset.children[0],
+            jails._plan_filters(),
+            False
+        )
+
+    def test_errors_before_the_event_are_reported(self, tmpdir, monkeypatch):
+
+        def migrate_config(dry_run):
+            raise OSError("config not readable")
+            yield
+
+        events = self._migrate(tmpdir, monkeypatch, migrate_config)
+        assert len(events) == 1
+        assert events[0].type == "JailConfigMigration"
+        assert events[0].identifier == "web1"
+        assert isinstance(events[0].error, OSError)
+
+    def test_pending_events_are_failed(self, tmpdir, monkeypatch):
+
+        def migrate_config(dry_run):
+            event = iocage.lib.events.JailConfigMigration(
+                jail=self.LegacyJail("web2", None),
+                current_config_type="zfs",
+                config_type="json"
+            )
+            yield event.begin()
+            raise OSError("config not writable")
+
+        events = self._migrate(tmpdir, monkeypatch, migrate_config)
+        assert len(events) == 2
+        assert events[0] is events[1]
+        assert events[1].pending is False
+        assert isinstance(events[1].error, OSError)
+
+    def test_failed_events_are_not_repeated(self, tmpdir, monkeypatch):
+
+        def migrate_config(dry_run):
+            event = iocage.lib.events.JailConfigMigration(
+                jail=self.LegacyJail("web3", None),
+                current_config_type="zfs",
+                config_type="json"
+            )
+            yield event.begin()
+            error = OSError("config not writable")
+            yield event.fail(error)
+            raise error
+
+        events = self._migrate(tmpdir, monkeypatch, migrate_config)
+        assert len(events) == 2
+        assert isinstance(events[1].error, OSError)
+
+
+class TestColumnGetter(object):
+
+    KEYS = [
+        "name",
+        "jid",
+        "running",
+        "boot",
+        "release",
+        "priority",
+        "login_flags",
+        "ip4_addr"
+    ]
+
+    def _create_jails(self, tmpdir):
+        return helper_functions.create_jails(
+            tmpdir,
+            {
+                "web1": {
+                    "boot": "yes",
+                    "priority": 3,
+                    "release": "11.1-RELEASE"
+                },
+                "web2": {}
+            },
+            states={"web1": {"jid": "7"}}
+        )
+
+    def _get_values(self, jails, key, monkeypatch):
+
+        def get(jail, key):
+            raise AssertionError(f"{key} was looked up with Jail.get")
+
+        getter = jails.get_column_getter(key)
+        loaded_jails = list(jails)
+        monkeypatch.setattr(iocage.lib.Jail.JailGenerator, "get", get)
+        try:
+            return list(map(getter, loaded_jails))
+        finally:
+            monkeypatch.undo()
+
+    def test_name_is_the_config_id(self, tmpdir, monkeypatch):
+        jails = self._create_jails(tmpdir)
+        values = self._get_values(jails, "name", monkeypatch)
+        assert values == ["web1", "web2"]
+
+    def test_state_values_are_read_from_the_jail_state(
+        self,
+        tmpdir,
+        monkeypatch
+    ):
+        jails = self._create_jails(tmpdir)
+        assert self._get_values(jails, "jid", monkeypatch) == [7, None]
+        assert self._get_values(jails, "running", monkeypatch) == [
+            True,
+            False
+        ]
+
+    def test_config_values_fall_back_to_defaults(self, tmpdir, monkeypatch):
+        jails = self._create_jails(tmpdir)
+        values = self._get_values(jails, "boot", monkeypatch)
+        assert values == [True, False]
+
+        # without a default the jail is asked
+        getter = jails.get_column_getter("release")
+        assert list(map(getter, jails)) == ["11.1-RELEASE", None]
+
+    def test_derived_values_use_the_config_getter(self, tmpdir, monkeypatch):
+        jails = self._create_jails(tmpdir)
+        assert self._get_values(jails, "login_flags", monkeypatch) == [
+            ["-f", "root"],
+            ["-f", "root"]
+        ]
+
+        # unset values are looked up with their defaults
+        getter = jails.get_column_getter("priority")
+        assert list(map(getter, jails)) == [3, 0]
+
+    def test_getters_return_the_jail_values(self, tmpdir):
+        jails = self._create_jails(tmpdir)
+        for key in self.KEYS:
+            getter = jails.get_column_getter(key)
+            for jail in jails:
+                value = iocage.lib.helpers.to_string(getter(jail), none="-")
+                assert value == jail.getstring(key)
+
+
+class TestPropertyEnv(object):
+
+    def test_env_is_rebuilt_when_the_config_changes(self, tmpdir):
+        jails = helper_functions.create_jails(tmpdir, {"web1": {"boot": "no"}})
+        jail = list(jails)[0]
+
+        property_env = jail._get_property_env()
+        assert property_env["IOCAGE_BOOT"] == "no"
+        assert jail._get_property_env() is property_env
+
+        jail.config["boot"] = "yes"
+        changed_property_env = jail._get_property_env()
+        assert changed_property_env is not property_env
+        assert changed_property_env["IOCAGE_BOOT"] == "yes"
+        assert jail._get_property_env() is changed_property_env
+
+    def test_env_is_rebuilt_when_the_defaults_change(self, tmpdir):
+        jails = helper_functions.create_jails(tmpdir, {"web1": {}})
+        jail = list(jails)[0]
+
+        property_env = jail._get_property_env()
+        assert property_env["IOCAGE_PRIORITY"] == "0"
+
+        jails.host.default_config["priority"] = 5
+        changed_property_env = jail._get_property_env()
+        assert changed_property_env is not property_env
+        assert changed_property_env["IOCAGE_PRIORITY"] == "5"
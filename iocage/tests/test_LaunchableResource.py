@@ -0,0 +1,84 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import helper_functions
+
+import iocage.lib.LaunchableResource
+import iocage.lib.ZFS
+
+
+class CountingZFS(iocage.lib.ZFS.ZFS):
+
+    lookups = 0
+
+    def get_dataset(self, name):
+        self.lookups += 1
+        return helper_functions.FakeDataset(name, mountpoint=f"/{name}")
+
+
+class FakeLaunchableResource(
+    iocage.lib.LaunchableResource.LaunchableResource
+):
+
+    _name = "iocage/jails/foo"
+
+    @property
+    def dataset_name(self):
+        return self._name
+
+    @dataset_name.setter
+    def dataset_name(self, value):
+        self._name = value
+
+    def destroy(self, force=False):
+        pass
+
+    def save(self):
+        pass
+
+
+class TestLaunchableResource(object):
+
+    def test_root_dataset_is_memoized(self):
+        zfs = CountingZFS()
+        resource = FakeLaunchableResource(zfs=zfs)
+        assert resource.root_dataset.name == "iocage/jails/foo/root"
+        assert resource.root_path == "/iocage/jails/foo/root"
+        assert resource.root_path == "/iocage/jails/foo/root"
+        assert zfs.lookups == 1
+
+    def test_handles_are_looked_up_again_after_rename(self):
+        zfs = CountingZFS()
+        resource = FakeLaunchableResource(zfs=zfs)
+        assert resource.root_path == "/iocage/jails/foo/root"
+        resource.dataset_name = "iocage/jails/bar"
+        assert resource.root_path == "/iocage/jails/bar/root"
+        assert zfs.lookups == 2
+
+    def test_invalidated_handles_are_looked_up_again(self):
+        zfs = CountingZFS()
+        resource = FakeLaunchableResource(zfs=zfs)
+        resource.root_dataset
+        resource.invalidate_handles()
+        resource.root_dataset
+        assert zfs.lookups == 2
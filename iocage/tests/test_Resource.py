@@ -0,0 +1,163 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import time
+
+import helper_functions
+
+import iocage.lib.Resource
+import iocage.lib.ZFS
+
+
+class FakeResource(object):
+
+    def __init__(self, dataset):
+        self.name = dataset.name.split("/").pop()
+        self.kind = "fake"
+
+    def get(self, key):
+        return getattr(self, key, None)
+
+
+class FakeListableResource(iocage.lib.Resource.ListableResource):
+
+    loaded = 0
+
+    def _create_resource_instance(self, dataset, *args, **kwargs):
+        self.loaded += 1
+        # later children load faster to shuffle the completion order
+        index = int(dataset.name.split("/").pop())
+        time.sleep(0.001 * (len(self.dataset.children) - index))
+        return FakeResource(dataset)
+
+
+class TestListableResource(object):
+
+    def _create_resources(self, **kwargs):
+        return FakeListableResource(
+            dataset=helper_functions.create_fake_dataset_tree("iocage/x", 8),
+            zfs=iocage.lib.ZFS.ZFS(),
+            **kwargs
+        )
+
+    def test_parallel_loading_keeps_dataset_order(self):
+        resources = self._create_resources(parallel=4)
+        names = [resource.name for resource in resources]
+        assert names == [str(i) for i in range(8)]
+
+    def test_unordered_parallel_loading_yields_all_resources(self):
+        resources = self._create_resources(parallel=4, ordered=False)
+        names = [resource.name for resource in resources]
+        assert sorted(names) == [str(i) for i in range(8)]
+
+    def test_filters_apply_to_parallel_loading(self):
+        resources = self._create_resources(parallel=3, filters=("1,5,7",))
+        names = [resource.name for resource in resources]
+        assert names == ["1", "5", "7"]
+
+    def test_count_by_name_does_not_load_resources(self):
+        resources = self._create_resources(filters=("1,5,7",))
+        assert resources.count_matches() == 3
+        assert resources.any_match() is True
+        assert resources.loaded == 0
+
+    def test_length_is_the_number_of_matches(self):
+        resources = self._create_resources(filters=("1,5,7",))
+        assert len(resources) == resources.count_matches()
+        assert len(resources) == 3
+        assert bool(resources) is True
+        resources.filters = ("9",)
+        assert len(resources) == 0
+        assert bool(resources) is False
+        assert resources.loaded == 0
+
+    def test_lists_of_resources_are_loaded_once(self):
+        resources = self._create_resources(filters=("kind=fake",))
+        assert len(list(iter(resources))) == 8
+        assert resources.loaded == 8
+        assert len(sorted(iter(resources), key=lambda x: x.name)) == 8
+        assert resources.loaded == 16
+
+    def test_count_loads_resources_for_unknown_keys(self):
+        resources = self._create_resources(filters=("name=3",))
+        assert resources.count_matches() == 1
+        resources.filters = ("name=3", "foo=bar")
+        assert resources.any_match() is False
+        assert resources.loaded == 1
+
+    def test_get_values_by_name_does_not_load_resources(self):
+        resources = self._create_resources(parallel=3, filters=("2,4",))
+        assert list(resources.get_values(["name"])) == [
+            ("2", ["2"]),
+            ("4", ["4"])
+        ]
+        assert resources.loaded == 0
+
+    def test_get_values_loads_resources_for_unknown_keys(self):
+        resources = self._create_resources(filters=("6",))
+        assert list(resources.get_values(["name", "foo"])) == [
+            ("6", ["6", None])
+        ]
+        assert resources.loaded == 1
+
+
+class TestDefaultsRegistry(object):
+
+    def _load_defaults(self, registry, mountpoint):
+        dataset = helper_functions.FakeDataset(
+            "iocage",
+            mountpoint=mountpoint
+        )
+        resource = iocage.lib.Resource.DefaultResource(
+            dataset=dataset,
+            zfs=iocage.lib.ZFS.ZFS()
+        )
+        registry.load(resource)
+        return resource
+
+    def test_defaults_are_shared_until_modified(self, tmpdir):
+        tmpdir.join("defaults.json").write('{"vnet": "on"}')
+        registry = iocage.lib.Resource.DefaultsRegistry()
+        first = self._load_defaults(registry, str(tmpdir))
+        second = self._load_defaults(registry, str(tmpdir))
+
+        assert first.config.data is second.config.data
+        assert second.config["vnet"] is True
+
+        second.config["vnet"] = "off"
+        assert first.config.data is not second.config.data
+        assert first.config["vnet"] is True
+        assert second.config["vnet"] is False
+        assert second.config.user_data == {"vnet": "off"}
+
+    def test_changed_files_are_read_again(self, tmpdir):
+        defaults_file = tmpdir.join("defaults.json")
+        defaults_file.write('{"vnet": "on"}')
+        registry = iocage.lib.Resource.DefaultsRegistry()
+        first = self._load_defaults(registry, str(tmpdir))
+
+        defaults_file.write('{"vnet": "off", "boot": "on"}')
+        second = self._load_defaults(registry, str(tmpdir))
+
+        assert first.config.data is not second.config.data
+        assert second.config["vnet"] is False
@@ -0,0 +1,333 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import helper_functions
+import libzfs
+
+import iocage.lib.Config.Type.ZFS
+import iocage.lib.ZFS
+
+PREFIX = iocage.lib.Config.Type.ZFS.ZFS_PROPERTY_PREFIX
+
+
+class TestFetchDataset(object):
+
+    def test_fetch_children_reads_properties_once(self):
+        tree = helper_functions.create_fake_dataset_tree(
+            "iocage/jails",
+            3,
+            properties={
+                f"{PREFIX}tag": "foo",
+                "org.example:other": "bar"
+            }
+        )
+        zfs = iocage.lib.ZFS.ZFS()
+
+        prefetched_datasets = zfs.fetch_children(tree, PREFIX)
+
+        assert len(prefetched_datasets) == 3
+        for child, prefetched in zip(tree.children, prefetched_datasets):
+            assert child.property_reads == 1
+            assert prefetched.name == child.name
+            assert prefetched.mountpoint == child.mountpoint
+            assert prefetched.origin is None
+            assert prefetched.user_properties == {f"{PREFIX}tag": "foo"}
+
+    def test_unmounted_datasets_have_no_mountpoint(self):
+        dataset = helper_functions.FakeDataset("iocage/jails/foo")
+        prefetched = iocage.lib.ZFS.ZFS().fetch_dataset(dataset)
+        assert prefetched.mountpoint is None
+
+    def test_config_is_read_from_prefetched_properties(self):
+        dataset = helper_functions.FakeDataset(
+            "iocage/jails/foo",
+            mountpoint="/iocage/jails/foo",
+            properties={
+                f"{PREFIX}tag": "foo",
+                f"{PREFIX}vnet": "on"
+            }
+        )
+        prefetched = iocage.lib.ZFS.ZFS().fetch_dataset(dataset, PREFIX)
+        config = iocage.lib.Config.Type.ZFS.ConfigZFS(
+            dataset=dataset,
+            prefetched_dataset=prefetched
+        )
+
+        assert config.exists is True
+        assert config.read() == {"tag": "foo", "vnet": True}
+        assert dataset.property_reads == 1
+
+
+class TestUpdateUserProperties(object):
+
+    def _create_config(self):
+        dataset = helper_functions.FakeDataset(
+            "iocage/jails/foo",
+            mountpoint="/iocage/jails/foo",
+            properties={
+                f"{PREFIX}tag": "foo",
+                f"{PREFIX}vnet": "on",
+                f"{PREFIX}stale": "on",
+                "org.example:other": "bar"
+            }
+        )
+        config = iocage.lib.Config.Type.ZFS.ConfigZFS(dataset=dataset)
+        return dataset, config
+
+    def test_changes_are_applied_in_one_operation(self):
+        dataset, config = self._create_config()
+        assert config.write({"tag": "bar", "vnet": True}) is True
+
+        assert dataset.property_updates == 1
+        assert dataset._properties == {
+            f"{PREFIX}tag": "bar",
+            f"{PREFIX}vnet": "on",
+            "org.example:other": "bar"
+        }
+
+    def test_unchanged_properties_are_not_written(self):
+        dataset, config = self._create_config()
+        written = config.write({"tag": "foo", "vnet": True, "stale": "on"})
+
+        assert written is False
+
+        assert dataset.property_updates == 0
+        assert dataset.property_reads == 1
+
+    def test_properties_are_set_one_by_one_without_batch_updates(self):
+        dataset = PropertyDataset("iocage/jails/foo", {
+            f"{PREFIX}tag": "foo",
+            f"{PREFIX}stale": "on",
+            "org.example:other": "bar"
+        })
+        current_properties = dict([
+            (name, prop.value) for name, prop in dataset.properties.items()
+        ])
+
+        changed, removed = iocage.lib.ZFS.ZFS().update_user_properties(
+            dataset,
+            {f"{PREFIX}tag": "bar", f"{PREFIX}vnet": "on"},
+            property_prefix=PREFIX,
+            current_properties=current_properties
+        )
+
+        assert changed == {f"{PREFIX}tag": "bar", f"{PREFIX}vnet": "on"}
+        assert removed == [f"{PREFIX}stale"]
+        assert dataset.properties.writes == [f"{PREFIX}tag", f"{PREFIX}vnet"]
+        assert dataset.properties.inherited == [f"{PREFIX}stale"]
+        assert dict([
+            (name, prop.value) for name, prop in dataset.properties.items()
+        ]) == {
+            f"{PREFIX}tag": "bar",
+            f"{PREFIX}vnet": "on",
+            "org.example:other": "bar"
+        }
+
+
+class FakeUserProperty(object):
+
+    def __init__(self, properties, name, value):
+        self.properties = properties
+        self.name = name
+        self.value = value
+
+    def inherit(self):
+        self.properties.inherited.append(self.name)
+        dict.__delitem__(self.properties, self.name)
+
+
+class FakePropertyDict(dict):
+    """
+    Property list that records the properties set and inherited
+    """
+
+    def __init__(self, properties):
+        dict.__init__(self)
+        self.writes = []
+        self.inherited = []
+        for name, value in properties.items():
+            dict.__setitem__(self, name, FakeUserProperty(self, name, value))
+
+    def __setitem__(self, name, user_property):
+        self.writes.append(name)
+        dict.__setitem__(
+            self,
+            name,
+            FakeUserProperty(self, name, user_property.value)
+        )
+
+
+class PropertyDataset(object):
+    """
+    Dataset of libzfs versions without batched property updates
+    """
+
+    def __init__(self, name, properties):
+        self.name = name
+        self.properties = FakePropertyDict(properties)
+
+
+class FakePool(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def create(self, name, properties, create_ancestors=False):
+        pass
+
+
+class FakeSnapshot(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def clone(self, target):
+        pass
+
+    def delete(self):
+        pass
+
+
+class FakeLibZFS(libzfs.ZFS):
+    """
+    Stand-in for the libzfs lookups that counts them
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.lookups = []
+        self.pool_reads = 0
+
+    @property
+    def pools(self):
+        self.pool_reads += 1
+        return [FakePool("tank"), FakePool("zroot")]
+
+    def get_dataset(self, name):
+        self.lookups.append(name)
+        dataset = helper_functions.FakeDataset(name)
+        dataset.rename = lambda new_name: None
+        dataset.delete = lambda: None
+        dataset.mount = lambda: None
+        return dataset
+
+
+class CachingZFS(iocage.lib.ZFS.ZFS, FakeLibZFS):
+    pass
+
+
+class TestHandleCache(object):
+
+    def test_pools_are_looked_up_by_name(self):
+        zfs = CachingZFS()
+        assert zfs.get_pool("zroot/iocage/jails").name == "zroot"
+        assert zfs.get_pool("tank").name == "tank"
+        assert zfs.pool_reads == 1
+
+    def test_dataset_handles_are_reused(self):
+        zfs = CachingZFS()
+        dataset = zfs.get_dataset("zroot/iocage")
+        assert zfs.get_dataset("zroot/iocage") is dataset
+        assert zfs.lookups == ["zroot/iocage"]
+        assert zfs.dataset_cache_hits == 1
+        assert zfs.dataset_cache_misses == 1
+
+    def test_least_recently_used_handles_are_evicted(self):
+        zfs = CachingZFS()
+        zfs.DATASET_CACHE_SIZE = 2
+        zfs.get_dataset("zroot/a")
+        zfs.get_dataset("zroot/b")
+        zfs.get_dataset("zroot/a")
+        zfs.get_dataset("zroot/c")
+        zfs.get_dataset("zroot/a")
+        zfs.get_dataset("zroot/b")
+        assert zfs.lookups == ["zroot/a", "zroot/b", "zroot/c", "zroot/b"]
+
+    def test_renamed_and_deleted_datasets_are_forgotten(self):
+        zfs = CachingZFS()
+        zfs.get_dataset("zroot/jails/foo/root")
+        zfs.rename_dataset(zfs.get_dataset("zroot/jails/foo"), "zroot/bar")
+        zfs.get_dataset("zroot/jails/foo/root")
+        zfs.delete_dataset(zfs.get_dataset("zroot/bar"))
+        zfs.get_dataset("zroot/bar")
+        assert zfs.lookups == [
+            "zroot/jails/foo/root",
+            "zroot/jails/foo",
+            "zroot/jails/foo/root",
+            "zroot/bar",
+            "zroot/bar"
+        ]
+
+    def _cache(self, zfs, names):
+        zfs.lookups = []
+        for name in names:
+            zfs.get_dataset(name)
+
+    def _assert_forgotten(self, zfs, forgotten_names, kept_names):
+        self._cache(zfs, forgotten_names + kept_names)
+        assert zfs.lookups == forgotten_names
+
+    def test_renamed_datasets_and_children_are_forgotten(self):
+        zfs = CachingZFS()
+        self._cache(zfs, [
+            "zroot/jails/foo/root/usr",
+            "zroot/jails/foobar",
+            "zroot/bar/root"
+        ])
+        zfs.rename_dataset(zfs.get_dataset("zroot/jails/foo"), "zroot/bar")
+        self._assert_forgotten(
+            zfs,
+            ["zroot/jails/foo", "zroot/jails/foo/root/usr", "zroot/bar/root"],
+            ["zroot/jails/foobar"]
+        )
+
+    def test_deleted_datasets_and_children_are_forgotten(self):
+        zfs = CachingZFS()
+        self._cache(zfs, ["zroot/jails/foo/root", "zroot/jails/foobar"])
+        zfs.delete_dataset(zfs.get_dataset("zroot/jails/foo"))
+        self._assert_forgotten(
+            zfs,
+            ["zroot/jails/foo", "zroot/jails/foo/root"],
+            ["zroot/jails/foobar"]
+        )
+
+    def test_created_datasets_and_children_are_forgotten(self):
+        zfs = CachingZFS()
+        self._cache(zfs, ["zroot/jails/foo/root", "zroot/jails/foobar"])
+        zfs.create_dataset("zroot/jails/foo")
+        self._assert_forgotten(
+            zfs,
+            ["zroot/jails/foo/root"],
+            ["zroot/jails/foo", "zroot/jails/foobar"]
+        )
+
+    def test_clone_targets_are_forgotten(self):
+        zfs = CachingZFS()
+        self._cache(zfs, ["zroot/jails/foo/root/usr", "zroot/releases/11.1"])
+        snapshot = FakeSnapshot("zroot/releases/11.1@foo")
+        zfs.clone_snapshot(snapshot, "zroot/jails/foo/root")
+        zfs.delete_snapshot(snapshot)
+        self._assert_forgotten(
+            zfs,
+            ["zroot/jails/foo/root/usr"],
+            ["zroot/releases/11.1"]
+        )
@@ -0,0 +1,115 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import json
+import types
+
+import helper_functions
+
+import iocage.cli.get
+import iocage.lib.Host
+import iocage.lib.Jails
+
+
+class FakeJails(object):
+    """
+    Stand-in for JailsGenerator that returns fixed property values
+    """
+
+    VALUES = {
+        "web1": {"boot": True, "priority": 3},
+        "web2": {"boot": False, "priority": None}
+    }
+
+    def __init__(self, filters, host, logger, parallel):
+        FakeJails.arguments = dict(filters=filters, parallel=parallel)
+
+    def get_values(self, keys):
+        for name, values in FakeJails.VALUES.items():
+            yield (name, [values[key] for key in keys])
+
+
+def get(monkeypatch, args):
+    host = types.SimpleNamespace(
+        default_config=types.SimpleNamespace(
+            all_properties=["boot", "priority"]
+        )
+    )
+    monkeypatch.setattr(iocage.lib.Host, "Host", lambda logger: host)
+    monkeypatch.setattr(iocage.lib.Jails, "JailsGenerator", FakeJails)
+    return helper_functions.invoke_cli(iocage.cli.get.cli, args)
+
+
+class TestPropertyMatrix(object):
+
+    def test_matrix_of_matching_jails(self, monkeypatch):
+        result = get(monkeypatch, [
+            "boot,priority",
+            "web*",
+            "--output-format", "csv",
+            "--jobs", "4"
+        ])
+
+        assert result.exit_code == 0
+        assert FakeJails.arguments == dict(filters=("web*",), parallel=4)
+        assert result.output == (
+            "NAME;BOOT;PRIORITY\n"
+            "web1;yes;3\n"
+            "web2;no;-\n"
+        )
+
+    def test_matrix_without_header(self, monkeypatch):
+        result = get(monkeypatch, [
+            "boot",
+            "web1",
+            "--output-format", "list",
+            "--no-header"
+        ])
+
+        assert result.exit_code == 0
+        assert FakeJails.arguments == dict(filters=("web1",), parallel=1)
+        assert result.output == "web1\tyes\nweb2\tno\n"
+
+    def test_matrix_of_all_properties(self, monkeypatch):
+        result = get(monkeypatch, ["all", "web*", "--output-format", "json"])
+
+        assert result.exit_code == 0
+        assert json.loads(result.output) == [
+            {"name": "web1", "boot": "yes", "priority": "3"},
+            {"name": "web2", "boot": "no", "priority": "-"}
+        ]
+
+    def test_table_matrix_has_a_header(self, monkeypatch):
+        result = get(monkeypatch, ["boot,priority", "web*"])
+
+        assert result.exit_code == 0
+        cells = [
+            [cell.strip() for cell in line.split("|")[1:-1]]
+            for line in result.output.split("\n")
+            if line.startswith("|")
+        ]
+        assert cells == [
+            ["NAME", "BOOT", "PRIORITY"],
+            ["web1", "yes", "3"],
+            ["web2", "no", "-"]
+        ]
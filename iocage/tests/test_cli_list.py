@@ -0,0 +1,105 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import types
+
+import helper_functions
+
+import iocage.cli.list
+import iocage.lib.Host
+import iocage.lib.Jails
+
+
+class FakeJails(list):
+    """
+    Stand-in for JailsGenerator that lists the jails in their given order
+    """
+
+    JAILS = []
+
+    def __init__(self, **kwargs):
+        list.__init__(self, FakeJails.JAILS)
+
+    def get_column_getter(self, column):
+        return lambda jail: getattr(jail, column)
+
+
+def list_jails(monkeypatch, jails, args):
+    FakeJails.JAILS = [
+        types.SimpleNamespace(name=name, priority=priority)
+        for name, priority in jails
+    ]
+    monkeypatch.setattr(iocage.lib.Host, "Host", lambda **kwargs: None)
+    monkeypatch.setattr(iocage.lib.Jails, "JailsGenerator", FakeJails)
+    return helper_functions.invoke_cli(iocage.cli.list.cli, args)
+
+
+class TestSort(object):
+
+    def test_sort_is_stable_across_spilled_runs(self, monkeypatch):
+        spilled_runs = []
+
+        def spill_sorted_rows(rows):
+            spilled_runs.append(len(rows))
+            return spill(rows)
+
+        spill = iocage.cli.list._spill_sorted_rows
+        monkeypatch.setattr(
+            iocage.cli.list,
+            "_spill_sorted_rows",
+            spill_sorted_rows
+        )
+
+        result = list_jails(
+            monkeypatch,
+            [
+                ("a", 2), ("b", 1), ("c", 2), ("d", 3), ("e", 1),
+                ("f", 2), ("g", 1), ("h", 3)
+            ],
+            [
+                "--sort", "priority",
+                "--sort-buffer", "3",
+                "--output", "name,priority",
+                "--output-format", "csv",
+                "--no-header"
+            ]
+        )
+
+        assert result.exit_code == 0
+        assert spilled_runs == [3, 3]
+        assert result.output.split("\n") == [
+            "b;1", "e;1", "g;1",
+            "a;2", "c;2", "f;2",
+            "d;3", "h;3",
+            ""
+        ]
+
+    def test_rows_are_not_sorted_without_sort_key(self, monkeypatch):
+        result = list_jails(
+            monkeypatch,
+            [("b", 1), ("a", 2)],
+            ["--output", "name", "--output-format", "list", "--no-header"]
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "b\na\n"
@@ -0,0 +1,63 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import iocage.cli.shared.output
+
+ROWS = [
+    ["foo", "1", "yes", "no"],
+    ["bar-baz", "1234567", "no", "yes"],
+    ["qux", "-", "no", "no"]
+]
+
+
+def print_table(capsys, rows, columns, show_header, stream):
+    iocage.cli.shared.output.print_table(
+        iter(rows),
+        columns,
+        show_header,
+        stream=stream
+    )
+    return capsys.readouterr().out
+
+
+class TestTable(object):
+
+    def _assert_streamed_like_buffered(self, capsys, rows, columns):
+        for show_header in [True, False]:
+            buffered = print_table(capsys, rows, columns, show_header, False)
+            streamed = print_table(capsys, rows, columns, show_header, True)
+            assert streamed == buffered
+
+    def test_streamed_table_equals_buffered_table(self, capsys):
+        self._assert_streamed_like_buffered(
+            capsys,
+            ROWS,
+            ["name", "jid", "running", "boot"]
+        )
+
+    def test_long_values_of_known_columns_are_not_wrapped(self, capsys):
+        rows = [row[1:] for row in ROWS]
+        columns = ["jid", "running", "boot"]
+        self._assert_streamed_like_buffered(capsys, rows, columns)
+        output = print_table(capsys, rows, columns, True, True)
+        assert "| 1234567 |" in output
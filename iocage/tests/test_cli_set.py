@@ -0,0 +1,93 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import helper_functions
+
+import iocage.cli.set
+import iocage.lib.Host
+import iocage.lib.Jails
+
+
+class FakeConfig(dict):
+
+    def set(self, key, value):
+        changed = (self.get(key, None) != value)
+        self[key] = value
+        return changed
+
+
+class FakeJail(object):
+
+    def __init__(self, name, config):
+        self.humanreadable_name = name
+        self.config = FakeConfig(config)
+        self.saved = False
+
+    def save(self):
+        self.saved = True
+
+
+class FakeJails(list):
+
+    JAILS = []
+
+    def __init__(self, filters, host, logger, parallel):
+        list.__init__(self, FakeJails.JAILS)
+
+
+def set_properties(monkeypatch, jails, args):
+    FakeJails.JAILS = jails
+    monkeypatch.setattr(iocage.lib.Host, "HostGenerator", lambda logger: None)
+    monkeypatch.setattr(iocage.lib.Jails, "JailsGenerator", FakeJails)
+    return helper_functions.invoke_cli(iocage.cli.set.cli, args)
+
+
+class TestSummary(object):
+
+    def test_updated_and_unchanged_jails_are_counted(self, monkeypatch):
+        jails = [
+            FakeJail("web1", {"boot": "no"}),
+            FakeJail("web2", {"boot": "yes"}),
+            FakeJail("web3", {"boot": "no"})
+        ]
+        result = set_properties(monkeypatch, jails, ["boot=yes", "web*"])
+
+        assert result.exit_code == 0
+        assert "Jail 'web1' updated: boot" in result.output
+        assert "Jail 'web2' unchanged" in result.output
+        assert "2 jails updated, 1 unchanged" in result.output
+        assert [jail.saved for jail in jails] == [True, False, True]
+
+    def test_single_jails_are_not_summarized(self, monkeypatch):
+        jails = [FakeJail("web1", {"boot": "yes"})]
+        result = set_properties(monkeypatch, jails, ["boot=yes", "web1"])
+
+        assert result.exit_code == 0
+        assert "Jail 'web1' unchanged" in result.output
+        assert "jails updated" not in result.output
+
+    def test_no_matching_jails(self, monkeypatch):
+        result = set_properties(monkeypatch, [], ["boot=yes", "web*"])
+
+        assert result.exit_code == 1
+        assert "No jails to update" in result.output
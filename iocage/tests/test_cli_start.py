@@ -0,0 +1,70 @@
+# Copyright (c) 2014-2017, iocage
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted providing that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED.  IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS
+# OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+# HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT,
+# STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING
+# IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import helper_functions
+
+import iocage.cli.start
+import iocage.lib.Jails
+
+
+class TestSelection(object):
+
+    def test_selected_jails_are_loaded_once(self, tmpdir, monkeypatch):
+        jails = helper_functions.create_jails(
+            tmpdir,
+            {"web1": {"priority": 3}, "web2": {"priority": 5}}
+        )
+        loaded_jails = []
+        get_resource = jails._get_resource_from_dataset
+
+        def get_counted_resource(dataset, **kwargs):
+            loaded_jails.append(dataset.name)
+            return get_resource(dataset, **kwargs)
+
+        def create_jails(logger, filters):
+            jails.filters = filters
+            return jails
+
+        selected_jails = []
+        monkeypatch.setattr(
+            jails,
+            "_get_resource_from_dataset",
+            get_counted_resource
+        )
+        monkeypatch.setattr(iocage.lib.Jails, "JailsGenerator", create_jails)
+        monkeypatch.setattr(
+            iocage.cli.start,
+            "start_jails",
+            lambda jails, **kwargs: selected_jails.extend(jails)
+        )
+        iocage.cli.start.normal(
+            ("priority=3",),
+            logger=None,
+            print_function=None
+        )
+
+        assert [jail.name for jail in selected_jails] == ["web1"]
+        assert loaded_jails == [
+            "pool/iocage/jails/web1",
+            "pool/iocage/jails/web2"
+        ]